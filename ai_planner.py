@@ -0,0 +1,226 @@
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from typing import NamedTuple, Optional
+from ursina import Vec3
+from autopilot import AutopilotMode, run_autopilot, has_fire_solution
+from fire_control import clear_shots
+import os
+
+
+class ShipSnapshot(NamedTuple):
+    """Immutable copy of everything AI planning reads from one ship.
+
+    Plain tuples only, so a snapshot pickles cheaply for a process pool.
+    """
+    ship_id: int
+    position: tuple
+    velocity: tuple
+    forward: tuple
+    right: tuple
+    up: tuple
+    max_speed: float
+    alive: bool
+    mode: Optional[str]            # AutopilotMode value, or None
+    target_id: Optional[int]
+    weapon_range: float            # 0 when the ship should not fire
+    attack_run: Optional[tuple]    # (phase, timer, break_dir) once an attack run started
+
+
+class PlanResult(NamedTuple):
+    ship_id: int
+    thrust_input: Optional[tuple]      # None when the ship has no autopilot
+    rotation_input: Optional[tuple]
+    attack_run: Optional[tuple]
+    fire: bool
+
+
+class _TargetView:
+    """What the autopilot reads from a target, rebuilt from its snapshot."""
+    __slots__ = ('position', 'velocity', 'alive')
+
+    def __init__(self, snap):
+        self.position = Vec3(*snap.position)
+        self.velocity = Vec3(*snap.velocity)
+        self.alive = snap.alive
+
+
+class _PlanShip:
+    """Worker-side stand-in for a Ship; run_autopilot writes its inputs here."""
+    def __init__(self, snap, target):
+        self.ship_id = snap.ship_id
+        self.position = Vec3(*snap.position)
+        self.velocity = Vec3(*snap.velocity)
+        self.forward = Vec3(*snap.forward)
+        self.right = Vec3(*snap.right)
+        self.up = Vec3(*snap.up)
+        self.max_speed = snap.max_speed
+        self.autopilot_mode = AutopilotMode(snap.mode) if snap.mode else None
+        self.target = target
+        self.thrust_input = Vec3(0, 0, 0)
+        self.rotation_input = Vec3(0, 0, 0)
+        if snap.attack_run is not None:
+            phase, timer, break_dir = snap.attack_run
+            self._attack_run_phase = phase
+            self._attack_run_timer = timer
+            if break_dir is not None:
+                self._attack_run_break_dir = Vec3(*break_dir)
+
+
+def _attack_run_state(ship):
+    if getattr(ship, '_attack_run_phase', None) is None:
+        return None
+    break_dir = getattr(ship, '_attack_run_break_dir', None)
+    return (
+        ship._attack_run_phase,
+        ship._attack_run_timer,
+        tuple(break_dir) if break_dir is not None else None,
+    )
+
+
+def plan_ships(world, ship_ids, dt, now):
+    """Plan inputs for `ship_ids` against the snapshot `world` (id -> ShipSnapshot).
+
+    Module-level so it can be shipped to a process pool; `now` is the sim
+    time of the snapshot, handed to the autopilot as an argument.
+    """
+    results = []
+    for ship_id in ship_ids:
+        snap = world[ship_id]
+        target_snap = world.get(snap.target_id)
+        target = _TargetView(target_snap) if target_snap is not None else None
+        ship = _PlanShip(snap, target)
+        if ship.autopilot_mode is not None:
+            run_autopilot(ship, dt, now)
+        fire = (
+            snap.weapon_range > 0 and target is not None and target.alive
+            and has_fire_solution(ship.position, ship.forward, target.position, snap.weapon_range)
+        )
+        attack_run = _attack_run_state(ship)
+        if ship.autopilot_mode is None:
+            thrust, rot = None, None
+        else:
+            thrust, rot = tuple(ship.thrust_input), tuple(ship.rotation_input)
+        results.append(PlanResult(ship_id, thrust, rot, attack_run, fire))
+    return results
+
+
+def snapshot_ship(ship, can_fire):
+    attack_run = _attack_run_state(ship)
+    mode = ship.autopilot_mode.value if ship.autopilot_mode is not None else None
+    return ShipSnapshot(
+        ship_id=ship.ship_id,
+        position=tuple(ship.position),
+        velocity=tuple(ship.velocity),
+        forward=tuple(ship.forward),
+        right=tuple(ship.right),
+        up=tuple(ship.up),
+        max_speed=ship.max_speed,
+        alive=ship.alive,
+        mode=mode,
+        target_id=ship.target.ship_id if ship.target is not None else None,
+        weapon_range=ship.weapons[0].range if can_fire and ship.weapons else 0.0,
+        attack_run=attack_run,
+    )
+
+
+def _slice(world, ship_ids):
+    """The part of `world` that plan_ships reads for `ship_ids`: them and their targets."""
+    part = {}
+    for ship_id in ship_ids:
+        snap = world[ship_id]
+        part[ship_id] = snap
+        target = world.get(snap.target_id)
+        if target is not None:
+            part[target.ship_id] = target
+    return part
+
+
+class AIPlanner:
+    """Runs autopilot and fire decisions on a worker pool, one tick behind.
+
+    Each tick the manager publishes a snapshot of every ship, workers plan
+    against it while the main thread renders, and the planned inputs are
+    applied at the start of the next tick. The snapshot is never mutated after
+    publishing, so workers need no locking. Each chunk is sent only the
+    snapshots it reads (its ships and their targets), so a process pool
+    pickles O(N) data per tick rather than the whole world per chunk.
+
+    Planning is pure Python, so thread mode (the default) holds the GIL and
+    gives no parallelism; it only overlaps planning with waits elsewhere. Use
+    `use_processes=True` for real parallel planning on large fleets.
+    """
+    def __init__(self, workers=None, use_processes=False, chunk_size=64):
+        workers = workers or max(1, (os.cpu_count() or 2) - 1)
+        pool_cls = ProcessPoolExecutor if use_processes else ThreadPoolExecutor
+        self.executor = pool_cls(max_workers=workers)
+        self.chunk_size = chunk_size
+        self._futures = []
+        self._ships = {}    # ship_id -> Ship for the snapshot in flight
+
+    def publish(self, ships, planned, dt, now):
+        """Snapshot `ships` and start planning for the subset `planned`."""
+        planned_ids = {s.ship_id for s in planned}
+        world = {}
+        for ship in ships:
+            can_fire = ship.ship_id in planned_ids and not ship.is_player_controlled
+            world[ship.ship_id] = snapshot_ship(ship, can_fire)
+        self._ships = {s.ship_id: s for s in planned}
+
+        ids = [s.ship_id for s in planned]
+        size = self.chunk_size
+        self._futures = []
+        for i in range(0, len(ids), size):
+            chunk = ids[i:i + size]
+            self._futures.append(self.executor.submit(plan_ships, _slice(world, chunk), chunk, dt, now))
+
+    def apply(self, projectiles, now, broadphase):
+        """Block on the plans from last tick and write them to the ships.
+
+        Shots whose line of fire through the broadphase's ships starts with a
+        friendly are dropped (one batched raycast, see fire_control.clear_shots).
+        """
+        futures, self._futures = self._futures, []
+        shooters = []
+        for future in futures:
+            for result in future.result():
+                ship = self._ships.get(result.ship_id)
+                if ship is None or not ship.alive:
+                    continue
+                # Autopilot may have been switched off since the snapshot
+                if result.thrust_input is not None and ship.autopilot_mode is not None:
+                    ship.thrust_input = Vec3(*result.thrust_input)
+                    ship.rotation_input = Vec3(*result.rotation_input)
+                if result.attack_run is not None:
+                    phase, timer, break_dir = result.attack_run
+                    ship._attack_run_phase = phase
+                    ship._attack_run_timer = timer
+                    if break_dir is not None:
+                        ship._attack_run_break_dir = Vec3(*break_dir)
+                if result.fire and not ship.is_player_controlled:
+                    shooters.append(ship)
+
+        clear = clear_shots(shooters, broadphase)
+        for ship, ok in zip(shooters, clear):
+            if ok:
+                for weapon in ship.weapons:
+                    weapon.fire(projectiles, now)
+
+    def forget(self, ship):
+        """Drop a ship that left the simulation while its plan was in flight."""
+        self._ships.pop(ship.ship_id, None)
+
+    def shutdown(self):
+        self.executor.shutdown(wait=True)
+
+
+def pool_from_env(var='HOMAGE_AI_POOL'):
+    """(workers, use_processes) from `var`, or None when pooled AI is off.
+
+    'threads' or 'processes', optionally with a worker count: 'processes:4'.
+    """
+    spec = os.environ.get(var)
+    if not spec:
+        return None
+    kind, _, count = spec.partition(':')
+    if kind not in ('threads', 'processes'):
+        raise ValueError(f'unknown AI pool: {spec!r}')
+    return (int(count) if count else None), kind == 'processes'
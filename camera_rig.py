@@ -1,4 +1,16 @@
+from math import exp
+
 from ursina import Vec3, camera, lerp, mouse, application
+from scheduler import scheduler
+
+
+def _smoothstep(t):
+    return t * t * (3 - 2 * t)
+
+
+def _approach(rate, dt):
+    """Frame-rate independent lerp factor; stays in [0, 1) for any dt."""
+    return 1.0 - exp(-rate * dt)
 
 
 class ChaseCam:
@@ -11,7 +23,7 @@ class ChaseCam:
         self.fov_base = 75
         self.fov_speed_boost = 20        # max FOV increase at full speed
         self._transitioning = False
-        self._transition_timer = 0
+        self._transition_t = 0.0           # 0→1, driven by the scheduler
         self._transition_duration = 0.8
         self._transition_start_pos = Vec3(0, 0, 0)
         self._transition_start_rot = Vec3(0, 0, 0)
@@ -27,7 +39,8 @@ class ChaseCam:
             return
         if not instant and self.target_ship is not None:
             self._transitioning = True
-            self._transition_timer = 0
+            self._transition_t = 0.0
+            scheduler.tween(self, '_transition_t', 1.0, self._transition_duration, _smoothstep, start=0.0)
             self._transition_start_pos = Vec3(*camera.position)
             self._transition_start_rot = Vec3(*camera.rotation)
         self.target_ship = ship
@@ -64,20 +77,17 @@ class ChaseCam:
         desired_pos, look_point = self._compute_desired()
 
         if self._transitioning:
-            self._transition_timer += dt
-            t = min(self._transition_timer / self._transition_duration, 1.0)
-            # Smooth step
-            t = t * t * (3 - 2 * t)
+            t = self._transition_t
             camera.position = lerp(self._transition_start_pos, desired_pos, t)
             camera.look_at(look_point)
             if t >= 1.0:
                 self._transitioning = False
         else:
             # Smooth follow
-            camera.position = lerp(camera.position, desired_pos, self.follow_speed * dt)
+            camera.position = lerp(camera.position, desired_pos, _approach(self.follow_speed, dt))
             camera.look_at(look_point)
 
         # Dynamic FOV based on speed
         speed_ratio = self.target_ship.speed / max(self.target_ship.max_speed, 1)
         target_fov = self.fov_base + self.fov_speed_boost * speed_ratio
-        camera.fov = lerp(camera.fov, target_fov, 3 * dt)
+        camera.fov = lerp(camera.fov, target_fov, _approach(3, dt))
@@ -0,0 +1,222 @@
+from ursina import Vec3
+from typing import NamedTuple, Optional
+import bisect
+import heapq
+import itertools
+import math
+
+
+def ship_radius(ship):
+    """Bounding-sphere radius used for ship-ship contact."""
+    return max(ship.scale_x, ship.scale_y, ship.scale_z) * 0.5
+
+
+class Ray(NamedTuple):
+    origin: Vec3
+    direction: Vec3              # unit length
+    length: float
+    ignore: Optional[object] = None    # ship the ray starts inside (the shooter)
+
+
+class SweepAndPrune:
+    """Incremental sweep-and-prune broadphase on the x axis.
+
+    The ship order from the previous frame is kept and re-sorted with an
+    insertion sort; ships move little between frames so the list is almost
+    sorted and the sort is close to linear. Ships new to the structure are
+    sorted separately and merged in, so a large spawn wave does not degrade
+    the insertion sort. The sweep then only compares ships whose x intervals
+    overlap.
+    """
+    def __init__(self):
+        self._order = []          # ships, sorted by box min x as of last update
+        self._keys = []           # box min x per entry of _order
+        self._max_pad = 0.0
+        self._members = set()     # ship_ids in _order
+        self.swaps = 0
+
+    def update(self, ships, pad_fn):
+        """Return overlapping pairs of padded AABBs among the live `ships`."""
+        live = {s.ship_id for s in ships if s.alive}
+        order = [s for s in self._order if s.ship_id in live]
+        new = [s for s in ships if s.alive and s.ship_id not in self._members]
+        self._members = live
+
+        boxes = {}
+        for ship in itertools.chain(order, new):
+            p = ship.position
+            r = pad_fn(ship)
+            boxes[ship.ship_id] = (p.x - r, p.x + r, p.y - r, p.y + r, p.z - r, p.z + r)
+
+        def min_x(ship):
+            return boxes[ship.ship_id][0]
+
+        # Insertion sort on min x for ships already tracked — near O(n)
+        # thanks to frame coherence
+        for i in range(1, len(order)):
+            ship = order[i]
+            key = min_x(ship)
+            j = i - 1
+            while j >= 0 and min_x(order[j]) > key:
+                order[j + 1] = order[j]
+                j -= 1
+                self.swaps += 1
+            order[j + 1] = ship
+        # Newcomers (a spawned wave) have no coherence to exploit: sort them on
+        # their own and merge, O(n + k log k) rather than walking each one in
+        if new:
+            new.sort(key=min_x)
+            order = list(heapq.merge(order, new, key=min_x))
+        self._order = order
+        self._keys = [boxes[s.ship_id][0] for s in order]
+        self._max_pad = max((b[1] - b[0] for b in boxes.values()), default=0.0) / 2
+
+        pairs = []
+        n = len(order)
+        for i in range(n):
+            a = order[i]
+            ba = boxes[a.ship_id]
+            for j in range(i + 1, n):
+                b = order[j]
+                bb = boxes[b.ship_id]
+                if bb[0] > ba[1]:
+                    break  # sorted on min x: nothing further can overlap a
+                if bb[2] <= ba[3] and ba[2] <= bb[3] and bb[4] <= ba[5] and ba[4] <= bb[5]:
+                    pairs.append((a, b))
+        return pairs
+
+    def raycast(self, rays, radius_fn=ship_radius):
+        """First ship hit along each ray, for many rays at once.
+
+        Returns one (ship, distance) or None per ray, over the ships as of the
+        last update. Each ray only tests the ships whose x lies within the
+        ray's x extent padded by the largest radius, bisected out of the
+        x-sorted order, so the cost is a narrow slice per ray rather than
+        rays × ships. Contact resolution may have nudged ships after the sort,
+        so the slice is widened by one more box pad.
+        """
+        order, keys = self._order, self._keys
+        if not order:
+            return [None] * len(rays)
+        rad = [radius_fn(s) for s in order]
+        pad = max(rad) + 2 * self._max_pad
+
+        results = []
+        for origin, direction, length, ignore in rays:
+            end_x = origin.x + direction.x * length
+            lo = bisect.bisect_left(keys, min(origin.x, end_x) - pad)
+            hi = bisect.bisect_right(keys, max(origin.x, end_x) + pad)
+            best, best_t = None, length
+            for i in range(lo, hi):
+                ship = order[i]
+                if ship is ignore or not ship.alive:
+                    continue
+                oc = ship.position - origin
+                t = oc.dot(direction)
+                r = rad[i]
+                if t < -r or t - r > best_t:
+                    continue
+                d2 = oc.dot(oc) - t * t
+                if d2 > r * r:
+                    continue
+                t_hit = max(t - math.sqrt(r * r - d2), 0.0)
+                if t_hit <= best_t:
+                    best, best_t = ship, t_hit
+            results.append((best, best_t) if best is not None else None)
+        return results
+
+    def query(self, center, radius):
+        """Ships (as of the last update) whose centre is within `radius` of `center`.
+
+        Bisects the x-sorted order for the candidate slice instead of
+        scanning every ship.
+        """
+        keys = self._keys
+        lo = bisect.bisect_left(keys, center.x - radius - self._max_pad)
+        hi = bisect.bisect_right(keys, center.x + radius)
+        r2 = radius * radius
+        found = []
+        for ship in self._order[lo:hi]:
+            if not ship.alive:
+                continue
+            d = ship.position - center
+            if d.dot(d) <= r2:
+                found.append(ship)
+        return found
+
+
+class ShipCollisions:
+    """Ship-ship contact resolution and local avoidance steering.
+
+    Boxes are padded by the avoidance distance, so one broadphase pass yields
+    both the pairs close enough to steer around each other and the (subset of)
+    pairs actually in contact.
+    """
+    def __init__(self, avoid_distance=15.0, restitution=0.3, avoid_strength=1.0):
+        self.avoid_distance = avoid_distance
+        self.restitution = restitution
+        self.avoid_strength = avoid_strength
+        self.broadphase = SweepAndPrune()
+        self.pairs = []
+        self._steering = {}      # ship_id -> ship whose avoid_thrust is currently non-zero
+        self.contacts = 0
+
+    def update(self, ships):
+        """Run after physics: refresh pairs, separate overlapping ships."""
+        pad = self.avoid_distance * 0.5
+        self.pairs = self.broadphase.update(ships, lambda s: ship_radius(s) + pad)
+        self.contacts = 0
+        for a, b in self.pairs:
+            delta = b.position - a.position
+            dist = delta.length()
+            min_dist = ship_radius(a) + ship_radius(b)
+            if dist >= min_dist:
+                continue
+            self.contacts += 1
+            normal = delta / dist if dist > 1e-4 else Vec3(0, 1, 0)
+
+            # Push apart, heavier ship moves less
+            inv_a, inv_b = 1.0 / a.mass, 1.0 / b.mass
+            share = (min_dist - dist) / (inv_a + inv_b)
+            a.position -= normal * share * inv_a
+            b.position += normal * share * inv_b
+
+            # Cancel the closing velocity along the normal, with a little bounce
+            closing = (a.velocity - b.velocity).dot(normal)
+            if closing > 0:
+                impulse = (1 + self.restitution) * closing / (inv_a + inv_b)
+                a.velocity -= normal * impulse * inv_a
+                b.velocity += normal * impulse * inv_b
+
+    def forget(self, ship):
+        """Drop a ship that left the simulation from the cached pairs."""
+        self.pairs = [(a, b) for a, b in self.pairs if a is not ship and b is not ship]
+        self._steering.pop(ship.ship_id, None)
+
+    def steer(self):
+        """Run before physics: set avoid_thrust on AI-flown ships near another ship."""
+        for ship in self._steering.values():
+            ship.avoid_thrust = Vec3(0, 0, 0)
+        self._steering = {}
+
+        for a, b in self.pairs:
+            if not (a.alive and b.alive):
+                continue
+            delta = a.position - b.position
+            gap = delta.length() - ship_radius(a) - ship_radius(b)
+            if gap >= self.avoid_distance:
+                continue
+            weight = self.avoid_strength * (1.0 - max(gap, 0.0) / self.avoid_distance)
+            away = delta.normalized() if delta.length() > 1e-4 else Vec3(0, 1, 0)
+            for ship, direction in ((a, away), (b, -away)):
+                if ship.autopilot_mode is None:
+                    continue  # player flying manually keeps full control
+                # World-space push → local-space thrust (x=strafe, y=vertical, z=forward)
+                # on unit axes: forward/right/up carry the model scale
+                local = Vec3(
+                    direction.dot(ship.right.normalized()),
+                    direction.dot(ship.up.normalized()),
+                    direction.dot(ship.forward.normalized()),
+                )
+                ship.avoid_thrust += local * weight
+                self._steering[ship.ship_id] = ship
@@ -1,58 +1,141 @@
-from ursina import Entity, Vec3, color, destroy, time, invoke
-import random
+from collections import deque
+from ursina import Entity, Vec3, color, time, curve
+from scheduler import scheduler
+from simclock import clock
 
 
-def apply_damage(ship, amount):
-    """Apply damage to a ship (shields first, then HP). Returns True if ship was destroyed."""
-    if not ship.alive:
-        return False
-    ship.take_damage(amount)
+# Debris cubes per explosion; lowered by the quality governor under load
+explosion_debris = 8
+
+# Sim time each live explosion's last debris disappears (for metrics)
+_explosion_ends = []
+
+
+def _show_hit(ship):
+    """The one visual a hit ship gets per tick: a flash, or its explosion."""
     # Flash the ship white on hit
     _flash_hit(ship)
-    if not ship.alive:
-        spawn_explosion(ship.position, ship.scale)
-        ship.visible = False
-        ship.engine_glow.visible = False
-        return True
-    return False
+    if ship.alive:
+        return False
+    spawn_explosion(ship.position, ship.scale)
+    ship.visible = False
+    ship.glow = None
+    return True
+
+
+class DamageBuffer:
+    """Collects a tick's hits and resolves them once per ship.
+
+    Hits on the same ship are summed and applied with a single take_damage
+    (shields then hull, same as one hit at a time), followed by at most one
+    flash or explosion. The kill goes to the weapon whose hit took the
+    running total past the ship's remaining shield + hull.
+
+    `events` holds the hits of the tick being collected. `damage_by_ship`
+    (ship_id -> damage taken) covers ships still in play; forget() moves a
+    retired ship's total into `retired_damage`, a ring of the last
+    `retired_cap` (ship_id, ship name, damage) records, so kills keep their
+    damage while a long session stays bounded. `kills_by_weapon` is keyed by
+    weapon type (Weapon.kind, e.g. 'Enemy Fighter #1' for that hardpoint on
+    every enemy fighter), so it totals kills across all ships carrying it,
+    until reset_stats().
+    """
+    def __init__(self, retired_cap=1024):
+        self.events = []            # [(ship, amount, weapon)]
+        self.damage_by_ship = {}
+        self.retired_damage = deque(maxlen=retired_cap)
+        self.kills_by_weapon = {}
+
+    def add(self, ship, amount, weapon=None):
+        self.events.append((ship, amount, weapon))
+
+    def resolve(self):
+        """Apply the buffered hits. Returns the ships destroyed this tick."""
+        if not self.events:
+            return []
+        by_ship = {}
+        for ship, amount, weapon in self.events:
+            entry = by_ship.get(ship.ship_id)
+            if entry is None:
+                by_ship[ship.ship_id] = entry = (ship, [])
+            entry[1].append((amount, weapon))
+        self.events = []
+
+        destroyed = []
+        for ship, hits in by_ship.values():
+            if not ship.alive:
+                continue
+            remaining = ship.shield + ship.hp
+            total = 0.0
+            killer = None
+            for amount, weapon in hits:
+                total += amount
+                if killer is None and total >= remaining:
+                    killer = weapon
+            ship.take_damage(total)
+            self.damage_by_ship[ship.ship_id] = self.damage_by_ship.get(ship.ship_id, 0.0) + min(total, remaining)
+            if _show_hit(ship):
+                destroyed.append(ship)
+                kind = killer.kind if killer is not None else None
+                self.kills_by_weapon[kind] = self.kills_by_weapon.get(kind, 0) + 1
+        return destroyed
+
+    def forget(self, ship):
+        damage = self.damage_by_ship.pop(ship.ship_id, None)
+        if damage is not None:
+            self.retired_damage.append((ship.ship_id, ship.ship_name, damage))
+
+    def reset_stats(self):
+        self.damage_by_ship.clear()
+        self.retired_damage.clear()
+        self.kills_by_weapon.clear()
 
 
 def _flash_hit(ship):
-    """Brief white flash on hit."""
-    original_color = ship.color
-    ship.color = color.white
-    invoke(setattr, ship, 'color', original_color, delay=0.05)
+    """Brief white flash on hit. Repeated hits extend one pending restore."""
+    key = ('flash', ship.ship_id)
+    if not scheduler.is_pending(key):
+        original_color = ship.color
+        ship.color = color.white
+    else:
+        original_color = None  # ignored: the pending restore keeps its colour
+    scheduler.call_later(0.05, setattr, ship, 'color', original_color, key=key)
 
 
-def spawn_explosion(position, scale, num_debris=8):
+def spawn_explosion(position, scale, num_debris=None):
     """Create a simple explosion effect with flying debris cubes."""
+    if num_debris is None:
+        num_debris = explosion_debris
+    rng = clock.rng
+    longest = 0.4
     for _ in range(num_debris):
-        size = random.uniform(0.2, 0.8) * max(scale.x, scale.y, scale.z) * 0.3
+        size = rng.uniform(0.2, 0.8) * max(scale.x, scale.y, scale.z) * 0.3
         debris = Entity(
             model='cube',
             color=color.rgba(
-                random.randint(200, 255),
-                random.randint(75, 180),
-                random.randint(0, 50),
+                rng.randint(200, 255),
+                rng.randint(75, 180),
+                rng.randint(0, 50),
                 255,
             ),
             scale=size,
             position=position + Vec3(
-                random.uniform(-1, 1),
-                random.uniform(-1, 1),
-                random.uniform(-1, 1),
+                rng.uniform(-1, 1),
+                rng.uniform(-1, 1),
+                rng.uniform(-1, 1),
             ) * max(scale.x, scale.z) * 0.3,
         )
         # Animate outward and fade
         end_pos = debris.position + Vec3(
-            random.uniform(-1, 1),
-            random.uniform(-1, 1),
-            random.uniform(-1, 1),
-        ).normalized() * random.uniform(5, 20)
-        duration = random.uniform(0.5, 1.5)
-        debris.animate_position(end_pos, duration=duration, curve='out_expo')
-        debris.animate_scale(0, duration=duration, curve='in_expo')
-        destroy(debris, delay=duration + 0.1)
+            rng.uniform(-1, 1),
+            rng.uniform(-1, 1),
+            rng.uniform(-1, 1),
+        ).normalized() * rng.uniform(5, 20)
+        duration = rng.uniform(0.5, 1.5)
+        longest = max(longest, duration + 0.1)
+        scheduler.tween(debris, 'position', end_pos, duration, curve.out_expo)
+        scheduler.tween(debris, 'scale', Vec3(0, 0, 0), duration, curve.in_expo)
+        scheduler.destroy_later(debris, duration + 0.1)
 
     # Central flash
     flash = Entity(
@@ -61,5 +144,12 @@ def spawn_explosion(position, scale, num_debris=8):
         scale=max(scale.x, scale.z) * 1.5,
         position=position,
     )
-    flash.animate_scale(0, duration=0.3, curve='out_expo')
-    destroy(flash, delay=0.4)
+    scheduler.tween(flash, 'scale', Vec3(0, 0, 0), 0.3, curve.out_expo)
+    scheduler.destroy_later(flash, 0.4)
+    _explosion_ends.append(clock.time + longest)
+
+
+def explosions_active(now):
+    """Explosions whose flash or debris is still on screen at sim time `now`."""
+    _explosion_ends[:] = [t for t in _explosion_ends if t > now]
+    return len(_explosion_ends)
@@ -0,0 +1,55 @@
+from dataclasses import dataclass, field
+from ursina import Vec3
+
+
+@dataclass
+class Transform:
+    ship: object                 # the Ship handle
+    position: Vec3 = field(default_factory=lambda: Vec3(0, 0, 0))
+    rotation: Vec3 = field(default_factory=lambda: Vec3(0, 0, 0))   # Ursina euler degrees
+    scale: Vec3 = field(default_factory=lambda: Vec3(1, 1, 1))
+
+
+@dataclass
+class Velocity:
+    value: Vec3 = field(default_factory=lambda: Vec3(0, 0, 0))
+
+
+@dataclass
+class Propulsion:
+    mass: float
+    thrust_force: float
+    rotation_force: float
+    max_speed: float
+    drag: float
+    thrust_input: Vec3 = field(default_factory=lambda: Vec3(0, 0, 0))
+    rotation_input: Vec3 = field(default_factory=lambda: Vec3(0, 0, 0))
+    avoid_thrust: Vec3 = field(default_factory=lambda: Vec3(0, 0, 0))
+
+
+@dataclass
+class Health:
+    hp: float
+    max_hp: float
+    shield: float
+    max_shield: float
+    alive: bool = True
+
+
+@dataclass
+class Armament:
+    weapons: list = field(default_factory=list)
+
+
+@dataclass
+class Autopilot:
+    """Present only while an autopilot mode is engaged."""
+    mode: object = None          # AutopilotMode
+    attack_run_phase: str = None
+    attack_run_timer: float = 0.0
+    attack_run_break_dir: Vec3 = None
+
+
+@dataclass
+class Targeting:
+    target: object = None        # Ship
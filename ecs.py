@@ -0,0 +1,123 @@
+import itertools
+
+
+class Archetype:
+    """All entities with exactly the same set of components, stored column-wise."""
+    def __init__(self, signature):
+        self.signature = signature            # frozenset of component names
+        self.entities = []                    # eids, row-aligned with the columns
+        self.columns = {name: [] for name in signature}
+        self._row = {}                        # eid -> row
+
+    def __len__(self):
+        return len(self.entities)
+
+    def add(self, eid, components):
+        self._row[eid] = len(self.entities)
+        self.entities.append(eid)
+        for name, column in self.columns.items():
+            column.append(components[name])
+
+    def remove(self, eid):
+        """Swap-remove a row; order within an archetype is not meaningful."""
+        row = self._row.pop(eid)
+        last = len(self.entities) - 1
+        if row != last:
+            moved = self.entities[last]
+            self.entities[row] = moved
+            self._row[moved] = row
+            for column in self.columns.values():
+                column[row] = column[last]
+        self.entities.pop()
+        for column in self.columns.values():
+            column.pop()
+
+
+class World:
+    """Component storage grouped by archetype.
+
+    Components are plain objects. Each entity's components live in the column
+    lists of its archetype (for systems iterating by component set) and in a
+    per-entity dict (for handles like Ship reading a single field). Both hold
+    the same objects, so a write through either is seen by the other. Adding
+    or removing a component moves the entity to another archetype.
+    """
+    def __init__(self):
+        self._archetypes = {}       # signature -> Archetype
+        self._components = {}       # eid -> {name: component}
+        self._archetype_of = {}     # eid -> Archetype
+        self._ids = itertools.count(1)
+
+    def __len__(self):
+        return len(self._components)
+
+    def clear(self):
+        """Drop every entity (used between runs that share the process)."""
+        self._archetypes.clear()
+        self._components.clear()
+        self._archetype_of.clear()
+
+    def _archetype(self, signature):
+        arch = self._archetypes.get(signature)
+        if arch is None:
+            arch = self._archetypes[signature] = Archetype(signature)
+        return arch
+
+    def create(self, **components):
+        eid = next(self._ids)
+        self._components[eid] = dict(components)
+        arch = self._archetype(frozenset(components))
+        arch.add(eid, components)
+        self._archetype_of[eid] = arch
+        return eid
+
+    def destroy(self, eid):
+        arch = self._archetype_of.pop(eid, None)
+        if arch is not None:
+            arch.remove(eid)
+        self._components.pop(eid, None)
+
+    def components(self, eid):
+        """The live name -> component dict for an entity (kept up to date on add/remove)."""
+        return self._components[eid]
+
+    def get(self, eid, name, default=None):
+        return self._components[eid].get(name, default)
+
+    def has(self, eid, name):
+        return name in self._components[eid]
+
+    def add_component(self, eid, name, component):
+        comps = self._components[eid]
+        if name in comps:
+            comps[name] = component
+            arch = self._archetype_of[eid]
+            arch.columns[name][arch._row[eid]] = component
+            return
+        self._move(eid, comps, lambda: comps.__setitem__(name, component))
+
+    def remove_component(self, eid, name):
+        comps = self._components[eid]
+        if name in comps:
+            self._move(eid, comps, lambda: comps.__delitem__(name))
+
+    def _move(self, eid, comps, change):
+        self._archetype_of[eid].remove(eid)
+        change()
+        arch = self._archetype(frozenset(comps))
+        arch.add(eid, comps)
+        self._archetype_of[eid] = arch
+
+    def query(self, *names):
+        """Yield (eids, columns...) for every archetype that has all `names`."""
+        wanted = frozenset(names)
+        for signature, arch in list(self._archetypes.items()):
+            if wanted <= signature and arch.entities:
+                yield (arch.entities,) + tuple(arch.columns[n] for n in names)
+
+    def count(self, *names):
+        wanted = frozenset(names)
+        return sum(len(a) for s, a in self._archetypes.items() if wanted <= s)
+
+
+world = World()
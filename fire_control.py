@@ -0,0 +1,139 @@
+from autopilot import has_fire_solution
+from collision import Ray
+from weapons import ship_hit_radius
+import heapq
+import itertools
+import math
+
+
+FIRE_CONE = math.acos(0.96)    # half-angle of the fire cone used by has_fire_solution
+
+
+def clear_shots(shooters, broadphase):
+    """Per shooter, False when the first ship along its line of fire is a friendly.
+
+    One batched raycast over the ships in `broadphase` (a SweepAndPrune) for
+    all shooters; rays start where projectiles spawn and run the length of the
+    first weapon's range.
+    """
+    if not shooters:
+        return []
+    rays = [
+        Ray(s.position + s.forward * 2, s.forward.normalized(), s.weapons[0].range, s)
+        for s in shooters
+    ]
+    hits = broadphase.raycast(rays, ship_hit_radius)
+    return [
+        hit is None or hit[0].faction != shooter.faction
+        for shooter, hit in zip(shooters, hits)
+    ]
+
+
+class FireControl:
+    """Event-driven AI firing.
+
+    Every AI ship has one entry in a heap, keyed by the earliest sim time at
+    which it could possibly fire: when its next weapon is ready, or when its
+    target could at the earliest have entered range and cone given both ships'
+    top speeds and the shooter's turn rate. Ships are only evaluated when their
+    entry comes due, or when woken because their target changed.
+    """
+    def __init__(self, idle_wait=0.5, max_wait=1.0, blocked_wait=0.2):
+        self.idle_wait = idle_wait      # re-check delay with no target / player-flown
+        self.max_wait = max_wait        # upper bound on any geometric estimate
+        self.blocked_wait = blocked_wait  # re-check delay after a friendly blocked the shot
+        self._heap = []                 # (due, seq, ship)
+        self._live = {}                 # ship_id -> seq of the live entry
+        self._stale = 0                 # superseded/forgotten entries still in the heap
+        self._seq = itertools.count()
+        self.evaluations = 0
+        self.blocked = 0                # shots held back by a friendly in the line of fire
+
+    def wake(self, ship, when=0.0):
+        """(Re)schedule a ship; supersedes any pending entry for it."""
+        seq = next(self._seq)
+        superseded = ship.ship_id in self._live
+        self._live[ship.ship_id] = seq
+        heapq.heappush(self._heap, (when, seq, ship))
+        if superseded:
+            self._supersede()
+
+    def forget(self, ship):
+        if self._live.pop(ship.ship_id, None) is not None:
+            self._supersede()
+
+    def pending_count(self):
+        """Live entries in the heap, i.e. ships currently scheduled."""
+        return len(self._heap) - self._stale
+
+    def _supersede(self):
+        """Count one more dead heap entry; compact once they are most of the heap."""
+        self._stale += 1
+        if self._stale > 64 and self._stale * 2 > len(self._heap):
+            live = self._live
+            self._heap[:] = [e for e in self._heap if live.get(e[2].ship_id) == e[1]]
+            heapq.heapify(self._heap)
+            self._stale = 0
+
+    def update(self, now, projectiles, broadphase):
+        """Fire every due ship whose line of fire through the broadphase's ships is clear."""
+        heap = self._heap
+        due = []
+        while heap and heap[0][0] <= now:
+            _, seq, ship = heapq.heappop(heap)
+            if self._live.get(ship.ship_id) != seq:
+                self._stale -= 1
+                continue  # superseded or forgotten
+            del self._live[ship.ship_id]  # popped; rescheduled below unless dead
+            if not ship.alive:
+                continue
+            due.append(ship)
+        # Reschedule after draining so a zero wait means "next tick", not "again now"
+        shooters = []
+        for ship in due:
+            self.evaluations += 1
+            wait = self._evaluate(ship, now)
+            if wait is None:
+                shooters.append(ship)
+            else:
+                self.wake(ship, now + wait)
+
+        # One batched line-of-fire query for every ship that wants to shoot
+        clear = clear_shots(shooters, broadphase)
+        for ship, ok in zip(shooters, clear):
+            if ok:
+                for weapon in ship.weapons:
+                    weapon.fire(projectiles, now)
+                self.wake(ship, now + max(min(w.ready_at for w in ship.weapons) - now, 0.0))
+            else:
+                self.blocked += 1
+                self.wake(ship, now + self.blocked_wait)
+
+    def _evaluate(self, ship, now):
+        """None when the ship should fire now, else how long until it is worth looking at again."""
+        target = ship.target
+        if ship.is_player_controlled or not ship.weapons or target is None or not target.alive:
+            return self.idle_wait
+
+        ready_in = min(w.ready_at for w in ship.weapons) - now
+        if ready_in > 0:
+            return ready_in
+
+        weapon_range = ship.weapons[0].range
+        if has_fire_solution(ship.position, ship.forward, target.position, weapon_range):
+            return None
+
+        # --- Not aimed or out of range: earliest time that could change ---
+        to_target = target.position - ship.position
+        dist = max(to_target.length(), 1.0)
+        closing = ship.max_speed + target.max_speed
+        t_range = max(dist - weapon_range, 0.0) / max(closing, 1.0)
+
+        off_axis = math.acos(max(-1.0, min(1.0, ship.forward.normalized().dot(to_target / dist))))
+        # Own turn rate (physics: rotation_force/mass * 60 deg/s per axis, pitch+yaw
+        # combined) plus how fast the bearing can swing from relative motion
+        turn_rate = math.radians(ship.rotation_force / ship.mass * 60) * math.sqrt(2)
+        bearing_rate = closing / dist
+        t_cone = max(off_axis - FIRE_CONE, 0.0) / max(turn_rate + bearing_rate, 1e-3)
+
+        return min(max(t_range, t_cone), self.max_wait)
@@ -1,24 +1,87 @@
-from ursina import Vec3, held_keys, mouse, time, destroy, window, application
-from ship import Ship
-from ship_defs import FIGHTER_DEF, CARRIER_DEF, ENEMY_FIGHTER_DEF
-from physics import update_ship_physics
+from ursina import Vec3, held_keys, mouse, time, window, application
+from ship_pool import ShipPool
+from physics import update_ships_physics
 from autopilot import (
     AutopilotMode, MODE_BY_KEY, MODE_NAMES, run_autopilot,
 )
-from weapons import Weapon
-from combat import apply_damage
+from weapons import Weapon, step_projectiles
+from combat import DamageBuffer, explosions_active
 from camera_rig import ChaseCam
 from hud import HUD
+from radar import Radar
 from starfield import Starfield
+from tracers import TracerRenderer
+from render_lod import RenderLOD
+from sectors import SectorGrid
+from scheduler import scheduler
+from quality import QualityGovernor
+from ai_planner import AIPlanner, pool_from_env
+from impacts import ImpactQueue
+from fire_control import FireControl
+from collision import ShipCollisions
+from squadrons import SquadronManager
+from ecs import World
+from scenario import Spawner, DEFAULT_SCENARIO
+from startup import startup
+from timewarp import TimeWarp
+from simclock import clock
+from metrics import Metrics, start_from_env
+from time import perf_counter
+import kernels
+import weapons
+
+
+# HELP text for every series GameManager exports (see metrics.py)
+METRIC_HELP = {
+    'ticks': 'Simulation ticks run.',
+    'tick_seconds': 'Wall time of one simulation tick.',
+    'frame_seconds': 'Frame time as reported by the engine.',
+    'autopilot_evaluations': 'Autopilot decisions made.',
+    'autopilot_evaluations_per_tick': 'Autopilot decisions made in the last tick.',
+    'fire_evaluations': 'AI fire-control evaluations.',
+    'projectiles_fired': 'Projectiles fired.',
+    'projectiles_hit': 'Projectiles that hit a ship.',
+    'projectiles_expired': 'Projectiles that ran out of range.',
+    'projectiles_in_flight': 'Live projectiles.',
+    'ships_alive': 'Ships in play, by faction.',
+    'explosions_active': 'Explosions with debris still animating.',
+    'warp_factor': 'Time warp multiplier (0 = max).',
+}
 
 
 class GameManager:
-    def __init__(self):
+    def __init__(self, scenario_path=DEFAULT_SCENARIO, seed=None):
+        clock.reset(seed)
+
         # === Ships ===
         self.all_ships = []
         self.friendly_ships = []
         self.enemy_ships = []
         self.projectiles = []
+        self.world = World()      # this manager's ECS storage; step() iterates only these ships
+        self.pool = ShipPool(world=self.world)
+        self._dying = []          # dead ships waiting to be retired (player / camera ship)
+        self.sim_time = 0.0
+        self.tick = 0
+        self.tick_seconds = 0.0   # wall time of the last step(), read by the spawner
+        self.ai_interval = 1      # run each AI ship's autopilot every Nth tick
+        self.ai_planner = None    # AIPlanner when AI runs on a worker pool
+        self.impacts = ImpactQueue()  # resolves projectiles in 'analytic' mode
+        self.damage = DamageBuffer()  # per-tick hits, resolved once per ship
+        self.fire_control = FireControl()
+        self.collisions = ShipCollisions()
+        self.squadrons = SquadronManager(self)
+        self.scheduler = scheduler
+        self.timewarp = TimeWarp()
+        self.metrics = Metrics()
+        for name, text in METRIC_HELP.items():
+            self.metrics.describe(name, text)
+        self.metrics_exporter = start_from_env(self.metrics)   # None unless HOMAGE_METRICS is set
+        pool = pool_from_env()    # None unless HOMAGE_AI_POOL is set, e.g. 'threads' or 'processes:4'
+        if pool is not None:
+            self.enable_pooled_ai(*pool)
+        self._proj_kept = 0       # projectiles left after last tick's compaction
+        self._fire_evals = 0      # fire_control.evaluations already counted
 
         # === Player state ===
         self.player_ship_index = 0
@@ -27,63 +90,113 @@ class GameManager:
 
         # === Systems ===
         self.chase_cam = ChaseCam()
-        self.hud = HUD()
-        self.starfield = Starfield()
+        self.tracers = TracerRenderer()
+        self.render_lod = RenderLOD()
+        with startup.stage('hud'):
+            self.hud = HUD()
+            self.radar = Radar()
+        with startup.stage('starfield'):
+            self.starfield = Starfield()
+        self.sectors = SectorGrid()
+        self.quality = QualityGovernor(self)
 
         # === Spawn initial scene ===
-        self._spawn_scene()
-
-    def _spawn_scene(self):
-        # Player fighter
-        player = Ship(FIGHTER_DEF, position=Vec3(0, 0, 0))
-        player.is_player_controlled = True
-        self.all_ships.append(player)
-        self.friendly_ships.append(player)
-
-        # Friendly carrier
-        carrier = Ship(CARRIER_DEF, position=Vec3(30, -5, -40))
-        carrier.autopilot_mode = AutopilotMode.KEEP_AT_RANGE
-        self.all_ships.append(carrier)
-        self.friendly_ships.append(carrier)
-
-        # Enemy fighters
-        enemy_positions = [
-            Vec3(100, 20, 150),
-            Vec3(-80, -10, 180),
-            Vec3(50, 40, 200),
-        ]
-        for pos in enemy_positions:
-            enemy = Ship(ENEMY_FIGHTER_DEF, position=pos)
-            enemy.autopilot_mode = AutopilotMode.ATTACK_RUN
-            self.all_ships.append(enemy)
-            self.enemy_ships.append(enemy)
-
-        # Assign weapons to all ships
-        for ship in self.all_ships:
-            for wdef in ship.ship_def.weapons:
-                w = Weapon(
-                    owner=ship,
-                    damage=wdef['damage'],
-                    cooldown=wdef['cooldown'],
-                    speed=wdef['speed'],
-                    range=wdef['range'],
-                    color_val=wdef['color'],
-                )
-                ship.weapons.append(w)
-
-        # Assign targets
-        self.player_ship = player
+        self.spawner = Spawner(self)
+        with startup.stage('scenario'):
+            self._spawn_scene(scenario_path)
+
+    def _spawn_scene(self, scenario_path):
+        """Build the scenario's opening ships now; its waves spawn incrementally later."""
+        self.spawner.load(scenario_path)
+        self.spawner.spawn_all()
         self._assign_targets()
-        self.chase_cam.set_target(player, instant=True)
+
+    def create_ship(self, ship_def, position=Vec3(0, 0, 0), ship_id=None):
+        """Take a ship from the pool (or build one with its weapons) and register it.
+
+        `ship_id` restores a paged-out ship's identity before any subsystem sees it.
+        """
+        ship, reused = self.pool.acquire(ship_def, position, ship_id)
+        for i, wdef in enumerate(ship_def.weapons if not reused else ()):
+            w = Weapon(
+                owner=ship,
+                damage=wdef['damage'],
+                cooldown=wdef['cooldown'],
+                speed=wdef['speed'],
+                range=wdef['range'],
+                color_val=wdef['color'],
+                kind=wdef.get('kind', f'{ship_def.name} #{i + 1}'),
+            )
+            ship.weapons.append(w)
+        self.all_ships.append(ship)
+        if ship.faction == 'friendly':
+            self.friendly_ships.append(ship)
+        else:
+            self.enemy_ships.append(ship)
+        self.fire_control.wake(ship, self.sim_time)
+        return ship
+
+    def reinforce(self, groups):
+        """Queue scenario-style groups mid-battle; they spawn within the frame budget."""
+        self.spawner.enqueue(groups)
+
+    def remove_ship(self, ship):
+        """Unregister a ship and drop any references other ships hold to it."""
+        self.remove_ships([ship])
+
+    def remove_ships(self, ships):
+        """Batched remove_ship: one pass over the lists however many leave."""
+        gone = {s.ship_id for s in ships}
+        if not gone:
+            return
+        for lst in (self.all_ships, self.friendly_ships, self.enemy_ships):
+            lst[:] = [s for s in lst if s.ship_id not in gone]
+        for other in self.all_ships:
+            if other.target is not None and other.target.ship_id in gone:
+                other.target = None
+        for ship in ships:
+            self.scheduler.cancel(('flash', ship.ship_id))
+            if self.ai_planner is not None:
+                self.ai_planner.forget(ship)
+            self.impacts.forget_ship(ship)
+            self.fire_control.forget(ship)
+            self.collisions.forget(ship)
+            self.squadrons.forget(ship)
+
+    def retire_ships(self, ships):
+        """Remove ships from play and return them to the pool."""
+        self.remove_ships(ships)
+        for ship in ships:
+            self.damage.forget(ship)
+            self.pool.release(ship)
+
+    def _retire_dead(self, destroyed):
+        """Compact this tick's wrecks out of the active lists.
+
+        The player's ship and the camera's ship are kept (dead) until control
+        or the camera moves elsewhere.
+        """
+        dying = self._dying
+        dying.extend(destroyed)
+        if not dying:
+            return
+        keep = (self.player_ship, self.chase_cam.target_ship)
+        retire = [s for s in dying if s not in keep]
+        self._dying = [s for s in dying if s in keep]
+        self.retire_ships(retire)
 
     def _assign_targets(self):
-        """Give every ship a target from the opposing faction."""
+        """Give every ship without a target one from the opposing faction."""
         # Friendlies target nearest enemy
         for ship in self.friendly_ships:
-            ship.target = self._nearest_enemy(ship, self.enemy_ships)
+            if ship.target is None:
+                ship.target = self._nearest_enemy(ship, self.enemy_ships)
+                self.fire_control.wake(ship, self.sim_time)
         # Enemies target nearest friendly
         for ship in self.enemy_ships:
-            ship.target = self._nearest_enemy(ship, self.friendly_ships)
+            if ship.target is None:
+                ship.target = self._nearest_enemy(ship, self.friendly_ships)
+                self.fire_control.wake(ship, self.sim_time)
 
     def _nearest_enemy(self, ship, enemy_list):
         best = None
@@ -98,31 +211,107 @@ class GameManager:
         return best
 
     def update(self, dt):
-        """Master update — called every frame from main.py."""
+        """Master update — called every frame from main.py.
+
+        Runs one simulation tick, or several under time warp, then the
+        per-frame presentation (camera, starfield, HUD).
+        """
+        sim_dt = self.timewarp.run(self, dt)
+        m = self.metrics
+        m.observe('frame_seconds', dt)
+
+        # 8b. Camera — once per frame, over all the sim time it covered
+        self.chase_cam.update(sim_dt)
+
+        # 8c. Ship LOD and view culling (also gates engine glow updates)
+        self.render_lod.update(self.all_ships, self.chase_cam.target_ship)
+
+        # 8d. Tracers — every live projectile in one line mesh
+        self.tracers.update(self.projectiles, self.sim_time)
+
+        # 9. Starfield
+        self.starfield.update()
+
+        # 9b. Radar — redraws on its own interval, from the broadphase's spatial query
+        self.radar.update(dt, self.player_ship, self.collisions.broadphase.query)
+
+        # 10. HUD (throttled while warping)
+        if self.timewarp.refresh_hud():
+            ap_name = MODE_NAMES.get(self.player_ship.autopilot_mode, 'OFF') if self.player_ship else 'OFF'
+            self.hud.update(self.player_ship, ap_name)
+            self.hud.set_warp(self.timewarp.label() if self.timewarp.active else None)
+
+        # 11. Quality governor — warp frames are deliberately heavy, so only
+        #     real-time frames count toward the budget
+        if not self.timewarp.active:
+            self.quality.update(dt)
+
+        # 12. Metrics gauges — plain dict stores; the exporter thread flushes them
+        m.set('ships_alive', len(self.friendly_ships), faction='friendly')
+        m.set('ships_alive', len(self.enemy_ships), faction='enemy')
+        m.set('projectiles_in_flight', len(self.projectiles))
+        m.set('explosions_active', explosions_active(self.sim_time))
+        m.set('warp_factor', 0 if self.timewarp.factor == 'max' else self.timewarp.factor)
+
+    def step(self, dt):
+        """One simulation tick."""
+        tick_start = perf_counter()
+        self.sim_time += dt
+        self.tick += 1
+        clock.time = self.sim_time
+
+        # 0. Sector streaming — page distant ships out, nearby sectors back in
+        self.sectors.update(self, dt)
+
+        # 0b. Incremental spawning (scenario waves, reinforcements)
+        self.spawner.update()
+
         # 1. Player input
         self._handle_player_input(dt)
 
         # 2. Autopilot AI for non-player ships (and player ship if AP is on)
-        for ship in self.all_ships:
-            if not ship.alive:
-                continue
-            if ship.is_player_controlled and ship.autopilot_mode is None:
-                continue  # player is flying manually
-            if ship.autopilot_mode is not None:
-                run_autopilot(ship, dt)
-
-        # 3. Physics for all ships
-        for ship in self.all_ships:
-            if ship.alive:
-                update_ship_physics(ship, dt)
-
-        # 4. Weapon cooldowns
-        for ship in self.all_ships:
-            for weapon in ship.weapons:
-                weapon.update_cooldown(dt)
+        #    At reduced quality each ship decides every `ai_interval` ticks,
+        #    staggered by id; the joystick holds its last input in between.
+        if self.ai_planner is not None:
+            # Pooled mode: apply what the workers planned from last tick's snapshot
+            self.ai_planner.apply(self.projectiles, self.sim_time, self.collisions.broadphase)
+            evaluated = 0
+        else:
+            # Only ships with an engaged autopilot carry the component, so a
+            # player flying manually is never visited here. Squadron members
+            # are planned per group below.
+            squads = self.squadrons
+            evaluated = 0
+            for _, transforms, _ap in self.world.query('transform', 'autopilot'):
+                for tr in transforms:
+                    ship = tr.ship
+                    if ship.alive and self._ai_due(ship) and squads.squadron_of(ship) is None:
+                        run_autopilot(ship, self._ai_dt(ship, dt), self.sim_time)
+                        evaluated += 1
+
+        # 2a. Squadrons — leader decides once per group, followers hold slots
+        evaluated += self.squadrons.update(self._ai_dt(None, dt), self._ai_due, plan_leaders=self.ai_planner is None)
+
+        # 2b. Local avoidance steering from last tick's broadphase pairs
+        self.collisions.steer()
+
+        # 3. Physics for all ships that can fly (kernel-batched when available)
+        flying = [
+            tr.ship
+            for _, transforms, healths, _p, _v in self.world.query('transform', 'health', 'propulsion', 'velocity')
+            for tr, health in zip(transforms, healths)
+            if health.alive
+        ]
+        update_ships_physics(flying, dt)
+
+        # 3b. Ship-ship collisions (sweep-and-prune broadphase)
+        self.collisions.update(self.all_ships)
 
-        # 5. AI firing
-        self._ai_fire(dt)
+        # 4. Weapon cooldowns — weapons store a ready-at sim time, nothing to tick
+
+        # 5. AI firing (pooled mode fires when plans are applied in step 2)
+        if self.ai_planner is None:
+            self.fire_control.update(self.sim_time, self.projectiles, self.collisions.broadphase)
 
         # 6. Projectile updates
         self._update_projectiles(dt)
@@ -130,15 +319,60 @@ class GameManager:
         # 7. Reassign targets periodically (enemies may have died)
         self._reassign_dead_targets()
 
-        # 8. Camera
-        self.chase_cam.update(dt)
-
-        # 9. Starfield
-        self.starfield.update()
-
-        # 10. HUD
-        ap_name = MODE_NAMES.get(self.player_ship.autopilot_mode, 'OFF') if self.player_ship else 'OFF'
-        self.hud.update(self.player_ship, ap_name)
+        # 7b. Pooled AI: publish this tick's state for the workers to plan against
+        if self.ai_planner is not None:
+            planned = [
+                s for s in self.all_ships
+                if s.alive and self._ai_due(s)
+                and (not s.is_player_controlled or s.autopilot_mode is not None)
+            ]
+            self.ai_planner.publish(self.all_ships, planned, self._ai_dt(None, dt), self.sim_time)
+            evaluated = len(planned)
+
+        # 8. Timed effects (hit flashes, debris tweens, delayed destroys)
+        self.scheduler.update()
+
+        # 9. Metrics — counters only; rates are derived by the backend
+        m = self.metrics
+        m.inc('autopilot_evaluations', evaluated)
+        m.set('autopilot_evaluations_per_tick', evaluated)
+        fire_evals = self.fire_control.evaluations
+        m.inc('fire_evaluations', fire_evals - self._fire_evals)
+        self._fire_evals = fire_evals
+        m.inc('ticks')
+        self.tick_seconds = perf_counter() - tick_start
+        m.observe('tick_seconds', self.tick_seconds)
+
+    def enable_pooled_ai(self, workers=None, use_processes=False):
+        """Move autopilot and AI fire decisions onto a worker pool (one tick of latency)."""
+        if self.ai_planner is None:
+            self.ai_planner = AIPlanner(workers=workers, use_processes=use_processes)
+
+    def disable_pooled_ai(self):
+        if self.ai_planner is not None:
+            self.ai_planner.apply(self.projectiles, self.sim_time, self.collisions.broadphase)
+            self.ai_planner.shutdown()
+            self.ai_planner = None
+
+    def shutdown(self):
+        """Release background resources; called from the app's quit path."""
+        if self.metrics_exporter is not None:
+            self.metrics_exporter.stop()      # final flush, closes sockets
+            self.metrics_exporter = None
+        self.disable_pooled_ai()
+        self.sectors.close()
+
+    def _ai_due(self, ship):
+        """Whether an AI ship makes a decision this tick (player ships always do)."""
+        interval = self.ai_interval
+        if interval <= 1 or ship.is_player_controlled:
+            return True
+        return (self.tick + ship.ship_id) % interval == 0
+
+    def _ai_dt(self, ship, dt):
+        if ship is not None and ship.is_player_controlled:
+            return dt
+        return dt * self.ai_interval
 
     def _handle_player_input(self, dt):
         ship = self.player_ship
@@ -182,7 +416,7 @@ class GameManager:
         # --- Fire weapons ---
         if held_keys['left mouse'] or mouse.left:
             for weapon in ship.weapons:
-                weapon.fire(self.projectiles)
+                weapon.fire(self.projectiles, self.sim_time)
 
     def input(self, key):
         """Handle discrete key presses (called by Ursina)."""
@@ -208,6 +442,12 @@ class GameManager:
             if self.player_ship:
                 self.player_ship.autopilot_mode = None
 
+        # , / . — time warp down / up
+        if key == '.':
+            self.timewarp.faster()
+        if key == ',':
+            self.timewarp.slower()
+
         # H — toggle help overlay
         if key == 'h':
             self.hud.toggle_help()
@@ -240,6 +480,7 @@ class GameManager:
             self.player_ship.autopilot_mode = AutopilotMode.KEEP_AT_RANGE
             self.player_ship.thrust_input = Vec3(0, 0, 0)
             self.player_ship.rotation_input = Vec3(0, 0, 0)
+            self.fire_control.wake(self.player_ship, self.sim_time)
 
         # Find next alive friendly
         current_idx = alive_friendly.index(self.player_ship) if self.player_ship in alive_friendly else 0
@@ -268,43 +509,75 @@ class GameManager:
         else:
             ship.target = enemies[0]
 
-    def _ai_fire(self, dt):
-        """Non-player ships fire at their targets when aimed."""
-        for ship in self.all_ships:
-            if not ship.alive or ship.is_player_controlled:
-                continue
-            if ship.target is None or not ship.target.alive:
-                continue
-            # Check if target is roughly in front
-            to_target = (ship.target.position - ship.position)
-            dist = to_target.length()
-            if dist < 1:
-                continue
-            dot = ship.forward.dot(to_target.normalized())
-            # Fire if aimed within ~15 degrees and in range
-            if dot > 0.96 and dist < ship.weapons[0].range if ship.weapons else False:
-                for weapon in ship.weapons:
-                    weapon.fire(self.projectiles)
-
     def _update_projectiles(self, dt):
         """Move projectiles and handle hits."""
-        to_remove = []
+        now = self.sim_time
+        # Everything past last tick's survivors was fired since then
+        self.metrics.inc('projectiles_fired', len(self.projectiles) - self._proj_kept)
+        stepped = []
         for proj in self.projectiles:
-            hit_ship = proj.update_projectile(dt, self.all_ships)
-            if hit_ship is not None:
-                destroyed = apply_damage(hit_ship, proj.damage)
-            if not proj.alive:
-                to_remove.append(proj)
-
-        for proj in to_remove:
-            self.projectiles.remove(proj)
-            destroy(proj)
+            if proj.analytic:
+                # Resolved by the impact queue; the tracer evaluates its own position
+                if proj.fire_time is None:
+                    self.impacts.add(proj, self.all_ships, now)
+            elif proj.alive:
+                stepped.append(proj)
+
+        damage = self.damage
+        hit_count = 0
+        for proj, hit_ship in step_projectiles(stepped, self.all_ships, dt):
+            damage.add(hit_ship, proj.damage, proj.weapon)
+            hit_count += 1
+
+        if len(self.impacts):
+            hits, expired = self.impacts.update(now)
+            for proj, hit_ship in hits:
+                damage.add(hit_ship, proj.damage, proj.weapon)
+            hit_count += len(hits)
+
+        # One damage application and at most one visual per ship hit this tick;
+        # the wrecks go back to the pool
+        self._retire_dead(damage.resolve())
+
+        # Compact in place; weapons and the planner append to this same list
+        before = len(self.projectiles)
+        self.projectiles[:] = [p for p in self.projectiles if p.alive]
+        self._proj_kept = len(self.projectiles)
+        self.metrics.inc('projectiles_hit', hit_count)
+        self.metrics.inc('projectiles_expired', max(0, before - self._proj_kept - hit_count))
+
+    def set_projectile_mode(self, mode):
+        """'stepped' (per-frame collision) or 'analytic' (time-of-impact events)."""
+        if mode not in ('stepped', 'analytic'):
+            raise ValueError(f'unknown projectile mode: {mode}')
+        weapons.projectile_mode = mode
 
     def _reassign_dead_targets(self):
         """If a ship's target is dead, find a new one."""
-        for ship in self.friendly_ships:
-            if ship.alive and (ship.target is None or not ship.target.alive):
-                ship.target = self._nearest_enemy(ship, self.enemy_ships)
-        for ship in self.enemy_ships:
-            if ship.alive and (ship.target is None or not ship.target.alive):
-                ship.target = self._nearest_enemy(ship, self.friendly_ships)
+        for ships, enemies in ((self.friendly_ships, self.enemy_ships),
+                               (self.enemy_ships, self.friendly_ships)):
+            # Squadron followers take their leader's target instead
+            needy = [
+                s for s in ships
+                if s.alive and (s.target is None or not s.target.alive)
+                and not self.squadrons.is_follower(s)
+            ]
+            if not needy:
+                continue
+            for ship, target in zip(needy, self._nearest_enemies(needy, enemies)):
+                ship.target = target
+                self.fire_control.wake(ship, self.sim_time)
+
+    def _nearest_enemies(self, ships, enemy_list):
+        """Batched _nearest_enemy through the kernel backend."""
+        kb = kernels.backend
+        if not kernels.use_batch(len(ships), kernels.min_batch_ships):
+            return [self._nearest_enemy(s, enemy_list) for s in ships]
+        out = kb.int_array([0] * len(ships))
+        kb.nearest(
+            kb.vec_array(s.position for s in ships),
+            kb.vec_array(e.position for e in enemy_list),
+            kb.int_array(1 if e.alive else 0 for e in enemy_list),
+            out,
+        )
+        return [enemy_list[int(i)] if i >= 0 else None for i in out]
@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""Golden-trajectory check: does an optimized code path fly the same battle?
+
+    python golden.py --scenario scenarios/default.json --ticks 900 --seed 7 \
+        --reference reference --candidate numpy --tol 1e-5 --atol 0.05
+
+Both profiles run the same seeded scenario headless from a clean slate, one
+fixed-dt tick at a time. The state of every ship (position, velocity,
+rotation, hp, shield, alive) is recorded each tick, and the report names the
+first tick, ship and field where the candidate differs from the reference by
+more than the tolerance (absolute plus relative on the continuous fields,
+exact on hp/shield/alive), along with the speedup of the simulation steps.
+default.json has no hits; use scenarios/dogfight.json to exercise projectile
+and damage paths.
+"""
+from typing import NamedTuple, Optional
+import argparse
+import math
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+
+# Which implementation each profile selects. Add a profile when a new
+# optimized path lands, then check it against 'reference'. Kernel profiles
+# batch every call (no small-batch scalar fallback) so the kernels are
+# exercised even on small scenarios.
+PROFILES = {
+    'reference': {'kernels': 'python', 'projectile_mode': 'stepped'},
+    'numpy': {'kernels': 'numpy', 'projectile_mode': 'stepped', 'force_batch': True},
+    'numba': {'kernels': 'numba', 'projectile_mode': 'stepped', 'force_batch': True},
+    # Analytic hits land at the exact time of contact, stepped ones on the
+    # first tick inside the hit radius: damage may come a tick apart. Stepped
+    # rounds can also skip past a grazed hit sphere between ticks, which the
+    # analytic solve catches, so expect hp to part at the first such graze
+    'analytic': {'kernels': 'python', 'projectile_mode': 'analytic', 'hit_slack': 1},
+}
+
+DAMAGE_FIELDS = ('hp', 'shield', 'alive')
+
+FIELDS = ('position', 'velocity', 'rotation', 'hp', 'shield', 'alive')
+
+
+class Trajectory(NamedTuple):
+    profile: str
+    frames: list            # per tick: {ship_id: (position, velocity, rotation, hp, shield, alive)}
+    step_seconds: float     # time spent in GameManager.step only
+
+
+class Divergence(NamedTuple):
+    tick: int
+    ship_id: int
+    field: str
+    reference: object
+    candidate: object
+
+
+def _record(gm):
+    return {
+        s.ship_id: (tuple(s.position), tuple(s.velocity), tuple(s.rotation), s.hp, s.shield, s.alive)
+        for s in gm.all_ships
+    }
+
+
+def _reset():
+    """Clean slate between runs that share one process."""
+    from ursina import scene
+    from ecs import world
+    from scheduler import scheduler
+    import ship
+
+    scene.clear()
+    world.clear()
+    scheduler.clear()
+    ship.reset_ids()
+
+
+def run(scenario, profile, ticks=600, dt=1 / 60, seed=0):
+    """Fly `scenario` for `ticks` fixed steps under `profile`; returns a Trajectory."""
+    from game_manager import GameManager
+    import kernels
+
+    settings = PROFILES[profile]
+    saved = kernels.backend, kernels.min_batch_ships, kernels.min_batch_projectiles
+    _reset()
+    kernels.backend = kernels.make_backend(settings['kernels'])
+    if settings.get('force_batch'):
+        kernels.min_batch_ships = kernels.min_batch_projectiles = 0
+    try:
+        gm = GameManager(scenario_path=scenario, seed=seed)
+        gm.set_projectile_mode(settings['projectile_mode'])
+        # Frame-time driven knobs would make the run depend on the machine
+        gm.quality.enabled = False
+        gm.quality.set_level(0)
+
+        frames = []
+        spent = 0.0
+        for _ in range(ticks):
+            t0 = time.perf_counter()
+            gm.step(dt)
+            spent += time.perf_counter() - t0
+            frames.append(_record(gm))
+        gm.set_projectile_mode('stepped')
+    finally:
+        kernels.backend, kernels.min_batch_ships, kernels.min_batch_projectiles = saved
+    return Trajectory(profile, frames, spent)
+
+
+def _differs(a, b, tol, atol=0.0):
+    """True when a and b differ by more than atol + tol * magnitude.
+
+    Ship state is float32 Vec3s while the kernels compute in float64, so
+    equal code paths still differ by a few float32 ulps (~6e-8 relative)
+    per tick, and the AI's feedback loops amplify that over a combat run
+    (about 0.01 units by tick 900 on dogfight.json). `atol` absorbs that
+    drift on the continuous fields; a wrong code path is off by far more
+    at once. hp, shield and alive are discrete and compare exactly.
+    """
+    if isinstance(a, tuple):
+        # Vectors compare by length, so a near-zero component of a large
+        # vector is held to the vector's scale, not its own
+        err = math.sqrt(sum((x - y) ** 2 for x, y in zip(a, b)))
+        size = max(math.sqrt(sum(x * x for x in a)), math.sqrt(sum(y * y for y in b)))
+        return err > atol + tol * max(1.0, size)
+    return a != b
+
+
+def first_divergence(reference, candidate, tol=1e-5, atol=0.05) -> Optional[Divergence]:
+    """First (tick, ship, field) where candidate parts from reference, or None.
+
+    Positions, velocities and rotations may differ by `atol` (world units,
+    units/s, degrees) plus `tol` relative; damage fields must match exactly,
+    within the profile's hit_slack ticks.
+    """
+    slack = PROFILES.get(candidate.profile, {}).get('hit_slack', 0)
+    frames = reference.frames
+    for tick, (ref, cand) in enumerate(zip(frames, candidate.frames)):
+        for ship_id in sorted(ref.keys() | cand.keys()):
+            a, b = ref.get(ship_id), cand.get(ship_id)
+            if a is None or b is None:
+                return Divergence(tick, ship_id, 'present', a is not None, b is not None)
+            for i, (name, va, vb) in enumerate(zip(FIELDS, a, b)):
+                if not _differs(va, vb, tol, atol):
+                    continue
+                if name in DAMAGE_FIELDS and any(
+                    ship_id in frames[t] and not _differs(frames[t][ship_id][i], vb, tol, atol)
+                    for t in range(max(0, tick - slack), min(len(frames), tick + slack + 1))
+                ):
+                    continue
+                return Divergence(tick, ship_id, name, va, vb)
+    return None
+
+
+def error_growth(reference, candidate, ticks=(1, 10, 100, 1000)):
+    """Largest relative position/velocity error at a few ticks.
+
+    Float rounding amplified by the AI's feedback loops grows smoothly from
+    ulp level (~1e-8 at tick 1); a wrong code path shows up large at once.
+    """
+    out = []
+    for tick in ticks:
+        if tick >= min(len(reference.frames), len(candidate.frames)):
+            break
+        ref, cand = reference.frames[tick], candidate.frames[tick]
+        worst = 0.0
+        for ship_id in ref.keys() & cand.keys():
+            for i in (0, 1):
+                a, b = ref[ship_id][i], cand[ship_id][i]
+                err = math.sqrt(sum((x - y) ** 2 for x, y in zip(a, b)))
+                worst = max(worst, err / max(1.0, math.sqrt(sum(x * x for x in a))))
+        out.append((tick, worst))
+    return out
+
+
+def report(reference, candidate, tol=1e-5, atol=0.05):
+    lines = [f'--- golden: {candidate.profile} vs {reference.profile} ---']
+    div = first_divergence(reference, candidate, tol, atol)
+    if div is None:
+        lines.append(f'  identical within {atol} + {tol} relative for {len(reference.frames)} ticks')
+    else:
+        lines.append(f'  DIVERGED at tick {div.tick}, ship {div.ship_id}, {div.field}')
+        lines.append(f'    {reference.profile}: {div.reference}')
+        lines.append(f'    {candidate.profile}: {div.candidate}')
+    growth = error_growth(reference, candidate)
+    if growth:
+        lines.append('  max relative error: ' + ', '.join(f'tick {t} {e:.1e}' for t, e in growth))
+    speedup = reference.step_seconds / candidate.step_seconds if candidate.step_seconds else float('inf')
+    lines.append(
+        f'  step time {reference.step_seconds * 1000:.1f} ms -> {candidate.step_seconds * 1000:.1f} ms'
+        f'  (speedup {speedup:.2f}x)'
+    )
+    return '\n'.join(lines), div
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--scenario', default=os.path.join('scenarios', 'default.json'))
+    parser.add_argument('--ticks', type=int, default=600)
+    parser.add_argument('--dt', type=float, default=1 / 60)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--tol', type=float, default=1e-5, help='relative tolerance')
+    parser.add_argument('--atol', type=float, default=0.05,
+                        help='absolute tolerance on position/velocity/rotation (float drift)')
+    parser.add_argument('--reference', default='reference', choices=sorted(PROFILES))
+    parser.add_argument('--candidate', default='numpy', choices=sorted(PROFILES))
+    args = parser.parse_args(argv)
+
+    from ursina import Ursina
+    Ursina(window_type='none', development_mode=False)
+
+    ref = run(args.scenario, args.reference, args.ticks, args.dt, args.seed)
+    cand = run(args.scenario, args.candidate, args.ticks, args.dt, args.seed)
+    text, div = report(ref, cand, args.tol, args.atol)
+    print(text)
+    return 1 if div is not None else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,4 +1,5 @@
 from ursina import Text, Vec2, Entity, color, camera, window
+from visual_sync import visual_sync
 
 
 HELP_TEXT = """=== SPACE COMBAT SIMULATOR ===
@@ -24,6 +25,7 @@ HELP_TEXT = """=== SPACE COMBAT SIMULATOR ===
 
   OTHER
     TAB            Switch ship
+    , / .          Time warp down / up
     H              Toggle this help
     P              Unlock mouse
     F11            Toggle fullscreen
@@ -74,6 +76,12 @@ class HUD:
             scale=1.2,
             color=color.orange,
         )
+        self.warp_text = Text(
+            text='',
+            position=Vec2(left_x, base_y - line_h * 6),
+            scale=1.2,
+            color=color.magenta,
+        )
         # Center crosshair
         self.crosshair = Text(
             text='+',
@@ -90,7 +98,12 @@ class HUD:
             color=color.rgba(255, 255, 255, 100),
         )
 
-        # === Help overlay (hidden by default) ===
+        # === Help overlay (built on first use) ===
+        self.help_bg = None
+        self.help_text = None
+        self.help_visible = False
+
+    def _build_help(self):
         self.help_bg = Entity(
             parent=camera.ui,
             model='quad',
@@ -107,9 +120,10 @@ class HUD:
             color=color.rgba(200, 255, 200, 255),
             visible=False,
         )
-        self.help_visible = False
 
     def toggle_help(self):
+        if self.help_bg is None:
+            self._build_help()
         self.help_visible = not self.help_visible
         self.help_bg.visible = self.help_visible
         self.help_text.visible = self.help_visible
@@ -118,38 +132,43 @@ class HUD:
         if ship is None:
             return
 
-        self.speed_text.text = f'SPD: {ship.speed:.0f}'
-        self.hp_text.text = f'HP: {ship.hp:.0f}/{ship.max_hp:.0f}'
-        self.shield_text.text = f'SLD: {ship.shield:.0f}/{ship.max_shield:.0f}'
-        self.ship_text.text = f'SHIP: {ship.ship_name}'
+        sync = visual_sync
+        sync.set_text(self.speed_text, f'SPD: {ship.speed:.0f}')
+        sync.set_text(self.hp_text, f'HP: {ship.hp:.0f}/{ship.max_hp:.0f}')
+        sync.set_text(self.shield_text, f'SLD: {ship.shield:.0f}/{ship.max_shield:.0f}')
+        sync.set_text(self.ship_text, f'SHIP: {ship.ship_name}')
 
         # HP color
         hp_ratio = ship.hp / max(ship.max_hp, 1)
         if hp_ratio > 0.5:
-            self.hp_text.color = color.green
+            sync.set_color(self.hp_text, color.green)
         elif hp_ratio > 0.25:
-            self.hp_text.color = color.yellow
+            sync.set_color(self.hp_text, color.yellow)
         else:
-            self.hp_text.color = color.red
+            sync.set_color(self.hp_text, color.red)
 
         # Shield color
         if ship.shield > 0:
-            self.shield_text.color = color.azure
+            sync.set_color(self.shield_text, color.azure)
         else:
-            self.shield_text.color = color.gray
+            sync.set_color(self.shield_text, color.gray)
 
         # Target
         if ship.target and ship.target.alive:
             dist = (ship.target.position - ship.position).length()
-            self.target_text.text = f'TGT: {ship.target.ship_name} [{dist:.0f}m]'
-            self.target_text.color = color.yellow
+            sync.set_text(self.target_text, f'TGT: {ship.target.ship_name} [{dist:.0f}m]')
+            sync.set_color(self.target_text, color.yellow)
         else:
-            self.target_text.text = 'TGT: None'
-            self.target_text.color = color.gray
+            sync.set_text(self.target_text, 'TGT: None')
+            sync.set_color(self.target_text, color.gray)
 
         # Autopilot
-        self.autopilot_text.text = f'AP: {autopilot_mode_name}'
+        sync.set_text(self.autopilot_text, f'AP: {autopilot_mode_name}')
         if autopilot_mode_name == 'OFF':
-            self.autopilot_text.color = color.gray
+            sync.set_color(self.autopilot_text, color.gray)
         else:
-            self.autopilot_text.color = color.orange
+            sync.set_color(self.autopilot_text, color.orange)
+
+    def set_warp(self, label):
+        """Show the time-warp factor, or hide it at normal speed."""
+        visual_sync.set_text(self.warp_text, f'WARP: {label}' if label else '')
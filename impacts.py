@@ -0,0 +1,129 @@
+from ursina import Vec3
+from weapons import ship_hit_radius
+import heapq
+import itertools
+import math
+
+
+def time_to_contact(rel_pos, rel_vel, radius):
+    """Earliest τ ≥ 0 with |rel_pos + rel_vel·τ| ≤ radius, or None if never."""
+    c = rel_pos.dot(rel_pos) - radius * radius
+    if c <= 0:
+        return 0.0
+    a = rel_vel.dot(rel_vel)
+    b = 2 * rel_pos.dot(rel_vel)
+    if a < 1e-9 or b >= 0:
+        return None  # not closing
+    disc = b * b - 4 * a * c
+    if disc < 0:
+        return None  # closest approach misses
+    return (-b - math.sqrt(disc)) / (2 * a)
+
+
+class ImpactQueue:
+    """Resolves analytic projectiles from predicted time-of-impact events.
+
+    At fire time each projectile is solved against every ship it could
+    possibly reach, assuming constant velocities, and one event (hit or expiry)
+    is pushed to a heap. Ships are tracked against the straight-line trajectory
+    the prediction assumed; only when one drifts more than `tolerance` from it
+    are the projectiles watching that ship re-solved. Per-projectile cost is
+    therefore paid at fire time and on trajectory changes, not every frame.
+    """
+    def __init__(self, tolerance=0.75):
+        self.tolerance = tolerance
+        self._heap = []          # (event_time, seq, projectile)
+        self._seq = itertools.count()
+        self._tracks = {}        # ship_id -> (ship, position, velocity, t0)
+        self._watchers = {}      # ship_id -> set of projectiles with it as candidate
+        self.repredictions = 0
+        self.now = 0.0
+
+    def __len__(self):
+        return len(self._heap)
+
+    def add(self, proj, ships, now):
+        self.now = now
+        proj.fire_time = now
+        # Anything further than this at fire time can never meet the projectile
+        max_reach = proj.max_range + proj.lifetime * max((s.max_speed for s in ships), default=0)
+        for ship in ships:
+            if not ship.alive or ship.faction == proj.faction or ship is proj.live_owner:
+                continue
+            if (ship.position - proj.origin).length() > max_reach + ship_hit_radius(ship):
+                continue
+            proj.candidates.append(ship)
+            if ship.ship_id not in self._tracks:
+                self._tracks[ship.ship_id] = (ship, Vec3(ship.position), Vec3(ship.velocity), now)
+            self._watchers.setdefault(ship.ship_id, set()).add(proj)
+        self._predict(proj, now)
+
+    def _predict(self, proj, now):
+        best_t = proj.fire_time + proj.lifetime
+        best_ship = None
+        p_now = proj.position_at(now)
+        p_vel = proj.direction * proj.speed
+        for ship in proj.candidates:
+            if not ship.alive:
+                continue
+            _, pos, vel, t0 = self._tracks[ship.ship_id]
+            q_now = pos + vel * (now - t0)
+            tau = time_to_contact(p_now - q_now, p_vel - vel, ship_hit_radius(ship))
+            if tau is not None and now + tau < best_t:
+                best_t = now + tau
+                best_ship = ship
+        proj.hit_ship = best_ship
+        proj.event_seq = next(self._seq)
+        heapq.heappush(self._heap, (best_t, proj.event_seq, proj))
+
+    def _release(self, proj):
+        for ship in proj.candidates:
+            watchers = self._watchers.get(ship.ship_id)
+            if watchers is not None:
+                watchers.discard(proj)
+                if not watchers:
+                    del self._watchers[ship.ship_id]
+                    self._tracks.pop(ship.ship_id, None)
+        proj.candidates = []
+
+    def forget_ship(self, ship):
+        """A ship left the simulation: re-solve everything that was watching it."""
+        self._tracks.pop(ship.ship_id, None)
+        watchers = self._watchers.pop(ship.ship_id, ())
+        for proj in watchers:
+            proj.candidates = [s for s in proj.candidates if s is not ship]
+            if proj.alive and proj.hit_ship is ship:
+                self._predict(proj, self.now)
+
+    def update(self, now):
+        """Advance to `now`. Returns (hits, expired): [(projectile, ship)], [projectile]."""
+        self.now = now
+        # --- Re-solve projectiles watching ships that left their predicted path ---
+        for ship_id, (ship, pos, vel, t0) in list(self._tracks.items()):
+            if not ship.alive:
+                continue
+            if (ship.position - (pos + vel * (now - t0))).length() <= self.tolerance:
+                continue
+            self._tracks[ship_id] = (ship, Vec3(ship.position), Vec3(ship.velocity), now)
+            for proj in self._watchers.get(ship_id, ()):
+                self._predict(proj, now)
+                self.repredictions += 1
+
+        # --- Fire due events ---
+        hits, expired = [], []
+        heap = self._heap
+        while heap and heap[0][0] <= now:
+            _, seq, proj = heapq.heappop(heap)
+            if seq != proj.event_seq or not proj.alive:
+                continue  # superseded by a later prediction
+            ship = proj.hit_ship
+            if ship is not None and not ship.alive:
+                self._predict(proj, now)  # victim died first; look for the next one
+                continue
+            proj.alive = False
+            self._release(proj)
+            if ship is None:
+                expired.append(proj)
+            else:
+                hits.append((proj, ship))
+        return hits, expired
@@ -0,0 +1,254 @@
+"""Runtime counters, gauges and histograms, exported off the main thread.
+
+The game only ever touches plain dicts and lists here (an increment is a dict
+update; copying a dict of numbers happens under the GIL in one go), so there
+are no locks on the hot path. A daemon thread snapshots everything every
+`interval` seconds and hands it to the sinks:
+
+    PrometheusTextfile('/var/lib/node_exporter/homage.prom')
+    StatsdUDP('127.0.0.1', 8125)
+
+Set HOMAGE_METRICS to 'prom:<path>' or 'statsd:<host>:<port>' to have
+GameManager start an exporter on launch. Each GameManager owns its own
+Metrics registry, so counters never carry over from one game to the next.
+"""
+import bisect
+import os
+import socket
+import threading
+import time
+
+
+# Seconds; shared by the frame and tick time histograms
+TIME_BUCKETS = (0.001, 0.002, 0.004, 0.008, 0.016, 0.033, 0.066, 0.1, 0.25, 0.5, 1.0)
+
+
+class Histogram:
+    __slots__ = ('buckets', 'counts', 'count', 'sum')
+
+    def __init__(self, buckets):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)    # last slot is +Inf
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def snapshot(self):
+        return (self.buckets, list(self.counts), self.count, self.sum)
+
+
+def _key(name, labels):
+    return (name, tuple(sorted(labels.items()))) if labels else name
+
+
+def _escape(value):
+    """Prometheus label value escaping: backslash, double quote, newline."""
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _split(key):
+    """Series key -> (name, ((label, value), ...))."""
+    return key if isinstance(key, tuple) else (key, ())
+
+
+class Metrics:
+    """Counters, gauges and histograms keyed by name (plus optional labels)."""
+    def __init__(self):
+        self.counters = {}
+        self.gauges = {}
+        self.histograms = {}
+        self.help = {}
+
+    def inc(self, name, n=1, **labels):
+        key = _key(name, labels)
+        self.counters[key] = self.counters.get(key, 0) + n
+
+    def set(self, name, value, **labels):
+        self.gauges[_key(name, labels)] = value
+
+    def observe(self, name, value, buckets=TIME_BUCKETS):
+        h = self.histograms.get(name)
+        if h is None:
+            h = self.histograms[name] = Histogram(buckets)
+        h.observe(value)
+
+    def describe(self, name, text):
+        self.help[name] = text
+
+    def snapshot(self):
+        return {
+            'counters': dict(self.counters),
+            'gauges': dict(self.gauges),
+            'histograms': {name: h.snapshot() for name, h in list(self.histograms.items())},
+        }
+
+
+# === Sinks ===
+
+class PrometheusTextfile:
+    """Writes the Prometheus text exposition format, replacing the file atomically."""
+    def __init__(self, path, prefix='homage_'):
+        self.path = path
+        self.prefix = prefix
+
+    def write(self, snap, help_text):
+        p = self.prefix
+        lines = []
+        typed = set()
+
+        def series(kind, items, suffix=''):
+            # Group label variants under one TYPE line; HELP/TYPE name the
+            # sample family, so counters are typed with their _total suffix
+            for key, value in sorted(items, key=lambda kv: _split(kv[0])):
+                name, labels = _split(key)
+                if name not in typed:
+                    typed.add(name)
+                    if name in help_text:
+                        lines.append(f'# HELP {p}{name}{suffix} {help_text[name]}')
+                    lines.append(f'# TYPE {p}{name}{suffix} {kind}')
+                tag = '{' + ','.join(f'{k}="{_escape(v)}"' for k, v in labels) + '}' if labels else ''
+                yield name, tag, value
+
+        for name, tag, value in series('counter', snap['counters'].items(), '_total'):
+            lines.append(f'{p}{name}_total{tag} {value}')
+        for name, tag, value in series('gauge', snap['gauges'].items()):
+            lines.append(f'{p}{name}{tag} {value}')
+        for name, _, (buckets, counts, count, total) in series('histogram', snap['histograms'].items()):
+            cumulative = 0
+            for bound, n in zip(buckets, counts):
+                cumulative += n
+                lines.append(f'{p}{name}_bucket{{le="{bound}"}} {cumulative}')
+            lines.append(f'{p}{name}_bucket{{le="+Inf"}} {count}')
+            lines.append(f'{p}{name}_sum {total}')
+            lines.append(f'{p}{name}_count {count}')
+
+        tmp = self.path + '.tmp'
+        with open(tmp, 'w') as f:
+            f.write('\n'.join(lines) + '\n')
+        os.replace(tmp, self.path)
+
+    def close(self):
+        pass
+
+
+class StatsdUDP:
+    """Sends counter deltas and gauges as statsd lines over UDP.
+
+    Histograms go out as count/sum deltas plus per-bucket deltas, since
+    individual observations are not kept.
+    """
+    def __init__(self, host='127.0.0.1', port=8125, prefix='homage.', max_packet=1400):
+        self.addr = (host, port)
+        self.prefix = prefix
+        self.max_packet = max_packet
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self._last = {}
+
+    @staticmethod
+    def _name(key):
+        # Plain statsd has no tags; fold label values into the dotted name
+        name, labels = _split(key)
+        return '.'.join([name] + [str(v) for _, v in labels])
+
+    def _delta(self, key, value):
+        prev = self._last.get(key, 0)
+        self._last[key] = value
+        return value - prev
+
+    def write(self, snap, help_text):
+        p = self.prefix
+        lines = []
+        for key, value in snap['counters'].items():
+            name = self._name(key)
+            d = self._delta(name, value)
+            if d:
+                lines.append(f'{p}{name}:{d}|c')
+        for key, value in snap['gauges'].items():
+            lines.append(f'{p}{self._name(key)}:{value}|g')
+        for name, (buckets, counts, count, total) in snap['histograms'].items():
+            d = self._delta(name + '.count', count)
+            if not d:
+                continue
+            lines.append(f'{p}{name}.count:{d}|c')
+            lines.append(f'{p}{name}.sum:{self._delta(name + ".sum", total):.6f}|c')
+            for bound, n in zip(list(buckets) + ['inf'], counts):
+                bd = self._delta(f'{name}.le_{bound}', n)
+                if bd:
+                    lines.append(f'{p}{name}.le_{bound}:{bd}|c')
+
+        # Pack lines into datagrams under the MTU
+        packet = ''
+        for line in lines:
+            if packet and len(packet) + len(line) + 1 > self.max_packet:
+                self.sock.sendto(packet.encode(), self.addr)
+                packet = ''
+            packet = f'{packet}\n{line}' if packet else line
+        if packet:
+            self.sock.sendto(packet.encode(), self.addr)
+
+    def close(self):
+        self.sock.close()
+
+
+# === Exporter ===
+
+class MetricsExporter:
+    """Daemon thread that flushes a Metrics snapshot to every sink on an interval."""
+    def __init__(self, registry, sinks, interval=5.0):
+        self.registry = registry
+        self.sinks = list(sinks)
+        self.interval = interval
+        self.errors = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='metrics-exporter', daemon=True)
+        registry.help.setdefault('exported_at', 'Unix time of the last export.')
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.flush()
+
+    def flush(self):
+        snap = self.registry.snapshot()
+        snap['gauges']['exported_at'] = time.time()
+        for sink in self.sinks:
+            try:
+                sink.write(snap, self.registry.help)
+            except OSError:
+                self.errors += 1    # a missing listener or full disk must not kill the game
+
+    def stop(self, flush=True):
+        self._stop.set()
+        if self._thread.is_alive():
+            self._thread.join()
+        if flush:
+            self.flush()
+        for sink in self.sinks:
+            sink.close()
+
+
+def sink_from_spec(spec):
+    """'prom:<path>' or 'statsd:<host>:<port>'."""
+    kind, _, rest = spec.partition(':')
+    if kind == 'prom':
+        return PrometheusTextfile(rest)
+    if kind == 'statsd':
+        host, _, port = rest.rpartition(':')
+        return StatsdUDP(host or '127.0.0.1', int(port or 8125))
+    raise ValueError(f'unknown metrics sink: {spec!r}')
+
+
+def start_from_env(registry, var='HOMAGE_METRICS', interval=5.0):
+    """Start an exporter if `var` is set (comma-separated specs); else None."""
+    spec = os.environ.get(var)
+    if not spec:
+        return None
+    return MetricsExporter(registry, [sink_from_spec(s) for s in spec.split(',')], interval).start()
+
@@ -1,4 +1,13 @@
-from ursina import Vec3, time, color
+from ursina import Vec3, time
+from visual_sync import quantize
+import kernels
+
+
+GLOW_STEPS = 16   # engine glow colour levels; finer changes are not pushed
+
+
+def _clamp1(v):
+    return max(-1.0, min(1.0, v))
 
 
 def update_ship_physics(ship, dt):
@@ -11,14 +20,10 @@ def update_ship_physics(ship, dt):
         return
 
     # --- Rotation ---
-    rot = ship.rotation_input
-    rot_speed = ship.rotation_force / ship.mass  # heavier ships turn slower
-    ship.rotation_x -= rot.x * rot_speed * dt * 60  # pitch
-    ship.rotation_y -= rot.y * rot_speed * dt * 60  # yaw
-    ship.rotation_z -= rot.z * rot_speed * dt * 60  # roll
+    _apply_rotation(ship, dt)
 
     # --- Thrust → Acceleration (F = ma) ---
-    t = ship.thrust_input
+    t = _thrust_of(ship)
     # Convert local-space thrust to world-space force
     world_thrust = (
         ship.forward * t.z +
@@ -41,13 +46,72 @@ def update_ship_physics(ship, dt):
     ship.position += ship.velocity * dt
 
     # --- Engine glow ---
+    _update_glow(ship, t)
+
+
+def update_ships_physics(ships, dt):
+    """Batched update_ship_physics for a list of live ships.
+
+    Rotation and the engine glow touch the scene graph and stay per ship; the
+    integration in between runs through the selected kernel backend. With the
+    pure-Python backend (unless batching is forced), or fewer than
+    kernels.min_batch_ships ships, the per-ship path is used directly, since
+    gathering into arrays would only add work (see kernels.use_batch).
+    """
+    kb = kernels.backend
+    if not kernels.use_batch(len(ships), kernels.min_batch_ships):
+        for ship in ships:
+            update_ship_physics(ship, dt)
+        return
+
+    for ship in ships:
+        _apply_rotation(ship, dt)
+    thrusts = [_thrust_of(ship) for ship in ships]
+
+    pos = kb.vec_array(s.position for s in ships)
+    vel = kb.vec_array(s.velocity for s in ships)
+    kb.integrate_ships(
+        pos, vel,
+        kb.vec_array(s.forward for s in ships),
+        kb.vec_array(s.right for s in ships),
+        kb.vec_array(s.up for s in ships),
+        kb.vec_array(thrusts),
+        kb.float_array(s.thrust_force / s.mass for s in ships),
+        kb.float_array(s.drag for s in ships),
+        kb.float_array(s.max_speed for s in ships),
+        dt,
+    )
+    for i, ship in enumerate(ships):
+        ship.velocity = Vec3(*vel[i])
+        ship.position = Vec3(*pos[i])
+        _update_glow(ship, thrusts[i])
+
+
+def _apply_rotation(ship, dt):
+    rot = ship.rotation_input
+    rot_speed = ship.rotation_force / ship.mass  # heavier ships turn slower
+    ship.rotation_x -= rot.x * rot_speed * dt * 60  # pitch
+    ship.rotation_y -= rot.y * rot_speed * dt * 60  # yaw
+    ship.rotation_z -= rot.z * rot_speed * dt * 60  # roll
+
+
+def _thrust_of(ship):
+    """Joystick thrust plus avoidance steering; only the steering is clamped per axis."""
+    a = ship.avoid_thrust
+    return ship.thrust_input + Vec3(_clamp1(a.x), _clamp1(a.y), _clamp1(a.z))
+
+
+def _update_glow(ship, t):
+    if ship.lod:
+        return  # simplified, dot or culled: RenderLOD already dropped the glow
     thrust_magnitude = abs(t.z) + abs(t.x) + abs(t.y)
-    ship.engine_glow.visible = thrust_magnitude > 0.05
-    if ship.engine_glow.visible:
-        glow_intensity = min(thrust_magnitude, 1.0)
-        ship.engine_glow.color = color.rgba(
-            int(80 + 130 * glow_intensity),
-            int(130 + 80 * glow_intensity),
-            255,
-            int(100 + 155 * glow_intensity),
-        )
+    if thrust_magnitude <= 0.05:
+        ship.glow = None
+        return
+    glow_intensity = quantize(min(thrust_magnitude, 1.0), GLOW_STEPS)
+    ship.glow = (
+        80 + 130 * glow_intensity,
+        130 + 80 * glow_intensity,
+        255,
+        100 + 155 * glow_intensity,
+    )
@@ -0,0 +1,70 @@
+from ursina import window
+import combat
+
+
+# Cheapest last. Each level sets every knob, so stepping is just an index change.
+QUALITY_LEVELS = [
+    {'stars': 600, 'debris': 8, 'ai_interval': 1, 'tracers': 4096, 'overlays': True},
+    {'stars': 400, 'debris': 6, 'ai_interval': 1, 'tracers': 4096, 'overlays': True},
+    {'stars': 250, 'debris': 4, 'ai_interval': 2, 'tracers': 2048, 'overlays': True},
+    {'stars': 120, 'debris': 2, 'ai_interval': 3, 'tracers': 1024, 'overlays': False},
+    {'stars': 40,  'debris': 1, 'ai_interval': 4, 'tracers': 512,  'overlays': False},
+]
+
+
+class QualityGovernor:
+    """Scales cost knobs up and down to hold a target frame time.
+
+    Frame time is smoothed with an EMA. Quality drops one level after the
+    average has been over budget for `down_after` seconds, and rises one level
+    after it has sat below `headroom` × budget for `up_after` seconds. The
+    asymmetric delays keep it from oscillating between two levels.
+    """
+    def __init__(self, gm, target_fps=60, down_after=1.0, up_after=4.0, headroom=0.75, smoothing=0.1):
+        self.gm = gm
+        self.enabled = True
+        self.budget = 1.0 / target_fps
+        self.down_after = down_after
+        self.up_after = up_after
+        self.headroom = headroom
+        self.smoothing = smoothing
+        self.level = 0
+        self.avg_frame_time = self.budget
+        self._over = 0.0
+        self._under = 0.0
+        self.apply()
+
+    def update(self, frame_dt):
+        if not self.enabled or frame_dt <= 0:
+            return
+        self.avg_frame_time += (frame_dt - self.avg_frame_time) * self.smoothing
+
+        if self.avg_frame_time > self.budget:
+            self._over += frame_dt
+            self._under = 0.0
+            if self._over > self.down_after and self.level < len(QUALITY_LEVELS) - 1:
+                self.set_level(self.level + 1)
+        elif self.avg_frame_time < self.budget * self.headroom:
+            self._under += frame_dt
+            self._over = 0.0
+            if self._under > self.up_after and self.level > 0:
+                self.set_level(self.level - 1)
+        else:
+            self._over = 0.0
+            self._under = 0.0
+
+    def set_level(self, level):
+        self.level = max(0, min(level, len(QUALITY_LEVELS) - 1))
+        self._over = 0.0
+        self._under = 0.0
+        self.apply()
+
+    def apply(self):
+        q = QUALITY_LEVELS[self.level]
+        self.gm.starfield.set_active_count(q['stars'])
+        self.gm.ai_interval = q['ai_interval']
+        combat.explosion_debris = q['debris']
+        self.gm.tracers.set_cap(q['tracers'])
+        fps_counter = getattr(window, 'fps_counter', None)   # absent when headless
+        if fps_counter:
+            fps_counter.enabled = q['overlays']
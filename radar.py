@@ -0,0 +1,69 @@
+from ursina import Entity, Mesh, Vec3, camera, color
+
+
+class Radar:
+    """Top-down contact scope in the corner of the screen.
+
+    Every contact within `range` of the player ship is one vertex of a single
+    point mesh parented to camera.ui, so the cost is one node however many
+    ships are shown. Contacts come from the collision broadphase's spatial
+    query rather than a scan of every ship, and the mesh is rebuilt every
+    `interval` seconds of real time rather than every frame.
+    """
+    FRIENDLY = color.rgba(80, 255, 120, 255)
+    ENEMY = color.rgba(255, 70, 50, 255)
+    TARGET = color.rgba(255, 230, 60, 255)
+
+    def __init__(self, range=1500.0, interval=0.1, size=0.16, position=(0.68, -0.3), point_size=4):
+        self.range = range
+        self.interval = interval
+        self._timer = interval          # draw on the first update
+        self.root = Entity(
+            parent=camera.ui,
+            model='circle',
+            color=color.rgba(0, 40, 30, 140),
+            scale=size * 2,
+            position=Vec3(position[0], position[1], 0),
+        )
+        # Own heading marker at the centre
+        Entity(parent=self.root, model='quad', color=color.rgba(255, 255, 255, 180), scale=0.03, z=-0.01)
+        self.mesh = Mesh(vertices=[Vec3(0, 0, 0)], mode='point', thickness=point_size, render_points_in_3d=False)
+        self.contacts = Entity(parent=self.root, model=self.mesh, z=-0.02, enabled=False)
+        self.shown = 0
+
+    def update(self, dt, ship, query):
+        """`query(center, radius)` returns the ships near a point."""
+        self._timer += dt
+        if self._timer < self.interval:
+            return
+        self._timer = 0.0
+        if ship is None or not ship.alive:
+            self.contacts.enabled = False
+            self.shown = 0
+            return
+
+        center = ship.position
+        right, forward = ship.right.normalized(), ship.forward.normalized()
+        # Circle model has radius 0.5 in root space
+        k = 0.5 / self.range
+        verts, colors = [], []
+        for other in query(center, self.range):
+            if other is ship:
+                continue
+            d = other.position - center
+            verts.append(Vec3(d.dot(right) * k, d.dot(forward) * k, 0))
+            if other is ship.target:
+                colors.append(self.TARGET)
+            elif other.faction == ship.faction:
+                colors.append(self.FRIENDLY)
+            else:
+                colors.append(self.ENEMY)
+
+        self.shown = len(verts)
+        if not verts:
+            self.contacts.enabled = False
+            return
+        self.contacts.enabled = True
+        self.mesh.vertices = verts
+        self.mesh.colors = colors
+        self.mesh.generate()
@@ -0,0 +1,162 @@
+from ursina import Entity, Mesh, Vec3, camera, color, window
+from visual_sync import visual_sync
+import math
+
+
+# Detail levels, cheapest last
+LOD_FULL = 0        # scene node plus engine glow
+LOD_SIMPLE = 1      # scene node only; glow hidden and not updated
+LOD_POINT = 2       # one dot in the shared point mesh
+LOD_HIDDEN = 3      # too far, or outside the view frustum
+
+
+class _ShipNode:
+    """One pooled scene node (hull + engine glow) that can show any ship."""
+    def __init__(self):
+        self.hull = Entity(model='cube', enabled=False)
+        self.glow = Entity(parent=self.hull, model='cube', color=color.rgba(80, 150, 255, 180))
+        self.glow.visible = False
+
+    def bind(self, ship):
+        scale = ship.scale
+        self.hull.scale = scale
+        self.glow.scale = Vec3(0.3, 0.3, 0.1) / scale
+        self.glow.position = Vec3(0, 0, -0.55) / scale
+        visual_sync.forget(self.hull)
+        visual_sync.forget(self.glow)
+        self.hull.enabled = True
+
+    def sync(self, ship, show_glow):
+        self.hull.position = ship.position
+        self.hull.rotation = ship.rotation
+        visual_sync.set_color(self.hull, ship.color)
+        glow = ship.glow if show_glow else None
+        visual_sync.set_visible(self.glow, glow is not None)
+        if glow is not None:
+            visual_sync.set_rgba(self.glow, *glow)
+
+    def release(self):
+        self.hull.enabled = False
+
+
+class RenderLOD:
+    """Distance LOD, view-cone culling and scene-node virtualization for ships.
+
+    Ships are records without scene nodes. Once per rendered frame each live
+    ship gets a level from its distance divided by its size, and ships outside
+    a conservative cone around the camera's view are hidden. At most
+    `node_budget` ships that want a node get one of the pooled nodes, picked
+    by relevance: the camera's target, player-flown ships, the player's target,
+    then nearest first. The rest drop to dots in one shared point mesh.
+
+    A ship keeps its node while it stays in the chosen set, so nodes are only
+    rebound when relevance actually changes. Nodes are built the first time
+    they are needed, never more than `node_budget` of them. Every level above LOD_FULL also
+    stops the physics step from computing the engine glow
+    (see physics._update_glow).
+    """
+    def __init__(self, node_budget=64, full=150.0, simple=400.0, point=1500.0, margin=1.15, point_size=3):
+        self.node_budget = node_budget
+        self.full = full            # distance / size thresholds
+        self.simple = simple
+        self.point = point
+        self.margin = margin        # widen the view cone so edge ships do not pop
+        self.mesh = Mesh(vertices=[Vec3(0, 0, 0)], mode='point', thickness=point_size, render_points_in_3d=False)
+        self.points = Entity(name='ship_points', model=self.mesh, enabled=False)
+        self._free = []             # released nodes, reused before building new ones
+        self._bound = {}            # ship_id -> (ship, _ShipNode)
+        self.counts = [0, 0, 0, 0]
+        self.rebinds = 0
+
+    def _cone_cos(self):
+        # Treat camera.fov as the vertical angle; if it is really horizontal
+        # the cone only gets wider, which errs on the side of drawing
+        half = math.radians(camera.fov) / 2
+        aspect = window.aspect_ratio or 1.0
+        diag = math.atan(math.tan(half) * math.sqrt(1 + aspect * aspect))
+        return math.cos(min(diag * self.margin, math.pi))
+
+    def level_for(self, dist, offset, size, cam_fwd, cone_cos):
+        if dist > size:
+            # Allow for the ship's own radius at the edge of the cone
+            if offset.dot(cam_fwd) / dist < cone_cos - size / dist:
+                return LOD_HIDDEN
+        d = dist / max(size, 0.001)
+        if d < self.full:
+            return LOD_FULL
+        if d < self.simple:
+            return LOD_SIMPLE
+        if d < self.point:
+            return LOD_POINT
+        return LOD_HIDDEN
+
+    def update(self, ships, focus=None):
+        cam_pos = camera.world_position
+        cam_fwd = camera.forward
+        cone_cos = self._cone_cos()
+        player_target = focus.target if focus is not None else None
+
+        # --- Pick a level per ship; collect those that want a node ---
+        wants_node = []     # (priority, distance, ship, level)
+        levels = {}
+        for ship in ships:
+            if not ship.alive or not ship.visible:
+                continue
+            offset = ship.position - cam_pos
+            dist = offset.length()
+            if ship is focus:
+                level, priority = LOD_FULL, 0
+            else:
+                size = max(ship.scale_x, ship.scale_y, ship.scale_z)
+                level = self.level_for(dist, offset, size, cam_fwd, cone_cos)
+                priority = 1 if ship.is_player_controlled else 2 if ship is player_target else 3
+            if level <= LOD_SIMPLE:
+                wants_node.append((priority, dist, ship, level))
+            else:
+                levels[ship.ship_id] = (ship, level)
+
+        # --- Hand out the node budget by relevance; the rest become dots ---
+        wants_node.sort(key=lambda w: (w[0], w[1]))
+        chosen = {}
+        for i, (_, _, ship, level) in enumerate(wants_node):
+            if i < self.node_budget:
+                chosen[ship.ship_id] = ship
+                levels[ship.ship_id] = (ship, level)
+            else:
+                levels[ship.ship_id] = (ship, LOD_POINT)
+
+        for ship_id in [sid for sid in self._bound if sid not in chosen]:
+            _, node = self._bound.pop(ship_id)
+            node.release()
+            self._free.append(node)
+        for ship_id, ship in chosen.items():
+            if ship_id not in self._bound:
+                node = self._free.pop() if self._free else _ShipNode()
+                node.bind(ship)
+                self._bound[ship_id] = (ship, node)
+                self.rebinds += 1
+
+        # --- Push state to nodes and the point mesh ---
+        counts = [0, 0, 0, 0]
+        verts, colors = [], []
+        for ship, level in levels.values():
+            counts[level] += 1
+            ship.lod = level
+            if level == LOD_POINT:
+                verts.append(ship.position)
+                colors.append(ship.color)
+        for ship, node in self._bound.values():
+            node.sync(ship, ship.lod == LOD_FULL)
+        self.counts = counts
+
+        if not verts:
+            self.points.enabled = False
+            return
+        self.points.enabled = True
+        self.mesh.vertices = verts
+        self.mesh.colors = colors
+        self.mesh.generate()
+
+    @property
+    def bound_count(self):
+        return len(self._bound)
@@ -0,0 +1,195 @@
+from collections import deque
+from typing import NamedTuple, Optional
+from ursina import Vec3, application
+from panda3d.core import Quat, LVecBase3f
+from autopilot import AutopilotMode
+from ship_defs import SHIP_DEFS
+import itertools
+import json
+import math
+import os
+import time
+
+
+SCENARIO_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'scenarios')
+DEFAULT_SCENARIO = os.path.join(SCENARIO_DIR, 'default.json')
+
+
+class SpawnOrder(NamedTuple):
+    ship_def: object
+    position: Vec3
+    autopilot: Optional[AutopilotMode]
+    player: bool
+    target: str                  # 'nearest' or 'player'
+    squadron: Optional[str] = None   # squadron key; the first order with a key leads
+    rotation: Optional[Vec3] = None  # initial ship rotation (degrees), None faces +z
+
+
+def load_scenario(path):
+    """Read a scenario file: {'name', 'groups': [...], 'waves': [{'time', 'groups'}]}.
+
+    A group may give a 'rotation' [x, y, z] in degrees (Entity.rotation
+    convention); its ships and formation turn with it, so [0, 180, 0] faces -z.
+    """
+    with open(path) as f:
+        data = json.load(f)
+    data.setdefault('groups', [])
+    data.setdefault('waves', [])
+    return data
+
+
+def formation_offsets(formation, count, spacing):
+    """Offsets for `count` ships around a group centre, facing +z."""
+    if formation == 'line':
+        return [Vec3((i - (count - 1) / 2) * spacing, 0, 0) for i in range(count)]
+    if formation == 'wedge':
+        offsets = []
+        for i in range(count):
+            row = (i + 1) // 2
+            side = 1 if i % 2 else -1
+            offsets.append(Vec3(side * row * spacing, 0, -row * spacing))
+        return offsets
+    if formation == 'grid':
+        cols = max(1, math.ceil(math.sqrt(count)))
+        return [
+            Vec3((i % cols - (cols - 1) / 2) * spacing, (i // cols - (cols - 1) / 2) * spacing, 0)
+            for i in range(count)
+        ]
+    if formation == 'sphere':
+        # Fibonacci sphere, radius grown so neighbours stay about `spacing` apart
+        radius = spacing * max(1.0, math.sqrt(count / (4 * math.pi)) * 1.9)
+        golden = math.pi * (3 - math.sqrt(5))
+        offsets = []
+        for i in range(count):
+            y = 1 - 2 * (i + 0.5) / count
+            r = math.sqrt(1 - y * y)
+            theta = golden * i
+            offsets.append(Vec3(math.cos(theta) * r, y, math.sin(theta) * r) * radius)
+        return offsets
+    raise ValueError(f'unknown formation: {formation}')
+
+
+def rotate_offset(offset, rotation):
+    """`offset` turned by an Entity-style rotation (same hpr mapping as Ship axes)."""
+    q = Quat()
+    q.setHpr(LVecBase3f(-rotation[1], -rotation[0], rotation[2]))
+    return Vec3(*q.xform(LVecBase3f(*offset)))
+
+
+_squadron_ids = itertools.count()
+
+
+def expand_group(group):
+    """Turn one scenario group entry into individual spawn orders.
+
+    With 'squadron_size' the group is cut into squadrons of that many ships,
+    in formation order; each squadron keeps its formation as slot offsets.
+    """
+    ship_def = SHIP_DEFS[group['ship']]
+    mode = group.get('autopilot')
+    autopilot = AutopilotMode(mode) if mode else None
+    player = group.get('player', False)
+    target = group.get('target', 'nearest')
+    rotation = Vec3(*group['rotation']) if 'rotation' in group else None
+
+    if 'positions' in group:
+        positions = [Vec3(*p) for p in group['positions']]
+    elif 'formation' in group:
+        center = Vec3(*group.get('center', (0, 0, 0)))
+        offsets = formation_offsets(group['formation'], group.get('count', 1), group.get('spacing', 10))
+        if rotation is not None:
+            offsets = [rotate_offset(o, rotation) for o in offsets]
+        positions = [center + o for o in offsets]
+    else:
+        positions = [Vec3(*group.get('position', (0, 0, 0)))] * group.get('count', 1)
+
+    size = group.get('squadron_size', 0)
+    if size < 2 or player:
+        return [SpawnOrder(ship_def, pos, autopilot, player, target, rotation=rotation) for pos in positions]
+    tag = next(_squadron_ids)
+    return [
+        SpawnOrder(ship_def, pos, autopilot, player, target, squadron=f'sq{tag}.{i // size}', rotation=rotation)
+        for i, pos in enumerate(positions)
+    ]
+
+
+class Spawner:
+    """Creates ships from scenario groups without stalling a frame.
+
+    Orders are queued and `update` builds ships until this frame's time
+    budget is used up (always at least one). The budget is whatever the last
+    tick left of `frame_ms`, measured with perf_counter, capped at
+    `budget_ms` and floored at `min_budget_ms`. Ships spawned on earlier
+    frames are therefore paid for too: their broadphase, fire-control and
+    ECS work shows up in the tick time and shrinks the next budget. Headless
+    runs have no frames to protect and drain the whole queue at once.
+    Reinforcement waves are queued through the same path when the sim clock
+    reaches their time.
+    """
+    def __init__(self, gm, budget_ms=2.0, frame_ms=1000 / 60, min_budget_ms=0.25, headless=None):
+        self.gm = gm
+        self.budget = budget_ms / 1000.0
+        self.frame_budget = frame_ms / 1000.0
+        self.min_budget = min_budget_ms / 1000.0
+        self.headless = application.window_type == 'none' if headless is None else headless
+        self.queue = deque()
+        self.waves = []          # [(time, groups)] sorted by time
+        self.spawned = 0
+
+    def load(self, path):
+        """Queue a scenario's initial groups and schedule its waves."""
+        data = load_scenario(path)
+        self.enqueue(data['groups'])
+        for wave in data['waves']:
+            self.schedule_wave(wave['time'], wave['groups'])
+        return data
+
+    def enqueue(self, groups):
+        for group in groups:
+            self.queue.extend(expand_group(group))
+
+    def schedule_wave(self, at_time, groups):
+        self.waves.append((at_time, groups))
+        self.waves.sort(key=lambda w: w[0])
+
+    def spawn_all(self):
+        while self.queue:
+            self._spawn(self.queue.popleft())
+
+    def update(self):
+        while self.waves and self.waves[0][0] <= self.gm.sim_time:
+            _, groups = self.waves.pop(0)
+            self.enqueue(groups)
+
+        if not self.queue:
+            return
+        if self.headless:
+            self.spawn_all()
+            return
+        deadline = time.perf_counter() + self.frame_budget_left()
+        self._spawn(self.queue.popleft())
+        while self.queue and time.perf_counter() < deadline:
+            self._spawn(self.queue.popleft())
+
+    def frame_budget_left(self):
+        """Seconds this frame may spend spawning, from the last measured tick."""
+        slack = self.frame_budget - self.gm.tick_seconds
+        return max(self.min_budget, min(self.budget, slack))
+
+    def _spawn(self, order):
+        gm = self.gm
+        ship = gm.create_ship(order.ship_def, position=order.position)
+        if order.rotation is not None:
+            ship.rotation = order.rotation
+        ship.autopilot_mode = order.autopilot
+        if order.player:
+            ship.is_player_controlled = True
+            gm.player_ship = ship
+            gm.chase_cam.set_target(ship, instant=True)
+        if order.target == 'player' and gm.player_ship is not None and gm.player_ship.faction != ship.faction:
+            ship.target = gm.player_ship
+        if order.squadron is not None:
+            gm.squadrons.enlist(order.squadron, ship, order.position)
+        # 'nearest' is filled in by GameManager._reassign_dead_targets next tick
+        self.spawned += 1
+        return ship
@@ -0,0 +1,37 @@
+from panda3d.core import Filename
+from ursina import application
+import os
+
+
+# Bump when baked geometry changes shape so stale files are ignored
+CACHE_VERSION = 1
+CACHE_DIR = os.environ.get(
+    'HOMAGE_CACHE_DIR',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), '.cache'),
+)
+
+hits = 0
+misses = 0
+
+
+def load_or_bake(name, build):
+    """Return the cached node for `name`, or build it, save it as .bam and return it.
+
+    `build` must return a NodePath (an ursina Mesh is one). Panda3D's native
+    .bam format loads without any Python-side mesh generation.
+    """
+    global hits, misses
+    path = os.path.join(CACHE_DIR, f'{name}.v{CACHE_VERSION}.bam')
+    if os.path.exists(path):
+        node = application.base.loader.loadModel(Filename.fromOsSpecific(path), noCache=True, okMissing=True)
+        if node is not None and not node.isEmpty():
+            hits += 1
+            return node
+    misses += 1
+    node = build()
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        node.writeBamFile(Filename.fromOsSpecific(path))
+    except OSError:
+        pass  # read-only install: run uncached
+    return node
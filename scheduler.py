@@ -0,0 +1,156 @@
+from ursina import destroy, curve, lerp
+import heapq
+import itertools
+import simclock
+
+
+class _Tween:
+    __slots__ = ('obj', 'attr', 'start', 'end', 't0', 'duration', 'curve_fn')
+
+    def __init__(self, obj, attr, start, end, t0, duration, curve_fn):
+        self.obj = obj
+        self.attr = attr
+        self.start = start
+        self.end = end
+        self.t0 = t0
+        self.duration = duration
+        self.curve_fn = curve_fn
+
+
+class Scheduler:
+    """Central timed-effects queue driven by the simulation clock.
+
+    Time is read from a SimClock (the one GameManager advances each tick),
+    so effects run on the same clock as the rest of the simulation. Delayed
+    calls live in a single heap; tweens live in per-object dicts keyed by
+    attribute, so a new tween on the same property replaces the old one and
+    destroying an object drops its tweens without scanning the others.
+    `update` runs everything that is due in one pass per frame, instead of
+    one Ursina sequence per effect.
+    """
+    def __init__(self, clock=simclock.clock):
+        self.clock = clock
+        self._heap = []                 # [due, seq, key, fn, args, cancelled, deferred_to]
+        self._keyed = {}                # coalescing key -> live heap entry
+        self._tweens = {}               # id(obj) -> {attr: _Tween}
+        self._seq = itertools.count()
+        self._cancelled = 0             # cancelled entries still in the heap
+        self.coalesced = 0
+
+    @property
+    def now(self):
+        return self.clock.time
+
+    # === Delayed actions ===
+
+    def call_later(self, delay, fn, *args, key=None):
+        """Run fn(*args) after `delay` sim seconds.
+
+        With a `key`, a call that is already pending under that key absorbs this
+        one: it keeps its original fn/args and is pushed out to the new due time.
+        The pending entry is deferred in place (re-queued when it comes up), so
+        repeated coalescing leaves no stale entries in the heap.
+        """
+        due = self.now + delay
+        if key is not None:
+            pending = self._keyed.get(key)
+            if pending is not None:
+                self.coalesced += 1
+                if due >= pending[0]:
+                    pending[6] = max(pending[6], due)
+                    return pending
+                self._drop(pending)
+                fn, args = pending[3], pending[4]
+        entry = [due, next(self._seq), key, fn, args, False, due]
+        heapq.heappush(self._heap, entry)
+        if key is not None:
+            self._keyed[key] = entry
+        return entry
+
+    def is_pending(self, key):
+        return key in self._keyed
+
+    def cancel(self, key):
+        entry = self._keyed.pop(key, None)
+        if entry is not None:
+            self._drop(entry)
+
+    def _drop(self, entry):
+        """Cancel a heap entry; compact the heap once cancelled ones dominate it."""
+        entry[5] = True
+        self._cancelled += 1
+        if self._cancelled > 64 and self._cancelled * 2 > len(self._heap):
+            self._heap[:] = [e for e in self._heap if not e[5]]
+            heapq.heapify(self._heap)
+            self._cancelled = 0
+
+    def destroy_later(self, entity, delay):
+        """Destroy an entity after `delay`, dropping any tweens still running on it."""
+        self.call_later(delay, self._destroy, entity, key=('destroy', id(entity)))
+
+    def _destroy(self, entity):
+        self._tweens.pop(id(entity), None)
+        destroy(entity)
+
+    # === Tweens ===
+
+    def tween(self, obj, attr, end, duration, curve_fn=curve.linear, start=None):
+        """Interpolate obj.attr to `end` over `duration` sim seconds."""
+        if start is None:
+            start = getattr(obj, attr)
+        if isinstance(curve_fn, str):
+            curve_fn = getattr(curve, curve_fn)
+        tweens = self._tweens.get(id(obj))
+        if tweens is None:
+            tweens = self._tweens[id(obj)] = {}
+        tweens[attr] = _Tween(obj, attr, start, end, self.now, max(duration, 1e-6), curve_fn)
+
+    # === Per-frame pass ===
+
+    def update(self):
+        """Run the calls and tween steps due at the clock's current time."""
+        now = self.now
+
+        heap = self._heap
+        while heap and heap[0][0] <= now:
+            entry = heapq.heappop(heap)
+            due, seq, key, fn, args, cancelled, deferred_to = entry
+            if cancelled:
+                self._cancelled -= 1
+                continue
+            if deferred_to > due:
+                entry[0] = deferred_to      # coalesced later: back in at the new time
+                heapq.heappush(heap, entry)
+                continue
+            if key is not None:
+                self._keyed.pop(key, None)
+            fn(*args)
+
+        if self._tweens:
+            finished = []
+            for oid, tweens in self._tweens.items():
+                for attr, tw in tweens.items():
+                    t = (now - tw.t0) / tw.duration
+                    if t >= 1.0:
+                        t = 1.0
+                        finished.append((oid, attr))
+                    setattr(tw.obj, tw.attr, lerp(tw.start, tw.end, tw.curve_fn(t)))
+            for oid, attr in finished:
+                tweens = self._tweens[oid]
+                del tweens[attr]
+                if not tweens:
+                    del self._tweens[oid]
+
+    def clear(self):
+        """Drop every pending call and tween without running them."""
+        self._heap.clear()
+        self._cancelled = 0
+        self._keyed.clear()
+        self._tweens.clear()
+
+    def pending_count(self):
+        live = len(self._heap) - self._cancelled
+        return live + sum(len(tweens) for tweens in self._tweens.values())
+
+
+scheduler = Scheduler()
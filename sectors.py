@@ -0,0 +1,160 @@
+from ursina import Vec3
+from autopilot import AutopilotMode
+from ship_defs import SHIP_DEFS
+import json
+import math
+import os
+import tempfile
+
+
+class SectorGrid:
+    """Partitions the world into cubic sectors and pages far-away ones to disk.
+
+    Only sectors within `active_radius` sectors of an anchor ship (the player)
+    stay live. Ships in any other sector are written to a small per-sector file
+    and destroyed; the file is read back and the ships rebuilt when an anchor
+    comes within range of that sector again. Without a `storage_dir` the files
+    go to a temporary directory that is removed by close(), or when the grid
+    is garbage collected or the interpreter exits.
+    """
+    def __init__(self, sector_size=1000.0, active_radius=1, check_interval=1.0, storage_dir=None):
+        self.sector_size = sector_size
+        self.active_radius = active_radius
+        self.check_interval = check_interval
+        self._storage_dir = storage_dir    # created on first use
+        self._tempdir = None               # TemporaryDirectory backing the default storage_dir
+        self.dormant = set()      # sector keys with ships stored on disk
+        self._timer = 0.0
+
+    @property
+    def storage_dir(self):
+        if self._storage_dir is None:
+            self._tempdir = tempfile.TemporaryDirectory(prefix='homage_sectors_')
+            self._storage_dir = self._tempdir.name
+        return self._storage_dir
+
+    def close(self):
+        """Drop all dormant sectors and remove the temporary storage, if any."""
+        self.dormant.clear()
+        if self._tempdir is not None:
+            self._tempdir.cleanup()
+            self._tempdir = None
+            self._storage_dir = None
+
+    def sector_of(self, position):
+        s = self.sector_size
+        return (
+            math.floor(position.x / s),
+            math.floor(position.y / s),
+            math.floor(position.z / s),
+        )
+
+    def active_sectors(self, anchors):
+        r = self.active_radius
+        keys = set()
+        for anchor in anchors:
+            cx, cy, cz = self.sector_of(anchor.position)
+            for dx in range(-r, r + 1):
+                for dy in range(-r, r + 1):
+                    for dz in range(-r, r + 1):
+                        keys.add((cx + dx, cy + dy, cz + dz))
+        return keys
+
+    def update(self, gm, dt):
+        """Put ships in inactive sectors to sleep and wake dormant sectors in range."""
+        self._timer += dt
+        if self._timer < self.check_interval:
+            return
+        self._timer = 0.0
+
+        anchors = [s for s in (gm.player_ship, gm.chase_cam.target_ship) if s is not None]
+        if not anchors:
+            return
+        active = self.active_sectors(anchors)
+
+        # --- Sleep: live ships that drifted out of the active area ---
+        sleeping = {}
+        for ship in gm.all_ships:
+            if ship in anchors:
+                continue
+            key = self.sector_of(ship.position)
+            if key not in active:
+                sleeping.setdefault(key, []).append(ship)
+        # Pack every sector before retiring any, so squadrons are recorded as they were
+        for key, ships in sleeping.items():
+            self._store(key, ships, gm.squadrons)
+        for ships in sleeping.values():
+            gm.retire_ships(ships)
+
+        # --- Wake: dormant sectors that are now in range ---
+        records = [record for key in list(self.dormant & active) for record in self._load(key)]
+        if records:
+            self._rebuild_all(gm, records)
+
+    def _path(self, key):
+        return os.path.join(self.storage_dir, 'sector_%d_%d_%d.jsonl' % key)
+
+    def _store(self, key, ships, squadrons):
+        # Wrecks are not worth keeping around; only live ships are paged out
+        with open(self._path(key), 'a') as f:
+            for ship in ships:
+                if ship.alive:
+                    f.write(json.dumps(_pack(ship, squadrons), separators=(',', ':')) + '\n')
+        self.dormant.add(key)
+
+    def _load(self, key):
+        path = self._path(key)
+        self.dormant.discard(key)
+        if not os.path.exists(path):
+            return []
+        with open(path) as f:
+            records = [json.loads(line) for line in f if line.strip()]
+        os.remove(path)
+        return records
+
+    def _rebuild_all(self, gm, records):
+        """Rebuild ships, then relink targets once everyone that woke exists."""
+        records.sort(key=lambda record: record[0] != record[17])  # squadron leaders first
+        targets = [(self._rebuild(gm, record), record[14]) for record in records]
+        by_id = {s.ship_id: s for s in gm.all_ships}
+        for ship, target_id in targets:
+            target = by_id.get(target_id)
+            if target is not None and target.alive:
+                ship.target = target   # otherwise targeting picks a new one
+
+    def _rebuild(self, gm, record):
+        (ship_id, def_name, px, py, pz, rx, ry, rz,
+         vx, vy, vz, hp, shield, mode, _target_id, player,
+         squad_key, leader_id, ox, oy, oz) = record
+        ship = gm.create_ship(SHIP_DEFS[def_name], position=Vec3(px, py, pz), ship_id=ship_id)
+        ship.rotation = Vec3(rx, ry, rz)
+        ship.velocity = Vec3(vx, vy, vz)
+        ship.hp = hp
+        ship.shield = shield
+        ship.autopilot_mode = AutopilotMode(mode) if mode else None
+        ship.is_player_controlled = bool(player)
+        if squad_key is not None:
+            gm.squadrons.rejoin(squad_key, ship, leader_id, (ox, oy, oz))
+        return ship
+
+
+def _pack(ship, squadrons):
+    """Flat record — one JSON array per ship keeps the sector files small."""
+    p, r, v = ship.position, ship.rotation, ship.velocity
+    mode = ship.autopilot_mode.value if ship.autopilot_mode is not None else None
+    target = ship.target.ship_id if ship.target is not None and ship.target.alive else None
+    squad = squadrons.squadron_of(ship)
+    if squad is None:
+        squad_key = leader_id = None
+        slot = Vec3(0, 0, 0)
+    else:
+        squad_key, leader_id = squad.key, squad.leader.ship_id
+        slot = squad.slots.get(ship.ship_id, Vec3(0, 0, 0))
+    return [
+        ship.ship_id, ship.ship_def.name,
+        round(p.x, 3), round(p.y, 3), round(p.z, 3),
+        round(r.x, 3), round(r.y, 3), round(r.z, 3),
+        round(v.x, 3), round(v.y, 3), round(v.z, 3),
+        ship.hp, ship.shield, mode, target, int(ship.is_player_controlled),
+        squad_key, leader_id, round(slot.x, 3), round(slot.y, 3), round(slot.z, 3),
+    ]
@@ -1,5 +1,20 @@
-from ursina import Entity, Vec3, color, Mesh
+from ursina import Vec3, color, Mesh
+from panda3d.core import Quat, LVecBase3f
 from ship_defs import ShipDef
+import ecs
+from components import (
+    Transform, Velocity, Propulsion, Health, Armament, Autopilot, Targeting,
+)
+import itertools
+
+
+_next_ship_id = itertools.count(1)
+
+
+def reset_ids(start=1):
+    """Restart ship_id numbering, so repeated runs in one process match up."""
+    global _next_ship_id
+    _next_ship_id = itertools.count(start)
 
 
 def _make_ship_mesh():
@@ -33,60 +48,215 @@ def _get_ship_mesh():
     return _ship_mesh
 
 
-class Ship(Entity):
-    def __init__(self, ship_def: ShipDef, position=Vec3(0, 0, 0), **kwargs):
-        c = ship_def.color_value
-        super().__init__(
-            model='cube',
-            color=color.rgba(*c) if isinstance(c, tuple) else c,
-            scale=ship_def.model_scale,
-            position=position,
-            **kwargs,
-        )
+class _Field:
+    """Ship attribute stored on one of its ECS components.
+
+    Reads of a missing component return `default`. Writes to a missing
+    component add it (built by `factory`) unless there is no factory, in
+    which case the write is dropped.
+    """
+    def __init__(self, component, attr, default=None, factory=None):
+        self.component = component
+        self.attr = attr
+        self.default = default
+        self.factory = factory
+
+    def __get__(self, ship, owner=None):
+        if ship is None:
+            return self
+        comp = ship._c.get(self.component)
+        return getattr(comp, self.attr) if comp is not None else self.default
+
+    def __set__(self, ship, value):
+        comp = ship._c.get(self.component)
+        if comp is None:
+            if self.factory is None:
+                return
+            comp = self.factory()
+            ship._world.add_component(ship.eid, self.component, comp)
+        setattr(comp, self.attr, value)
+
+
+class Ship:
+    """Thin handle over an ECS entity.
+
+    Ships are plain records: the transform lives in the Transform component
+    and forward/right/up are derived from it, so a ship has no scene node of
+    its own. RenderLOD binds one of a bounded pool of nodes to the ships
+    worth drawing and copies the transform and the visual state below
+    (color, visible, glow) onto it each frame.
+    """
+    # === Physics properties ===
+    mass = _Field('propulsion', 'mass')
+    thrust_force = _Field('propulsion', 'thrust_force')
+    rotation_force = _Field('propulsion', 'rotation_force')
+    max_speed = _Field('propulsion', 'max_speed')
+    drag = _Field('propulsion', 'drag')
 
+    # === Virtual joystick — the core interface ===
+    thrust_input = _Field('propulsion', 'thrust_input')      # local-space: x=strafe, y=vertical, z=forward
+    rotation_input = _Field('propulsion', 'rotation_input')  # x=pitch, y=yaw, z=roll
+    avoid_thrust = _Field('propulsion', 'avoid_thrust')      # collision-avoidance steering, added to thrust_input
+
+    # === Flight state ===
+    velocity = _Field('velocity', 'value')
+
+    # === Combat state ===
+    hp = _Field('health', 'hp')
+    max_hp = _Field('health', 'max_hp')
+    shield = _Field('health', 'shield')
+    max_shield = _Field('health', 'max_shield')
+    alive = _Field('health', 'alive')
+
+    # === Weapons (populated by game_manager) ===
+    weapons = _Field('weapons', 'weapons')
+
+    # === Control state ===
+    target = _Field('target', 'target')                      # Ship reference for combat/autopilot
+    # Attack-run state only exists while an autopilot is engaged
+    _attack_run_phase = _Field('autopilot', 'attack_run_phase')
+    _attack_run_timer = _Field('autopilot', 'attack_run_timer', default=0.0)
+    _attack_run_break_dir = _Field('autopilot', 'attack_run_break_dir')
+
+    def __init__(self, ship_def: ShipDef, position=Vec3(0, 0, 0), ship_id=None, world=None):
         # === Definition ===
         self.ship_def = ship_def
+        self._world = world if world is not None else ecs.world   # component storage
         self.ship_name = ship_def.name
         self.faction = ship_def.faction
+        self.generation = 0           # bumped each time the pool hands this handle out again
+        self._spawn(position, weapons=[], ship_id=ship_id)
 
-        # === Physics properties ===
-        self.mass = ship_def.mass
-        self.thrust_force = ship_def.thrust_force
-        self.rotation_force = ship_def.rotation_force
-        self.max_speed = ship_def.max_speed
-        self.drag = ship_def.drag
+    def _spawn(self, position, weapons, ship_id=None):
+        """Fresh id (unless restoring one), components and visual state; shared by __init__ and reset."""
+        ship_def = self.ship_def
+        # stable identity across save/load
+        self.ship_id = ship_id if ship_id is not None else next(_next_ship_id)
 
-        # === Virtual joystick — the core interface ===
-        self.thrust_input = Vec3(0, 0, 0)    # local-space: x=strafe, y=vertical, z=forward
-        self.rotation_input = Vec3(0, 0, 0)  # x=pitch, y=yaw, z=roll
+        # === Simulation state (ECS components) ===
+        self.eid = self._world.create(
+            transform=Transform(self, Vec3(position), Vec3(0, 0, 0), Vec3(ship_def.model_scale)),
+            velocity=Velocity(),
+            propulsion=Propulsion(
+                mass=ship_def.mass,
+                thrust_force=ship_def.thrust_force,
+                rotation_force=ship_def.rotation_force,
+                max_speed=ship_def.max_speed,
+                drag=ship_def.drag,
+            ),
+            health=Health(
+                hp=ship_def.hp, max_hp=ship_def.hp,
+                shield=ship_def.shield, max_shield=ship_def.shield,
+            ),
+            weapons=Armament(weapons),
+            target=Targeting(),
+        )
+        self._c = self._world.components(self.eid)
+        self._tr = self._c['transform']
+        self._basis = None            # (forward, right, up), rebuilt after rotating
 
-        # === Flight state ===
-        self.velocity = Vec3(0, 0, 0)
+        # === Control state ===
+        self.is_player_controlled = False
+        self.lod = 0                  # render detail level, set by RenderLOD
 
-        # === Combat state ===
-        self.hp = ship_def.hp
-        self.max_hp = ship_def.hp
-        self.shield = ship_def.shield
-        self.max_shield = ship_def.shield
-        self.alive = True
+        # === Visual state (copied onto the bound scene node, if any) ===
+        c = ship_def.color_value
+        self.color = color.rgba(*c) if isinstance(c, tuple) else c
+        self.visible = True
+        self.glow = None              # engine glow (r, g, b, a) 0-255, or None when off
 
-        # === Weapons (populated by game_manager) ===
-        self.weapons = []
+    def reset(self, position, ship_id=None):
+        """Bring a disposed ship back as new, keeping its Weapon objects (see ShipPool)."""
+        weapons = self.weapons
+        for w in weapons:
+            w.ready_at = 0.0
+        self.generation += 1
+        self._spawn(position, weapons, ship_id)
 
-        # === Control state ===
-        self.is_player_controlled = False
-        self.autopilot_mode = None           # None or AutopilotMode enum value
-        self.target = None                   # Ship reference for combat/autopilot
-
-        # === Engine glow (visual) ===
-        self.engine_glow = Entity(
-            parent=self,
-            model='cube',
-            color=color.rgba(80, 150, 255, 180),
-            scale=Vec3(0.3, 0.3, 0.1) / ship_def.model_scale,
-            position=Vec3(0, 0, -0.55) / ship_def.model_scale,
-        )
-        self.engine_glow.visible = False
+    # === Transform ===
+    @property
+    def position(self):
+        return Vec3(self._tr.position)
+
+    @position.setter
+    def position(self, value):
+        self._tr.position = Vec3(value)
+
+    @property
+    def rotation(self):
+        return Vec3(self._tr.rotation)
+
+    @rotation.setter
+    def rotation(self, value):
+        self._tr.rotation = Vec3(value)
+        self._basis = None
+
+    def _rotate_axis(self, axis, value):
+        r = self._tr.rotation
+        r[axis] = value
+        self._basis = None
+
+    rotation_x = property(lambda self: self._tr.rotation[0], lambda self, v: self._rotate_axis(0, v))
+    rotation_y = property(lambda self: self._tr.rotation[1], lambda self, v: self._rotate_axis(1, v))
+    rotation_z = property(lambda self: self._tr.rotation[2], lambda self, v: self._rotate_axis(2, v))
+
+    @property
+    def scale(self):
+        return Vec3(self._tr.scale)
+
+    scale_x = property(lambda self: self._tr.scale[0])
+    scale_y = property(lambda self: self._tr.scale[1])
+    scale_z = property(lambda self: self._tr.scale[2])
+
+    def _axes(self):
+        if self._basis is None:
+            # Same mapping Entity.rotation uses: (x, y, z) -> hpr (-y, -x, z)
+            # Like Entity.forward/right/up the axes carry the model scale
+            # (forward is scale_z long); thrust and aiming are tuned to that
+            r = self._tr.rotation
+            sx, sy, sz = self._tr.scale
+            q = Quat()
+            q.setHpr(LVecBase3f(-r[1], -r[0], r[2]))
+            self._basis = tuple(
+                Vec3(*q.xform(LVecBase3f(*axis)))
+                for axis in ((0, 0, sz), (sx, 0, 0), (0, sy, 0))
+            )
+        return self._basis
+
+    @property
+    def forward(self):
+        return Vec3(self._axes()[0])
+
+    @property
+    def back(self):
+        return -self.forward
+
+    @property
+    def right(self):
+        return Vec3(self._axes()[1])
+
+    @property
+    def up(self):
+        return Vec3(self._axes()[2])
+
+    @property
+    def autopilot_mode(self):
+        """None or AutopilotMode. Engaging adds the autopilot component, None removes it."""
+        ap = self._c.get('autopilot')
+        return ap.mode if ap is not None else None
+
+    @autopilot_mode.setter
+    def autopilot_mode(self, mode):
+        if mode is None:
+            self._world.remove_component(self.eid, 'autopilot')
+        elif 'autopilot' in self._c:
+            self._c['autopilot'].mode = mode
+        else:
+            self._world.add_component(self.eid, 'autopilot', Autopilot(mode=mode))
+
+    def dispose(self):
+        """Drop the ship's components; the handle is dead afterwards."""
+        self._world.destroy(self.eid)
 
     @property
     def speed(self):
@@ -69,3 +69,6 @@ ENEMY_FIGHTER_DEF = ShipDef(
     weapons=[{'damage': 8, 'cooldown': 0.2, 'speed': 190, 'range': 280, 'color': (255, 75, 25)}],
     default_autopilot='attack_run',
 )
+
+# Lookup used when ships are rebuilt from saved/serialized state
+SHIP_DEFS = {d.name: d for d in (FIGHTER_DEF, CARRIER_DEF, ENEMY_FIGHTER_DEF)}
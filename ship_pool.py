@@ -0,0 +1,40 @@
+from ship import Ship
+
+
+class ShipPool:
+    """Per-ShipDef free lists of retired ships.
+
+    Retired ships drop their ECS components but keep the Ship handle and its
+    Weapon objects; acquire() resets one in place instead of building new
+    objects. At most `max_free` ships are kept per definition, so a long
+    session of continuous waves holds a bounded number of spare handles.
+    """
+    def __init__(self, max_free=256, world=None):
+        self.max_free = max_free
+        self.world = world          # ECS world new ships are created in (None: ecs.world)
+        self._free = {}         # ShipDef name -> [Ship]
+        self.created = 0
+        self.reused = 0
+
+    def acquire(self, ship_def, position, ship_id=None):
+        """(ship, reused) — a reset pooled ship if one is free, else a new one.
+
+        `ship_id` restores a saved identity instead of drawing a fresh one.
+        """
+        free = self._free.get(ship_def.name)
+        if free:
+            ship = free.pop()
+            ship.reset(position, ship_id)
+            self.reused += 1
+            return ship, True
+        self.created += 1
+        return Ship(ship_def, position=position, ship_id=ship_id, world=self.world), False
+
+    def release(self, ship):
+        ship.dispose()
+        free = self._free.setdefault(ship.ship_def.name, [])
+        if len(free) < self.max_free:
+            free.append(ship)
+
+    def free_count(self):
+        return sum(len(f) for f in self._free.values())
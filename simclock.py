@@ -0,0 +1,22 @@
+import random
+
+
+class SimClock:
+    """Sim time and seeded RNG for everything that has to replay identically.
+
+    GameManager advances `time` every tick; main-thread gameplay code reads
+    it instead of the wall clock and draws randomness from `rng` instead of
+    the global `random` module, so a run is fully determined by its seed.
+    Code that can run on a pool worker (the autopilot) takes the sim time as
+    an argument instead.
+    """
+    def __init__(self, seed=None):
+        self.time = 0.0
+        self.rng = random.Random(seed)
+
+    def reset(self, seed=None):
+        self.time = 0.0
+        self.rng.seed(seed)
+
+
+clock = SimClock()
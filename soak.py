@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""Long-running headless battle for spotting memory and object leaks.
+
+    python soak.py --hours 4 --scenario scenarios/dogfight.json --out soak.jsonl
+
+Fresh waves are fed in on a fixed sim-time interval so the battle never runs
+dry; pick a scenario whose waves the machine can sustain for hours (the
+2500-ship waves in large_battle.json make it a stress test, not a soak).
+Every `--sample` seconds of sim time a row of counters (traced memory, live
+entities, projectiles, ships and wrecks, scheduler calls, Ursina sequences,
+scene-graph nodes, ...) plus the traced memory per source file is appended to
+the output file. At the end every series that only ever grew over the second
+half of the run is reported as a suspected leak; growth while the battle fills
+out in the first half is warm-up.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+
+# Counters that should plateau in a healthy session. Each takes the GameManager.
+def _entities(gm):
+    from ursina import scene
+    return len(scene.entities)
+
+
+def _scene_nodes(gm):
+    from ursina import application
+    return application.base.render.findAllMatches('**').getNumPaths()
+
+
+def _sequences(gm):
+    from ursina import application
+    return len(application.sequences)
+
+
+def _ecs_entities(gm):
+    return gm.world.count()
+
+
+SERIES = {
+    'entities': _entities,
+    'scene_nodes': _scene_nodes,
+    'sequences': _sequences,
+    'ecs_entities': _ecs_entities,
+    'ships': lambda gm: len(gm.all_ships),
+    'wrecks': lambda gm: sum(1 for s in gm.all_ships if not s.alive),
+    'projectiles': lambda gm: len(gm.projectiles),
+    'impact_queue': lambda gm: len(gm.impacts),
+    'scheduler_pending': lambda gm: gm.scheduler.pending_count(),
+}
+
+# Recorded but not judged: paged-out sectors are world state on disk and grow
+# with the area the ships have flown through, not with session length
+INFO = {
+    'dormant_sectors': lambda gm: len(gm.sectors.dormant),
+}
+
+# Skeleton wave used when the scenario has no waves of its own
+DEFAULT_WAVE = [
+    {'ship': 'Enemy Fighter', 'count': 20, 'formation': 'sphere', 'center': [0, 0, 500],
+     'spacing': 14, 'autopilot': 'attack_run'},
+    {'ship': 'Fighter', 'count': 10, 'formation': 'wedge', 'center': [0, 0, -60],
+     'spacing': 12, 'autopilot': 'attack_run'},
+]
+
+
+class SoakMonitor:
+    """Samples the leak counters and tracemalloc totals per source file.
+
+    The monitor's own allocations (its growing list of samples) are filtered
+    out of the traced totals, or every soak would flag itself.
+    """
+    def __init__(self, gm, top_files=15, min_growth=0.05, min_bytes=4096):
+        self.gm = gm
+        self.top_files = top_files
+        self.min_growth = min_growth    # relative growth below this is noise
+        self.min_bytes = min_bytes      # and so is memory growth below this many bytes
+        self.samples = []               # [dict]
+        self.t0 = time.perf_counter()
+        self._exclude = [tracemalloc.Filter(False, __file__), tracemalloc.Filter(False, tracemalloc.__file__)]
+        self._basenames = {}            # path -> basename, so sample keys are shared strings
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    def sample(self):
+        stats = tracemalloc.take_snapshot().filter_traces(self._exclude).statistics('filename')
+        row = {
+            'sim_time': round(self.gm.sim_time, 2),
+            'wall': round(time.perf_counter() - self.t0, 2),
+            'traced_bytes': sum(st.size for st in stats),
+        }
+        for name, fn in {**SERIES, **INFO}.items():
+            row[name] = fn(self.gm)
+        names = self._basenames
+        row['files'] = {}
+        for st in stats[:self.top_files]:
+            path = st.traceback[0].filename
+            name = names.get(path)
+            if name is None:
+                name = names[path] = os.path.basename(path)
+            row['files'][name] = st.size
+        self.samples.append(row)
+        return row
+
+    def growing(self, window=None):
+        """Series that never went down over the last `window` samples and grew.
+
+        `window` defaults to the second half of the run, so counters that ramp
+        up and then plateau pass. Returns [(name, first, last)], per-file
+        memory included as 'mem:<file>'.
+        """
+        rows = self.samples[-(window or max(3, len(self.samples) // 2)):]
+        if len(rows) < 3:
+            return []
+        series = {name: [r[name] for r in rows] for name in ['traced_bytes', *SERIES]}
+        for fname in rows[-1]['files']:
+            # Only the top files are kept per sample; judge each from when it made the list
+            series[f'mem:{fname}'] = [r['files'][fname] for r in rows if fname in r['files']]
+
+        flagged = []
+        for name, values in series.items():
+            if len(values) < 3:
+                continue
+            first, last = values[0], values[-1]
+            if last <= first or last - first < self.min_growth * max(first, 1):
+                continue
+            if (name == 'traced_bytes' or name.startswith('mem:')) and last - first < self.min_bytes:
+                continue
+            if all(b >= a for a, b in zip(values, values[1:])):
+                flagged.append((name, first, last))
+        return flagged
+
+    def report(self, window=None):
+        lines = ['--- soak ---']
+        if self.samples:
+            last = self.samples[-1]
+            lines.append(f'  sim {last["sim_time"]:.0f}s  wall {last["wall"]:.0f}s  samples {len(self.samples)}')
+        flagged = self.growing(window)
+        if not flagged:
+            lines.append('  no monotonic growth')
+        for name, first, last in flagged:
+            lines.append(f'  GROWING {name:<28} {first:>12} -> {last:<12}')
+        return '\n'.join(lines)
+
+
+def run_soak(scenario, hours=1.0, dt=1 / 60, wave_interval=60.0, sample_interval=30.0, out=None, app=None):
+    """Run a headless battle for `hours` of sim time and return the monitor.
+
+    Pass `app` to reuse a running Ursina instance (Panda3D allows only one).
+    """
+    from ursina import Ursina
+    from game_manager import GameManager
+    from scenario import load_scenario
+
+    if app is None:
+        app = Ursina(window_type='none', development_mode=False)
+    gm = GameManager(scenario_path=scenario)
+    wave = [g for w in load_scenario(scenario)['waves'] for g in w['groups']] or DEFAULT_WAVE
+
+    monitor = SoakMonitor(gm)
+    out_file = open(out, 'a') if out else None
+    next_wave = wave_interval
+    next_sample = 0.0
+    end = hours * 3600.0
+    try:
+        while gm.sim_time < end:
+            gm.update(dt)
+            app.step()
+            if gm.sim_time >= next_wave:
+                gm.reinforce(wave)
+                next_wave += wave_interval
+            if gm.sim_time >= next_sample:
+                row = monitor.sample()
+                if out_file:
+                    out_file.write(json.dumps(row) + '\n')
+                    out_file.flush()
+                next_sample += sample_interval
+    finally:
+        if out_file:
+            out_file.close()
+        gm.shutdown()
+    print(monitor.report())
+    return monitor
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--scenario', default=os.path.join('scenarios', 'dogfight.json'))
+    parser.add_argument('--hours', type=float, default=1.0, help='sim time to run')
+    parser.add_argument('--dt', type=float, default=1 / 60)
+    parser.add_argument('--wave-interval', type=float, default=60.0, help='sim seconds between waves')
+    parser.add_argument('--sample', type=float, default=30.0, help='sim seconds between samples')
+    parser.add_argument('--out', default=None, help='append samples as JSON lines here')
+    args = parser.parse_args(argv)
+    run_soak(args.scenario, args.hours, args.dt, args.wave_interval, args.sample, args.out)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,197 @@
+from ursina import Vec3
+from autopilot import run_autopilot, aim_at, clamp
+
+
+class Squadron:
+    """A leader and followers holding formation slots around it.
+
+    Slots are offsets in the leader's local frame (x right, y up, z forward).
+    """
+    def __init__(self, key):
+        self.key = key
+        self.origin = None        # leader's spawn position; slots are relative to it
+        self.leader = None
+        self.followers = []
+        self.slots = {}           # ship_id -> Vec3 offset from the leader
+        self.generations = {}     # ship_id -> Ship.generation when it joined
+
+    def holds(self, ship):
+        """False once the pool has handed this Ship handle out as a different ship."""
+        return self.generations.get(ship.ship_id) == ship.generation
+
+    @property
+    def members(self):
+        return ([self.leader] if self.leader is not None else []) + self.followers
+
+    def frame(self):
+        """Leader position and unit right/up/forward; ship axes carry the model scale."""
+        leader = self.leader
+        return leader.position, leader.right.normalized(), leader.up.normalized(), leader.forward.normalized()
+
+    def slot_position(self, ship, frame=None):
+        origin, right, up, forward = frame or self.frame()
+        o = self.slots[ship.ship_id]
+        return origin + right * o.x + up * o.y + forward * o.z
+
+
+class SquadronManager:
+    """Plans once per squadron instead of once per ship.
+
+    The leader runs the full autopilot, including target selection and
+    attack-run phase changes. Followers take the leader's target and only
+    steer toward their slot, matching the leader's heading. When a leader dies
+    the next follower takes over, keeping its slot layout relative to the new
+    leader.
+    """
+    def __init__(self, gm, slot_lead=30.0, catch_up=40.0):
+        self.gm = gm
+        self.slot_lead = slot_lead      # followers aim this far ahead of their slot
+        self.catch_up = catch_up        # slot distance at which followers use full thrust
+        self.squadrons = {}             # key -> Squadron
+        self._by_ship = {}              # ship_id -> Squadron
+
+    def enlist(self, key, ship, slot):
+        """Add `ship` to squadron `key`; the first ship enlisted leads it."""
+        squad = self.squadrons.get(key)
+        if squad is None:
+            squad = self.squadrons[key] = Squadron(key)
+        if squad.leader is None:
+            squad.leader = ship
+            squad.origin = Vec3(slot)
+        else:
+            squad.followers.append(ship)
+            # Slots live in the leader's frame, so a rotated formation keeps its shape
+            d = Vec3(slot) - squad.origin
+            leader = squad.leader
+            squad.slots[ship.ship_id] = Vec3(
+                d.dot(leader.right.normalized()),
+                d.dot(leader.up.normalized()),
+                d.dot(leader.forward.normalized()),
+            )
+        self._by_ship[ship.ship_id] = squad
+        squad.generations[ship.ship_id] = ship.generation
+        return squad
+
+    def rejoin(self, key, ship, leader_id, slot):
+        """Re-add a ship that left squadron `key` (e.g. paged out by the sector grid).
+
+        `leader_id` and `slot` are what the ship had when it left; the slot is
+        kept if that leader still leads, otherwise the ship's current position
+        in the leader's frame becomes its slot. A squadron with no leader takes
+        the ship as its leader.
+        """
+        squad = self.squadrons.get(key)
+        if squad is None:
+            squad = self.squadrons[key] = Squadron(key)
+        if squad.leader is None:
+            squad.leader = ship
+            squad.origin = Vec3(ship.position)
+        else:
+            if squad.leader.ship_id != leader_id:
+                origin, right, up, forward = squad.frame()
+                d = ship.position - origin
+                slot = (d.dot(right), d.dot(up), d.dot(forward))
+            squad.followers.append(ship)
+            squad.slots[ship.ship_id] = Vec3(*slot)
+        self._by_ship[ship.ship_id] = squad
+        squad.generations[ship.ship_id] = ship.generation
+        return squad
+
+    def squadron_of(self, ship):
+        return self._by_ship.get(ship.ship_id)
+
+    def is_follower(self, ship):
+        squad = self._by_ship.get(ship.ship_id)
+        return squad is not None and squad.leader is not ship
+
+    def forget(self, ship):
+        """Drop a ship; promote a new leader if it was leading."""
+        squad = self._by_ship.pop(ship.ship_id, None)
+        if squad is None:
+            return
+        squad.generations.pop(ship.ship_id, None)
+        if squad.leader is ship:
+            self._promote(squad)
+        else:
+            squad.followers.remove(ship)
+            squad.slots.pop(ship.ship_id, None)
+        if squad.leader is None:
+            del self.squadrons[squad.key]
+
+    def _promote(self, squad):
+        squad.leader = None
+        while squad.followers:
+            new = squad.followers.pop(0)
+            base = squad.slots.pop(new.ship_id)
+            if new.alive and not new.is_player_controlled:
+                squad.leader = new
+                for sid in squad.slots:
+                    squad.slots[sid] = squad.slots[sid] - base
+                return
+            self._by_ship.pop(new.ship_id, None)
+            squad.generations.pop(new.ship_id, None)
+
+    def _prune(self, squad):
+        """Drop members whose handles were recycled without a forget()."""
+        held = {s.ship_id for s in squad.members if squad.holds(s)}
+        for sid in [sid for sid in squad.generations if sid not in held]:
+            del squad.generations[sid]
+            squad.slots.pop(sid, None)
+            if self._by_ship.get(sid) is squad:
+                del self._by_ship[sid]
+        squad.followers = [s for s in squad.followers if squad.holds(s)]
+        if squad.leader is not None and not squad.holds(squad.leader):
+            self._promote(squad)
+
+    def update(self, dt, due=None, plan_leaders=True):
+        """Run every squadron: leader decides, followers track slots.
+
+        `due(leader)` can skip a squadron this tick (AI throttling); skipped
+        squadrons hold their last inputs. With `plan_leaders` off the leaders'
+        autopilot is left to someone else (the pooled planner). Returns the
+        number of leaders whose autopilot ran.
+        """
+        planned = 0
+        for squad in list(self.squadrons.values()):
+            if not all(squad.holds(s) for s in squad.members):
+                self._prune(squad)
+                if squad.leader is None:
+                    del self.squadrons[squad.key]
+                    continue
+            leader = squad.leader
+            if not leader.alive or leader.is_player_controlled:
+                self.forget(leader)
+                if squad.leader is None:
+                    continue
+                leader = squad.leader
+            if due is not None and not due(leader):
+                continue
+
+            if plan_leaders and leader.autopilot_mode is not None:
+                run_autopilot(leader, dt, self.gm.sim_time)
+                planned += 1
+            target = leader.target
+            frame = None              # leader's frame, shared by all its followers
+
+            for ship in list(squad.followers):
+                if not ship.alive or ship.is_player_controlled:
+                    self.forget(ship)
+                    continue
+                if ship.target is not target:
+                    ship.target = target
+                    self.gm.fire_control.wake(ship, self.gm.sim_time)
+                if ship.autopilot_mode is not None:
+                    frame = frame or squad.frame()
+                    self._fly_slot(ship, squad, leader, frame)
+        return planned
+
+    def _fly_slot(self, ship, squad, leader, frame):
+        slot = squad.slot_position(ship, frame)
+        ship.rotation_input = aim_at(ship, slot + frame[3] * self.slot_lead, 0)
+        # Close the gap along our nose, then hold the leader's pace
+        error = (slot - ship.position).dot(ship.forward.normalized())
+        pace = leader.speed / max(ship.max_speed, 1)
+        ship.thrust_input = Vec3(0, 0, clamp(pace + error / self.catch_up, -0.5, 1))
+
+    def __len__(self):
+        return len(self.squadrons)
@@ -1,36 +1,61 @@
-from ursina import Entity, Vec3, color, camera
+from ursina import Entity, Vec3, Mesh, color, camera
+import scene_cache
+import math
 import random
 
 
-class Starfield:
-    """Background stars that surround the camera, creating an illusion of deep space."""
-    def __init__(self, num_stars=600, radius=500):
-        self.stars = []
-        self.radius = radius
-        for _ in range(num_stars):
-            pos = Vec3(
-                random.uniform(-1, 1),
-                random.uniform(-1, 1),
-                random.uniform(-1, 1),
-            ).normalized() * random.uniform(radius * 0.5, radius)
+def _build_chunk(count, radius, size, seed):
+    """One point-cloud mesh of `count` stars at a fixed point size."""
+    rng = random.Random(seed)
+    verts, colors = [], []
+    for _ in range(count):
+        pos = Vec3(
+            rng.uniform(-1, 1),
+            rng.uniform(-1, 1),
+            rng.uniform(-1, 1),
+        ).normalized() * rng.uniform(radius * 0.5, radius)
+        brightness = rng.randint(120, 255)
+        blue_tint = rng.randint(int(brightness * 0.8), brightness)
+        verts.append(pos)
+        colors.append(color.rgba(brightness, brightness, blue_tint, 255))
+    return Mesh(vertices=verts, colors=colors, mode='point', thickness=size, render_points_in_3d=True)
+
 
-            brightness = random.randint(120, 255)
-            blue_tint = random.randint(int(brightness * 0.8), brightness)
-            size = random.uniform(0.3, 1.2)
+class Starfield:
+    """Background stars that surround the camera, creating an illusion of deep space.
 
-            star = Entity(
-                model='quad',
-                color=color.rgba(brightness, brightness, blue_tint, 255),
-                scale=size,
-                position=pos,
-                billboard=True,
+    Stars are baked into a few point-cloud chunks (one node each) that ride
+    along with the camera, instead of one billboard entity per star. Chunk
+    geometry goes through scene_cache, so only the first launch builds it.
+    """
+    def __init__(self, num_stars=600, radius=500, chunks=8):
+        self.radius = radius
+        self.root = Entity(name='starfield')
+        self.chunks = []
+        self.per_chunk = math.ceil(num_stars / chunks)
+        for i in range(chunks):
+            count = min(self.per_chunk, num_stars - i * self.per_chunk)
+            if count <= 0:
+                break
+            size = 0.3 + 0.9 * (i + 0.5) / chunks    # spread of star sizes across chunks
+            model = scene_cache.load_or_bake(
+                f'starfield_{num_stars}_{radius}_{chunks}_{i}',
+                lambda count=count, size=size, i=i: _build_chunk(count, radius, size, seed=i),
             )
-            self.stars.append(star)
+            self.chunks.append(Entity(parent=self.root, model=model))
+        self.num_stars = num_stars
+        self.active_count = num_stars
+
+    def set_active_count(self, n):
+        """Show roughly n stars, in whole chunks."""
+        n = max(0, min(n, self.num_stars))
+        if n == self.active_count:
+            return
+        shown = math.ceil(n / self.per_chunk)
+        for i, chunk in enumerate(self.chunks):
+            chunk.enabled = i < shown
+        self.active_count = n
 
     def update(self):
         """Keep stars centered on the camera so they appear infinitely far away."""
-        cam_pos = camera.position
-        for star in self.stars:
-            offset = star.position - cam_pos
-            if offset.length() > self.radius * 1.2:
-                star.position = cam_pos - offset.normalized() * self.radius * random.uniform(0.8, 1.0)
+        self.root.position = camera.world_position
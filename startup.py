@@ -0,0 +1,41 @@
+from contextlib import contextmanager
+import os
+import time
+
+
+class StartupProfile:
+    """Wall-clock breakdown of launch, up to the first rendered frame.
+
+    Stages are always timed; the report is printed at the first frame only
+    when `verbose` is set (HOMAGE_STARTUP_PROFILE for the shared instance).
+    """
+    def __init__(self, verbose=False):
+        self.verbose = verbose
+        self.t0 = time.perf_counter()
+        self.stages = []          # [(name, seconds)]
+        self.first_frame = None
+
+    @contextmanager
+    def stage(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stages.append((name, time.perf_counter() - start))
+
+    def mark_first_frame(self):
+        if self.first_frame is None:
+            self.first_frame = time.perf_counter() - self.t0
+            if self.verbose:
+                print(self.report())
+
+    def report(self):
+        lines = ['--- startup ---']
+        for name, seconds in self.stages:
+            lines.append(f'  {name:<22} {seconds * 1000:8.1f} ms')
+        if self.first_frame is not None:
+            lines.append(f'  {"time to first frame":<22} {self.first_frame * 1000:8.1f} ms')
+        return '\n'.join(lines)
+
+
+startup = StartupProfile(verbose=bool(os.environ.get('HOMAGE_STARTUP_PROFILE')))
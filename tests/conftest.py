@@ -0,0 +1,23 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture(scope='session')
+def app():
+    """One headless Ursina app per test session (Panda3D allows only one)."""
+    ursina = pytest.importorskip('ursina')
+    return ursina.Ursina(window_type='none', development_mode=False)
+
+
+@pytest.fixture
+def game(app):
+    """A GameManager on the default scenario, from a clean slate."""
+    from game_manager import GameManager
+    import golden
+
+    golden._reset()
+    return GameManager(seed=0)
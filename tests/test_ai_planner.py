@@ -0,0 +1,51 @@
+import pytest
+
+pytest.importorskip('ursina')
+
+from ursina import Vec3
+
+from ai_planner import pool_from_env
+
+
+def test_pool_from_env(monkeypatch):
+    monkeypatch.delenv('HOMAGE_AI_POOL', raising=False)
+    assert pool_from_env() is None
+    monkeypatch.setenv('HOMAGE_AI_POOL', 'threads')
+    assert pool_from_env() == (None, False)
+    monkeypatch.setenv('HOMAGE_AI_POOL', 'processes:3')
+    assert pool_from_env() == (3, True)
+    monkeypatch.setenv('HOMAGE_AI_POOL', 'fibers')
+    with pytest.raises(ValueError):
+        pool_from_env()
+
+
+def test_game_manager_enables_pool_from_env(monkeypatch, app):
+    from game_manager import GameManager
+
+    monkeypatch.setenv('HOMAGE_AI_POOL', 'threads:2')
+    gm = GameManager(seed=0)
+    try:
+        assert gm.ai_planner is not None
+    finally:
+        gm.shutdown()
+    assert gm.ai_planner is None
+
+
+def test_thread_pool_steers_ai_ships(game):
+    game.enable_pooled_ai(workers=2)
+    try:
+        ai = [s for s in game.all_ships if s.autopilot_mode is not None and not s.is_player_controlled]
+        assert ai
+        for ship in ai:
+            ship.thrust_input = Vec3(0, 0, 0)
+            ship.rotation_input = Vec3(0, 0, 0)
+        start = {s.ship_id: s.position for s in ai}
+        for _ in range(30):
+            game.step(1 / 60)
+        flying = [s for s in ai if s.alive]
+        assert flying
+        for ship in flying:
+            assert ship.thrust_input != Vec3(0, 0, 0) or ship.rotation_input != Vec3(0, 0, 0)
+            assert ship.position != start[ship.ship_id]
+    finally:
+        game.disable_pooled_ai()
@@ -0,0 +1,55 @@
+import math
+import random
+
+import pytest
+
+pytest.importorskip('ursina')
+
+from ursina import Vec3
+
+from collision import Ray, SweepAndPrune, ship_radius
+from ship import Ship
+from ship_defs import FIGHTER_DEF
+
+
+def _brute_force(ships, ray):
+    best = None
+    for ship in ships:
+        if ship is ray.ignore or not ship.alive:
+            continue
+        oc = ship.position - ray.origin
+        t = oc.dot(ray.direction)
+        r = ship_radius(ship)
+        d2 = oc.dot(oc) - t * t
+        if d2 > r * r:
+            continue
+        t_hit = max(t - math.sqrt(r * r - d2), 0.0)
+        if t < -r or t_hit > ray.length:
+            continue
+        if best is None or t_hit < best[1]:
+            best = (ship, t_hit)
+    return best
+
+
+def test_broadphase_raycast_matches_brute_force(app):
+    rng = random.Random(3)
+    ships = [
+        Ship(FIGHTER_DEF, position=Vec3(rng.uniform(-300, 300), rng.uniform(-10, 10), rng.uniform(-10, 10)))
+        for _ in range(80)
+    ]
+    ships[5].alive = False
+    bp = SweepAndPrune()
+    bp.update(ships, lambda s: ship_radius(s) + 7.5)
+
+    rays = []
+    for shooter in ships[:30]:
+        d = Vec3(rng.uniform(-1, 1), rng.uniform(-0.05, 0.05), rng.uniform(-0.05, 0.05)).normalized()
+        rays.append(Ray(shooter.position, d, rng.uniform(50, 400), shooter))
+
+    hits = bp.raycast(rays)
+    expected = [_brute_force(ships, ray) for ray in rays]
+    assert [h and h[0] for h in hits] == [e and e[0] for e in expected]
+    assert any(h is not None for h in hits)
+    for h, e in zip(hits, expected):
+        if h is not None:
+            assert h[1] == pytest.approx(e[1])
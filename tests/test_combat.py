@@ -0,0 +1,29 @@
+import pytest
+
+pytest.importorskip('ursina')
+
+
+def test_killed_ship_keeps_its_damage_total(app, game):
+    enemy = game.enemy_ships[0]
+    ship_id, remaining = enemy.ship_id, enemy.hp + enemy.shield
+    game.damage.add(enemy, remaining + 50)
+    game.step(1 / 60)
+
+    assert enemy not in game.all_ships          # retired the tick it died
+    assert ship_id not in game.damage.damage_by_ship
+    assert (ship_id, enemy.ship_name, remaining) in game.damage.retired_damage
+
+
+def test_retired_damage_is_bounded():
+    from combat import DamageBuffer
+
+    class _Ship:
+        ship_name = 'dummy'
+
+    buf = DamageBuffer(retired_cap=4)
+    for i in range(10):
+        s = _Ship()
+        s.ship_id = i
+        buf.damage_by_ship[i] = float(i)
+        buf.forget(s)
+    assert [r[0] for r in buf.retired_damage] == [6, 7, 8, 9]
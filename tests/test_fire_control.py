@@ -0,0 +1,108 @@
+import pytest
+
+pytest.importorskip('ursina')
+
+from ursina import Vec3
+
+from ai_planner import AIPlanner
+from collision import SweepAndPrune, ship_radius
+from fire_control import FireControl
+from ship import Ship
+from ship_defs import ENEMY_FIGHTER_DEF, FIGHTER_DEF
+from weapons import Weapon
+
+
+def _line_up(blocker_x):
+    """A friendly shooter aimed down +z at an enemy, a friendly at x=blocker_x between them."""
+    shooter = Ship(FIGHTER_DEF, position=Vec3(0, 0, 0))
+    shooter.weapons.append(Weapon(shooter, range=300))
+    blocker = Ship(FIGHTER_DEF, position=Vec3(blocker_x, 0, 50))
+    enemy = Ship(ENEMY_FIGHTER_DEF, position=Vec3(0, 0, 120))
+    shooter.target = enemy
+    return shooter, [shooter, blocker, enemy]
+
+
+def _broadphase(ships):
+    bp = SweepAndPrune()
+    bp.update(ships, ship_radius)
+    return bp
+
+
+def test_holds_fire_with_friendly_in_line(app):
+    fc = FireControl()
+    shooter, ships = _line_up(blocker_x=0)
+    fc.wake(shooter)
+    projectiles = []
+    fc.update(1.0, projectiles, _broadphase(ships))
+    assert projectiles == []
+    assert fc.blocked == 1
+
+
+def test_fires_when_line_is_clear(app):
+    fc = FireControl()
+    shooter, ships = _line_up(blocker_x=40)
+    fc.wake(shooter)
+    projectiles = []
+    fc.update(1.0, projectiles, _broadphase(ships))
+    assert len(projectiles) == 1
+    assert fc.blocked == 0
+
+
+def test_pooled_planner_holds_fire_with_friendly_in_line(app):
+    planner = AIPlanner(workers=1)
+    try:
+        for blocker_x, shots in ((0, 0), (40, 1)):
+            shooter, ships = _line_up(blocker_x)
+            planner.publish(ships, [shooter], 1 / 60, 1.0)
+            projectiles = []
+            planner.apply(projectiles, 1.0, _broadphase(ships))
+            assert len(projectiles) == shots
+    finally:
+        planner.shutdown()
+
+
+def test_fires_at_ready_at_not_before(app):
+    fc = FireControl()
+    shooter, ships = _line_up(blocker_x=40)
+    bp = _broadphase(ships)
+    projectiles = []
+    fc.wake(shooter, 1.0)
+    fc.update(1.0, projectiles, bp)
+    assert len(projectiles) == 1
+    ready_at = shooter.weapons[0].ready_at
+    assert ready_at > 1.0
+    evaluations = fc.evaluations
+
+    fc.update(ready_at - 1e-6, projectiles, bp)
+    assert len(projectiles) == 1
+    assert fc.evaluations == evaluations  # not even looked at before it is due
+    fc.update(ready_at, projectiles, bp)
+    assert len(projectiles) == 2
+
+
+def test_superseded_entries_are_ignored_and_compacted(app):
+    fc = FireControl()
+    shooter, ships = _line_up(blocker_x=40)
+    for i in range(200):
+        fc.wake(shooter, 0.5 + i * 0.001)
+    fc.wake(shooter, 5.0)              # the only live entry
+    assert fc.pending_count() == 1
+    assert len(fc._heap) < 100
+
+    projectiles = []
+    fc.update(4.0, projectiles, _broadphase(ships))
+    assert projectiles == [] and fc.evaluations == 0
+    fc.update(5.0, projectiles, _broadphase(ships))
+    assert len(projectiles) == 1 and fc.evaluations == 1
+    assert fc.pending_count() == 1     # rescheduled for its next ready_at
+
+
+def test_forgotten_ship_is_never_evaluated(app):
+    fc = FireControl()
+    shooter, ships = _line_up(blocker_x=40)
+    fc.wake(shooter, 1.0)
+    fc.forget(shooter)
+    assert fc.pending_count() == 0
+    projectiles = []
+    fc.update(2.0, projectiles, _broadphase(ships))
+    assert projectiles == [] and fc.evaluations == 0
@@ -0,0 +1,40 @@
+import os
+
+import pytest
+
+pytest.importorskip('ursina')
+pytest.importorskip('numpy')
+
+import golden
+from golden import first_divergence, run
+
+
+SCENARIOS = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'scenarios')
+
+
+@pytest.mark.parametrize('scenario', ['default.json', 'dogfight.json'])
+def test_numpy_matches_reference(app, scenario):
+    path = os.path.join(SCENARIOS, scenario)
+    ref = run(path, 'reference', ticks=300)
+    cand = run(path, 'numpy', ticks=300)
+    assert first_divergence(ref, cand) is None
+    golden._reset()
+
+
+def test_injected_divergence_is_caught(app):
+    path = os.path.join(SCENARIOS, 'dogfight.json')
+    ref = run(path, 'reference', ticks=60)
+    golden._reset()
+    ship_id = sorted(ref.frames[40])[3]
+
+    bumped = [dict(f) for f in ref.frames]
+    pos, *rest = bumped[40][ship_id]
+    bumped[40][ship_id] = ((pos[0] + 0.5, pos[1], pos[2]), *rest)
+    div = first_divergence(ref, ref._replace(profile='numpy', frames=bumped))
+    assert (div.tick, div.ship_id, div.field) == (40, ship_id, 'position')
+
+    damaged = [dict(f) for f in ref.frames]
+    *state, hp, shield, alive = damaged[50][ship_id]
+    damaged[50][ship_id] = (*state, hp - 1, shield, alive)
+    div = first_divergence(ref, ref._replace(profile='numpy', frames=damaged))
+    assert (div.tick, div.ship_id, div.field) == (50, ship_id, 'hp')
@@ -0,0 +1,89 @@
+import pytest
+
+pytest.importorskip('ursina')
+
+from ursina import Vec3
+
+from impacts import ImpactQueue, time_to_contact
+from ship import Ship
+from ship_defs import ENEMY_FIGHTER_DEF, FIGHTER_DEF
+from weapons import AnalyticProjectile, ship_hit_radius
+
+
+def test_time_to_contact_hit():
+    # 100 units out, closing at 50/s, radius 10: contact after (100 - 10) / 50
+    assert time_to_contact(Vec3(0, 0, 100), Vec3(0, 0, -50), 10) == pytest.approx(1.8)
+
+
+def test_time_to_contact_miss():
+    assert time_to_contact(Vec3(20, 0, 100), Vec3(0, 0, -50), 10) is None
+
+
+def test_time_to_contact_starts_inside_radius():
+    assert time_to_contact(Vec3(0, 3, 0), Vec3(0, 0, 50), 10) == 0.0
+
+
+def test_time_to_contact_not_closing():
+    assert time_to_contact(Vec3(0, 0, 100), Vec3(0, 0, 50), 10) is None
+    assert time_to_contact(Vec3(0, 0, 100), Vec3(0, 0, 0), 10) is None
+
+
+def _shot(*enemy_positions):
+    """A friendly firing an analytic round down +z at 100 u/s (range 300) past parked enemies."""
+    shooter = Ship(FIGHTER_DEF, position=Vec3(0, 0, 0))
+    enemies = [Ship(ENEMY_FIGHTER_DEF, position=Vec3(*p)) for p in enemy_positions]
+    proj = AnalyticProjectile(shooter, 10, 100, 300, (255, 255, 255))
+    queue = ImpactQueue()
+    queue.add(proj, [shooter] + enemies, 0.0)
+    return queue, proj, enemies
+
+
+def _contact_time(proj, ship):
+    return ((ship.position - proj.origin).length() - ship_hit_radius(ship)) / proj.speed
+
+
+def test_queue_hits_at_predicted_time(app):
+    queue, proj, (enemy,) = _shot((0, 0, 102))
+    t_hit = _contact_time(proj, enemy)
+    assert queue.update(t_hit - 0.01) == ([], [])
+    hits, expired = queue.update(t_hit + 0.01)
+    assert hits == [(proj, enemy)] and expired == []
+    assert not proj.alive
+    assert len(queue) == 0
+
+
+def test_queue_expires_a_miss(app):
+    queue, proj, _ = _shot((50, 0, 102))
+    assert queue.update(proj.lifetime - 0.01) == ([], [])
+    assert queue.update(proj.lifetime + 0.01) == ([], [proj])
+
+
+def test_queue_repredicts_when_target_moves_aside(app):
+    queue, proj, (enemy,) = _shot((0, 0, 102))
+    t_hit = _contact_time(proj, enemy)
+    queue.update(0.2)
+    enemy.position = Vec3(50, 0, 102)        # left the predicted straight line
+    assert queue.update(0.3) == ([], [])
+    assert queue.repredictions == 1
+    assert queue.update(t_hit + 0.01) == ([], [])
+    assert queue.update(proj.lifetime + 0.01) == ([], [proj])
+
+
+def test_queue_moves_on_when_victim_dies_first(app):
+    queue, proj, (near, far) = _shot((0, 0, 102), (0, 0, 152))
+    assert proj.hit_ship is near
+    near.alive = False                       # destroyed by something else before impact
+    assert queue.update(_contact_time(proj, near) + 0.01) == ([], [])
+    assert proj.hit_ship is far
+    hits, _ = queue.update(_contact_time(proj, far) + 0.01)
+    assert hits == [(proj, far)]
+
+
+def test_forget_ship_resolves_watchers_again(app):
+    queue, proj, (near, far) = _shot((0, 0, 102), (0, 0, 152))
+    queue.forget_ship(near)                  # e.g. paged out or retired
+    assert near not in proj.candidates
+    assert proj.hit_ship is far
+    hits, _ = queue.update(_contact_time(proj, far) + 0.01)
+    assert hits == [(proj, far)]
+    assert queue._tracks == {} and queue._watchers == {}
@@ -0,0 +1,27 @@
+import pytest
+
+pytest.importorskip('ursina')
+
+import kernels
+
+
+@pytest.mark.parametrize('name', ['python', 'numpy', 'numba'])
+def test_backend_matches_per_ship_path(app, name):
+    if name == 'numpy':
+        pytest.importorskip('numpy')
+    if name == 'numba':
+        pytest.importorskip('numba')
+    worst = kernels.verify(kernels.make_backend(name))
+    # The batched path really ran: float64 loops differ from float32 ship state
+    assert 0.0 < worst < 1e-5
+
+
+def test_python_backend_batches_only_when_forced():
+    saved = kernels.backend
+    try:
+        kernels.backend = kernels.make_backend('python')
+        assert not kernels.use_batch(1000, kernels.min_batch_ships)
+        assert kernels.use_batch(3, 0)
+        assert not kernels.use_batch(0, 0)
+    finally:
+        kernels.backend = saved
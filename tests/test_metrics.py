@@ -0,0 +1,96 @@
+import socket
+
+from metrics import Metrics, MetricsExporter, PrometheusTextfile, StatsdUDP
+
+
+def _registry():
+    m = Metrics()
+    m.describe('fired', 'Projectiles fired.')
+    m.inc('fired', 3)
+    m.inc('kills', 2, weapon='laser')
+    m.set('ships_alive', 12, faction='enemy')
+    m.observe('tick_seconds', 0.003)
+    m.observe('tick_seconds', 0.5)
+    return m
+
+
+def test_prometheus_textfile(tmp_path):
+    path = str(tmp_path / 'homage.prom')
+    PrometheusTextfile(path).write(_registry().snapshot(), {'fired': 'Projectiles fired.'})
+    lines = open(path).read().splitlines()
+
+    assert '# HELP homage_fired_total Projectiles fired.' in lines
+    assert '# TYPE homage_fired_total counter' in lines
+    assert 'homage_fired_total 3' in lines
+    assert '# TYPE homage_kills_total counter' in lines
+    assert 'homage_kills_total{weapon="laser"} 2' in lines
+    assert '# TYPE homage_ships_alive gauge' in lines
+    assert 'homage_ships_alive{faction="enemy"} 12' in lines
+    assert '# TYPE homage_tick_seconds histogram' in lines
+    assert 'homage_tick_seconds_bucket{le="0.004"} 1' in lines
+    assert 'homage_tick_seconds_bucket{le="0.5"} 2' in lines
+    assert 'homage_tick_seconds_bucket{le="+Inf"} 2' in lines
+    assert 'homage_tick_seconds_count 2' in lines
+    # Every sample belongs to a family declared by a TYPE line
+    families = {line.split()[2] for line in lines if line.startswith('# TYPE')}
+    for line in lines:
+        if not line.startswith('#'):
+            name = line.split('{')[0].split()[0]
+            assert any(name == f or name.startswith(f + '_') for f in families), name
+
+
+def test_statsd_to_local_listener():
+    listener = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    listener.bind(('127.0.0.1', 0))
+    listener.settimeout(2.0)
+    try:
+        m = _registry()
+        exporter = MetricsExporter(m, [StatsdUDP(*listener.getsockname())], interval=60)
+        exporter.flush()
+        lines = set(listener.recv(65536).decode().splitlines())
+
+        assert 'homage.fired:3|c' in lines
+        assert 'homage.kills.laser:2|c' in lines
+        assert 'homage.ships_alive.enemy:12|g' in lines
+        assert 'homage.tick_seconds.count:2|c' in lines
+        assert 'homage.tick_seconds.sum:0.503000|c' in lines
+        assert 'homage.tick_seconds.le_0.004:1|c' in lines
+        assert 'homage.tick_seconds.le_0.5:1|c' in lines
+
+        # Counters go out as deltas since the last flush
+        m.inc('fired', 2)
+        exporter.flush()
+        lines = set(listener.recv(65536).decode().splitlines())
+        assert 'homage.fired:2|c' in lines
+        assert not any(line.startswith('homage.kills') for line in lines)
+        exporter.stop(flush=False)
+    finally:
+        listener.close()
+
+
+def test_prometheus_escapes_label_values(tmp_path):
+    m = Metrics()
+    m.inc('kills', weapon='say "hi"\\now\n')
+    path = str(tmp_path / 'homage.prom')
+    PrometheusTextfile(path).write(m.snapshot(), {})
+    assert 'homage_kills_total{weapon="say \\"hi\\"\\\\now\\n"} 1' in open(path).read().splitlines()
+
+
+def test_game_metrics_are_per_manager_and_flushed_on_shutdown(app, tmp_path, monkeypatch):
+    import golden
+    from game_manager import GameManager
+
+    path = str(tmp_path / 'homage.prom')
+    monkeypatch.setenv('HOMAGE_METRICS', f'prom:{path}')
+    golden._reset()
+    gm = GameManager(seed=0)
+    gm.step(1 / 60)
+    gm.shutdown()                        # stops the exporter with a final flush
+    text = open(path).read()
+    assert 'homage_ticks_total 1' in text
+    assert '# HELP homage_ticks_total Simulation ticks run.' in text
+
+    monkeypatch.delenv('HOMAGE_METRICS')
+    golden._reset()
+    fresh = GameManager(seed=0)
+    assert 'ticks' not in fresh.metrics.counters
@@ -0,0 +1,86 @@
+import pytest
+
+pytest.importorskip('ursina')
+
+from ursina import Vec3
+
+from ecs import World
+from ship_defs import ENEMY_FIGHTER_DEF, FIGHTER_DEF
+from ship_pool import ShipPool
+from squadrons import SquadronManager
+from weapons import Projectile, Weapon
+
+
+def test_release_then_acquire_reuses_the_handle_as_a_new_ship(app):
+    world = World()
+    pool = ShipPool(max_free=1, world=world)
+    ship, reused = pool.acquire(FIGHTER_DEF, Vec3(0, 0, 0))
+    assert not reused and pool.created == 1
+    ship.weapons.append(Weapon(ship))
+    ship.weapons[0].ready_at = 5.0
+    ship.hp = 1
+    old_id, old_generation = ship.ship_id, ship.generation
+
+    pool.release(ship)
+    assert pool.free_count() == 1 and world.count() == 0
+    again, reused = pool.acquire(FIGHTER_DEF, Vec3(10, 0, 0))
+    assert reused and again is ship and pool.reused == 1
+    assert again.ship_id != old_id and again.generation == old_generation + 1
+    assert again.hp == FIGHTER_DEF.hp and again.position == Vec3(10, 0, 0)
+    assert again.weapons[0].ready_at == 0.0      # weapon objects kept, cooldown reset
+    assert world.count() == 1
+
+    # Free lists are per definition and capped at max_free
+    other, reused = pool.acquire(ENEMY_FIGHTER_DEF, Vec3(0, 0, 0))
+    assert not reused
+    third, _ = pool.acquire(FIGHTER_DEF, Vec3(0, 0, 0))
+    for s in (again, other, third):
+        pool.release(s)
+    assert pool.free_count() == 2
+
+
+def test_projectile_forgets_an_owner_handle_that_was_reused(app):
+    pool = ShipPool(world=World())
+    shooter, _ = pool.acquire(ENEMY_FIGHTER_DEF, Vec3(0, 0, 0))
+    proj = Projectile(shooter, 10, 100, 300, (255, 255, 255))
+    assert proj.live_owner is shooter
+
+    pool.release(shooter)
+    recycled, _ = pool.acquire(ENEMY_FIGHTER_DEF, Vec3(0, 0, 20))
+    assert recycled is shooter and proj.live_owner is None
+
+
+def test_squadron_drops_a_member_whose_handle_was_reused(game):
+    pool = ShipPool(world=World())
+    manager = SquadronManager(game)
+    leader, first, second = (pool.acquire(FIGHTER_DEF, Vec3(x, 0, 0))[0] for x in (0, 10, 20))
+    for ship in (leader, first, second):
+        manager.enlist('a', ship, ship.position)
+    squad = manager.squadron_of(leader)
+
+    # Released and handed out again without the squadron being told
+    old_id = first.ship_id
+    pool.release(first)
+    pool.acquire(FIGHTER_DEF, Vec3(0, 0, 0))
+    manager.update(1 / 60, plan_leaders=False)
+    assert squad.followers == [second]
+    assert old_id not in squad.slots and manager.squadron_of(first) is None
+
+    pool.release(leader)
+    pool.acquire(FIGHTER_DEF, Vec3(0, 0, 0))
+    manager.update(1 / 60, plan_leaders=False)
+    assert squad.leader is second and squad.followers == []
+
+
+def test_wrecks_are_compacted_out_and_returned_to_the_pool(app, game):
+    enemies = list(game.enemy_ships[:3])
+    free = game.pool.free_count()
+    for ship in enemies:
+        game.damage.add(ship, 1e9)
+    game.damage.add(game.player_ship, 1e9)
+    game.step(1 / 60)
+
+    assert not any(s in game.all_ships or s in game.enemy_ships for s in enemies)
+    assert game.pool.free_count() == free + len(enemies)
+    # The player's wreck stays until control moves elsewhere
+    assert game.player_ship in game.all_ships and not game.player_ship.alive
@@ -0,0 +1,62 @@
+import pytest
+
+pytest.importorskip('ursina')
+
+from ursina import Vec3
+
+from collision import SweepAndPrune, ship_radius
+from radar import Radar
+from ship import Ship
+from ship_defs import ENEMY_FIGHTER_DEF, FIGHTER_DEF
+
+
+def _scene():
+    own = Ship(FIGHTER_DEF, position=Vec3(0, 0, 0))
+    wing = Ship(FIGHTER_DEF, position=Vec3(100, 0, 0))
+    bandit = Ship(ENEMY_FIGHTER_DEF, position=Vec3(0, 0, 500))
+    target = Ship(ENEMY_FIGHTER_DEF, position=Vec3(-750, 0, 0))
+    far = Ship(ENEMY_FIGHTER_DEF, position=Vec3(0, 0, 1600))
+    wreck = Ship(ENEMY_FIGHTER_DEF, position=Vec3(0, 0, -200))
+    wreck.alive = False
+    own.target = target
+    ships = [own, wing, bandit, target, far, wreck]
+    bp = SweepAndPrune()
+    bp.update(ships, ship_radius)
+    return own, ships, bp
+
+
+def test_contacts_filtered_by_range_and_coloured_by_faction(app):
+    radar = Radar(range=1500.0, interval=0.1)
+    own, ships, bp = _scene()
+    radar.update(0.0, own, bp.query)
+    # Not itself, not the wreck, not the ship 1600 out
+    assert radar.shown == 3 and radar.contacts.enabled
+    by_pos = {(round(v[0], 4), round(v[1], 4)): c for v, c in zip(radar.mesh.vertices, radar.mesh.colors)}
+    k = 0.5 / 1500
+    assert by_pos[(round(100 * k, 4), 0)] == Radar.FRIENDLY
+    assert by_pos[(0, round(500 * k, 4))] == Radar.ENEMY
+    assert by_pos[(round(-750 * k, 4), 0)] == Radar.TARGET
+
+    radar.range = 400.0
+    radar.update(0.1, own, bp.query)
+    assert radar.shown == 1
+    for ship in ships:
+        ship.dispose()
+
+
+def test_redraws_on_its_interval_and_clears_without_a_ship(app):
+    radar = Radar(range=1500.0, interval=0.1)
+    own, ships, bp = _scene()
+    radar.update(0.0, own, bp.query)
+    assert radar.shown == 3
+    radar.range = 400.0
+    radar.update(0.05, own, bp.query)       # inside the interval: not redrawn
+    assert radar.shown == 3
+    radar.update(0.05, own, bp.query)
+    assert radar.shown == 1
+
+    own.alive = False
+    radar.update(0.1, own, bp.query)
+    assert radar.shown == 0 and not radar.contacts.enabled
+    for ship in ships:
+        ship.dispose()
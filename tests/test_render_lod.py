@@ -0,0 +1,100 @@
+import pytest
+
+pytest.importorskip('ursina')
+
+from ursina import Vec3, camera
+
+from render_lod import LOD_FULL, LOD_HIDDEN, LOD_POINT, LOD_SIMPLE, RenderLOD
+from ship import Ship
+from ship_defs import FIGHTER_DEF
+
+
+@pytest.fixture
+def lod(app):
+    camera.position = Vec3(0, 0, 0)
+    camera.rotation = Vec3(0, 0, 0)         # looking down +z
+    return RenderLOD(node_budget=4, full=150, simple=400, point=1500)
+
+
+def _ships(positions):
+    return [Ship(FIGHTER_DEF, position=Vec3(*p)) for p in positions]
+
+
+def test_level_by_distance_over_size(lod):
+    fwd, cone = Vec3(0, 0, 1), 0.8
+    level = lambda z, size=1.0: lod.level_for(z, Vec3(0, 0, z), size, fwd, cone)
+    assert level(100) == LOD_FULL
+    assert level(200) == LOD_SIMPLE
+    assert level(1000) == LOD_POINT
+    assert level(2000) == LOD_HIDDEN
+    assert level(2000, size=20) == LOD_FULL      # a big ship stays detailed further out
+
+
+def test_cone_culls_behind_and_keeps_the_edge(lod):
+    fwd, cone = Vec3(0, 0, 1), 0.8
+    assert lod.level_for(100, Vec3(0, 0, -100), 1.0, fwd, cone) == LOD_HIDDEN
+    side = Vec3(100, 0, 0)
+    assert lod.level_for(100, side, 1.0, fwd, cone) == LOD_HIDDEN
+    # Just outside the cone by less than the ship's radius: still drawn
+    edge = Vec3(0.6, 0, 0.795).normalized() * 10
+    assert lod.level_for(10, edge, 1.0, fwd, cone) != LOD_HIDDEN
+    # Inside its own radius the camera never culls
+    assert lod.level_for(0.5, Vec3(0, 0, -0.5), 1.0, fwd, cone) == LOD_FULL
+
+
+def test_update_assigns_levels_and_glow(lod):
+    near, mid, far, behind = _ships([(0, 0, 100), (0, 0, 500), (0, 0, 3000), (0, 0, -100)])
+    ships = [near, mid, far, behind]
+    scale = max(FIGHTER_DEF.model_scale)
+    for ship in ships:
+        ship.glow = (255, 255, 255, 255)
+    lod.full, lod.simple, lod.point = 200 / scale, 1000 / scale, 2000 / scale
+    lod.update(ships)
+    assert [s.lod for s in ships] == [LOD_FULL, LOD_SIMPLE, LOD_HIDDEN, LOD_HIDDEN]
+    assert lod.counts == [1, 1, 0, 2]
+    nodes = {s.ship_id: node for s, node in lod._bound.values()}
+    assert nodes[near.ship_id].glow.visible and not nodes[mid.ship_id].glow.visible
+    for ship in ships:
+        ship.dispose()
+
+
+def test_node_budget_goes_to_the_most_relevant_ships(lod):
+    # Ten ships in view at full detail, four nodes (node_budget=4)
+    ships = _ships([(0, 0, 20 + 5 * i) for i in range(10)])
+    focus, flown, targeted = ships[9], ships[8], ships[7]
+    flown.is_player_controlled = True
+    focus.target = targeted
+    lod.update(ships, focus)
+
+    bound = {s.ship_id for s, _ in lod._bound.values()}
+    assert bound == {focus.ship_id, flown.ship_id, targeted.ship_id, ships[0].ship_id}
+    assert lod.bound_count == 4 and len(lod._free) == 0
+    assert lod.counts[LOD_POINT] == 6 and lod.points.enabled
+    assert all(s.lod == LOD_POINT for s in ships[1:7])
+    for ship in ships:
+        ship.dispose()
+
+
+def test_nodes_are_kept_while_chosen_and_reused_when_released(lod):
+    ships = _ships([(0, 0, 20 + 5 * i) for i in range(6)])
+    lod.update(ships)
+    assert lod.rebinds == 4
+    nodes = {s.ship_id: node for s, node in lod._bound.values()}
+
+    lod.update(ships)                       # same set: nothing rebinds
+    assert lod.rebinds == 4
+    assert {s.ship_id: node for s, node in lod._bound.values()} == nodes
+
+    # The nearest ship leaves view: its node goes to the next in line
+    gone = ships[0]
+    gone.alive = False
+    lod.update(ships)
+    assert lod.rebinds == 5 and lod.bound_count == 4
+    assert gone.ship_id not in {s.ship_id for s, _ in lod._bound.values()}
+    assert nodes[gone.ship_id] in [node for _, node in lod._bound.values()]
+
+    lod.update([])
+    assert lod.bound_count == 0 and len(lod._free) == 4
+    assert not any(node.hull.enabled for node in lod._free)
+    for ship in ships:
+        ship.dispose()
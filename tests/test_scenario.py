@@ -0,0 +1,38 @@
+import pytest
+
+pytest.importorskip('ursina')
+
+from scenario import expand_group
+
+
+def test_group_rotation_turns_ships_and_formation(app):
+    group = {"ship": "Enemy Fighter", "count": 3, "formation": "wedge", "center": [0, 0, 100],
+             "spacing": 10, "rotation": [0, 180, 0]}
+    orders = expand_group(group)
+    assert all(tuple(o.rotation) == (0, 180, 0) for o in orders)
+    # The wedge trails behind its leader, which now means toward +z
+    lead, *wings = orders
+    assert tuple(lead.position) == pytest.approx((0, 0, 100), abs=1e-4)
+    for o in wings:
+        assert o.position.z == pytest.approx(110, abs=1e-4)
+        assert abs(o.position.x) == pytest.approx(10, abs=1e-4)
+
+
+def test_group_without_rotation_faces_z(app):
+    orders = expand_group({"ship": "Fighter", "count": 2, "formation": "line", "center": [0, 0, 0]})
+    assert all(o.rotation is None for o in orders)
+
+
+def test_spawner_budget_shrinks_with_measured_tick_time(app, game):
+    spawner = game.spawner
+    spawner.headless = False
+    spawner.min_budget = 0.0
+    game.reinforce([{"ship": "Enemy Fighter", "count": 50, "formation": "grid", "center": [0, 0, 500]}])
+
+    game.tick_seconds = 1.0                  # last tick blew the frame: one ship only
+    before = len(game.all_ships)
+    spawner.update()
+    assert len(game.all_ships) == before + 1
+
+    game.tick_seconds = 0.0                  # idle frame: up to budget_ms of spawning
+    assert spawner.frame_budget_left() == spawner.budget
@@ -0,0 +1,59 @@
+import pytest
+
+pytest.importorskip('ursina')
+
+from ursina import Entity, Vec3
+
+from scheduler import Scheduler
+from simclock import SimClock
+
+
+def test_tweens_finish_and_destroy_drops_them(app):
+    clock = SimClock()
+    s = Scheduler(clock)
+    a, b = Entity(), Entity()
+    s.tween(a, 'x', 10, 1.0)
+    s.tween(a, 'scale', Vec3(0, 0, 0), 2.0)
+    s.tween(b, 'y', 5, 1.0)
+    s.tween(b, 'y', 8, 1.0)          # replaces the pending tween on b.y
+    assert s.pending_count() == 3
+
+    clock.time = 0.5
+    s.update()
+    assert a.x == pytest.approx(5)
+    assert b.y == pytest.approx(4)
+
+    s.destroy_later(a, 0.25)
+    clock.time = 1.0
+    s.update()                       # a destroyed at 0.75, b finished at 1.0
+    assert b.y == pytest.approx(8)
+    assert s.pending_count() == 0
+
+
+def test_coalesced_calls_leave_no_stale_entries():
+    clock = SimClock()
+    s = Scheduler(clock)
+    calls = []
+    for i in range(100):
+        clock.time = i * 0.01
+        s.call_later(0.05, calls.append, i, key='flash')
+    assert len(s._heap) == 1 and s.pending_count() == 1
+    assert s.coalesced == 99
+
+    clock.time = 0.99 + 0.04
+    s.update()
+    assert calls == []               # pushed out to 0.99 + 0.05
+    clock.time = 0.99 + 0.05
+    s.update()
+    assert calls == [0]              # the first call's fn/args, run once
+    assert s.pending_count() == 0
+
+
+def test_cancelled_entries_are_compacted():
+    s = Scheduler(SimClock())
+    for i in range(200):
+        s.call_later(1.0, print, key=('flash', i))
+    for i in range(150):
+        s.cancel(('flash', i))
+    assert s.pending_count() == 50
+    assert len(s._heap) < 200
@@ -0,0 +1,71 @@
+import os
+
+import pytest
+
+pytest.importorskip('ursina')
+
+from ursina import Vec3
+
+from sectors import SectorGrid
+from ship_defs import FIGHTER_DEF
+
+
+def _page_out_and_in(grid, game):
+    grid.active_radius = -1             # no sector is active: page everyone out
+    grid.update(game, 0.0)
+    assert game.all_ships == [game.player_ship]
+    grid.active_radius = 1              # everything in range again: page back in
+    grid.update(game, 0.0)
+
+
+def _by_id(game):
+    return {s.ship_id: s for s in game.all_ships}
+
+
+def test_page_cycle_keeps_ids_and_fire_scheduling(app, game):
+    """Paging ships out and back in restores their ids and they keep fighting."""
+    grid = SectorGrid(sector_size=1e6, check_interval=0.0)
+    ids = sorted(s.ship_id for s in game.all_ships if s is not game.player_ship)
+    for _ in range(3):
+        _page_out_and_in(grid, game)
+        assert sorted(s.ship_id for s in game.all_ships if s is not game.player_ship) == ids
+        # One fire-control entry per ship: nothing left behind for the paged-out ones
+        assert game.fire_control.pending_count() == len(game.all_ships)
+
+    for _ in range(60):
+        game.step(1 / 60)
+    assert game.fire_control.evaluations > 0
+
+    path = grid.storage_dir
+    assert os.path.isdir(path)
+    grid.close()
+    assert not os.path.exists(path)
+
+
+def test_page_cycle_keeps_targets_squadrons_and_control(app, game):
+    grid = SectorGrid(sector_size=1e6, check_interval=0.0)
+    leader, *wings = [game.create_ship(FIGHTER_DEF, position=Vec3(x, 0, z))
+                      for x, z in ((0, 0), (20, -20), (-20, -20))]
+    for ship in (leader, *wings):
+        game.squadrons.enlist('blue', ship, ship.position)
+    slots = {s.ship_id: tuple(game.squadrons.squadron_of(s).slots[s.ship_id]) for s in wings}
+    enemy = game.enemy_ships[0]
+    targets = {s.ship_id: (enemy.ship_id if s is not wings[0] else game.player_ship.ship_id)
+               for s in (leader, *wings)}
+    for ship in (leader, *wings):
+        ship.target = _by_id(game)[targets[ship.ship_id]]
+    wings[-1].is_player_controlled = True
+    leader_id, flown_id = leader.ship_id, wings[-1].ship_id
+
+    _page_out_and_in(grid, game)            # the Ship objects go back to the pool here
+
+    ships = _by_id(game)
+    for ship_id, target_id in targets.items():
+        assert ships[ship_id].target is ships[target_id]
+    squad = game.squadrons.squadron_of(ships[leader_id])
+    assert squad.key == 'blue' and squad.leader.ship_id == leader_id
+    assert {s.ship_id for s in squad.followers} == set(slots)
+    for ship_id, slot in slots.items():
+        assert tuple(squad.slots[ship_id]) == pytest.approx(slot, abs=1e-3)
+    assert ships[flown_id].is_player_controlled
+    assert not ships[leader_id].is_player_controlled
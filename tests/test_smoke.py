@@ -0,0 +1,27 @@
+def test_default_scenario_runs_headless(app, game):
+    """Step the default scenario for a few seconds of frames."""
+    dt = 1 / 60
+    for _ in range(int(5 / dt)):
+        game.update(dt)
+        app.step()
+
+    assert game.sim_time >= 5 - dt
+    assert game.tick >= 299
+    assert any(s.alive for s in game.friendly_ships)
+    assert any(s.alive for s in game.enemy_ships)
+
+
+def test_manager_only_simulates_its_own_ships(app, game):
+    """A Ship built outside the GameManager lives in another ECS world."""
+    from ursina import Vec3
+    from ship import Ship
+    from ship_defs import FIGHTER_DEF
+
+    stray = Ship(FIGHTER_DEF, position=Vec3(0, 0, 0))
+    stray.velocity = Vec3(0, 0, 10)
+    try:
+        game.step(1 / 60)
+        assert stray.position == Vec3(0, 0, 0)
+        assert game.world.count() == len(game.all_ships)
+    finally:
+        stray.dispose()
@@ -0,0 +1,63 @@
+import pytest
+
+pytest.importorskip('ursina')
+
+from ursina import Vec3
+
+from ship import Ship
+from ship_defs import FIGHTER_DEF
+from squadrons import SquadronManager
+
+
+def _squad(game, positions, leader_rotation_y=0):
+    manager = SquadronManager(game)
+    ships = [Ship(FIGHTER_DEF, position=Vec3(*p)) for p in positions]
+    ships[0].rotation_y = leader_rotation_y
+    for ship in ships:
+        manager.enlist('a', ship, ship.position)
+    return manager, ships
+
+
+def test_slots_are_in_the_leaders_frame(game):
+    # Leader turned 90 degrees: its right is world -z, its forward world +x
+    manager, (leader, wing, tail) = _squad(game, [(0, 0, 0), (0, 0, -10), (-20, 0, 0)], 90)
+    squad = manager.squadron_of(leader)
+    assert squad.leader is leader and squad.followers == [wing, tail]
+    assert tuple(squad.slots[wing.ship_id]) == pytest.approx((10, 0, 0), abs=1e-4)
+    assert tuple(squad.slots[tail.ship_id]) == pytest.approx((0, 0, -20), abs=1e-4)
+    assert tuple(squad.slot_position(wing)) == pytest.approx((0, 0, -10), abs=1e-4)
+
+    # The formation follows the leader as it moves
+    leader.position = Vec3(100, 5, 0)
+    assert tuple(squad.slot_position(tail)) == pytest.approx((80, 5, 0), abs=1e-4)
+    assert manager.is_follower(wing) and not manager.is_follower(leader)
+
+
+def test_next_follower_is_promoted_and_slots_rebased(game):
+    manager, (leader, first, second) = _squad(game, [(0, 0, 0), (10, 0, -10), (-10, 0, -10)])
+    manager.forget(leader)
+    squad = manager.squadron_of(first)
+    assert squad.leader is first and squad.followers == [second]
+    assert manager.squadron_of(leader) is None
+    # second keeps its place in the formation relative to the new leader
+    assert tuple(squad.slots[second.ship_id]) == pytest.approx((-20, 0, 0), abs=1e-4)
+    assert tuple(squad.slot_position(second)) == pytest.approx((-10, 0, -10), abs=1e-4)
+
+
+def test_dead_followers_are_skipped_on_promotion(game):
+    manager, (leader, dead, alive) = _squad(game, [(0, 0, 0), (10, 0, 0), (20, 0, 0)])
+    dead.alive = False
+    manager.forget(leader)
+    assert manager.squadron_of(alive).leader is alive
+    assert manager.squadron_of(dead) is None
+
+    manager.forget(alive)
+    assert len(manager) == 0
+
+
+def test_followers_take_the_leaders_target(game):
+    manager, (leader, wing) = _squad(game, [(0, 0, 0), (10, 0, -10)])
+    enemy = Ship(FIGHTER_DEF, position=Vec3(0, 0, 300))
+    leader.target = enemy
+    manager.update(1 / 60, plan_leaders=False)
+    assert wing.target is enemy
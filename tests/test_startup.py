@@ -0,0 +1,16 @@
+from startup import StartupProfile
+
+
+def test_report_printed_only_when_verbose(capsys):
+    quiet = StartupProfile()
+    with quiet.stage('window'):
+        pass
+    quiet.mark_first_frame()
+    assert capsys.readouterr().out == ''
+    assert quiet.first_frame is not None and quiet.stages[0][0] == 'window'
+
+    loud = StartupProfile(verbose=True)
+    loud.mark_first_frame()
+    loud.mark_first_frame()                 # only the first frame counts
+    out = capsys.readouterr().out
+    assert out.count('--- startup ---') == 1 and 'time to first frame' in out
@@ -0,0 +1,29 @@
+import pytest
+
+pytest.importorskip('ursina')
+
+from ursina import camera, held_keys
+
+from timewarp import WARP_LEVELS
+
+
+def test_camera_follows_player_at_max_warp(app, game):
+    """The chase camera must not overshoot when a frame covers many ticks."""
+    ship = game.player_ship
+    game.chase_cam._snap_to_target()
+    game.timewarp.engage_range = 0          # never drop out of warp on proximity
+    game.timewarp.set_level(WARP_LEVELS.index('max'))
+    held_keys['w'] = 1
+    try:
+        for _ in range(6):
+            game.update(1 / 60)
+            app.step()
+            if not ship.alive:
+                break
+            desired, _ = game.chase_cam._compute_desired()
+            assert (camera.world_position - desired).length() < 50
+            assert 1 < camera.fov < 200
+    finally:
+        held_keys['w'] = 0
+    assert game.timewarp.factor == 'max'
+    assert ship.speed > 1
@@ -0,0 +1,75 @@
+import pytest
+
+pytest.importorskip('ursina')
+
+from ursina import Vec3
+
+from ship import Ship
+from ship_defs import FIGHTER_DEF
+from tracers import TracerRenderer
+from weapons import Projectile
+
+
+def _shots(n):
+    owner = Ship(FIGHTER_DEF, position=Vec3(0, 0, 0))
+    shots = []
+    for i in range(n):
+        p = Projectile(owner, 10, 100, 300, (255, 0, 0))
+        p.position = Vec3(i, 0, 0)
+        shots.append(p)
+    owner.dispose()
+    return shots
+
+
+def _vertex_count(renderer):
+    return renderer.node.get_geom(0).get_primitive(0).get_num_vertices()
+
+
+def test_draws_up_to_the_cap_and_counts_the_overflow(app):
+    renderer = TracerRenderer(cap=4096)
+    shots = _shots(5000)
+    shots[0].visible = False
+    shots[1].alive = False
+    renderer.update(shots, 0.0)
+    assert renderer.drawn == 4096
+    assert renderer.dropped == 5000 - 2 - 4096
+    assert _vertex_count(renderer) == 4096 * 2
+    assert renderer.entity.enabled
+
+    renderer.update(shots[:10], 0.0)
+    assert (renderer.drawn, renderer.dropped) == (8, 0)
+    assert _vertex_count(renderer) == 16
+
+    renderer.update([], 0.0)
+    assert renderer.drawn == 0 and not renderer.entity.enabled
+
+
+def test_segments_run_from_tail_to_head(app):
+    renderer = TracerRenderer(length=1.5, cap=8)
+    shot = _shots(3)[2]                  # at x=2, flying along the owner's +z
+    renderer.update([shot], 0.0)
+    vdata = renderer.node.get_geom(0).get_vertex_data()
+    verts = memoryview(vdata.get_array(0)).cast('B').cast('f')
+    cols = memoryview(vdata.get_array(1)).cast('B').cast('f')
+    assert list(verts[:6]) == pytest.approx([2, 0, -1.5, 2, 0, 0])
+    assert list(cols[:4]) == pytest.approx([1, 0, 0, 230 / 255])
+
+
+def test_set_cap_resizes_the_arrays(app):
+    renderer = TracerRenderer(cap=16)
+    rows = lambda: renderer.node.get_geom(0).get_vertex_data().get_num_rows()
+    renderer.set_cap(16)
+    assert renderer.node.get_num_geoms() == 1 and rows() == 32
+    renderer.set_cap(4)
+    assert renderer.node.get_num_geoms() == 1 and rows() == 8
+    renderer.update(_shots(10), 0.0)
+    assert (renderer.drawn, renderer.dropped) == (4, 6)
+
+
+def test_quality_levels_set_the_tracer_cap(game):
+    from quality import QUALITY_LEVELS
+
+    for level, q in enumerate(QUALITY_LEVELS):
+        game.quality.set_level(level)
+        assert game.tracers.cap == q['tracers']
+    game.quality.set_level(0)
@@ -0,0 +1,97 @@
+import time
+
+
+WARP_LEVELS = [1, 2, 4, 16, 'max']
+
+
+class TimeWarp:
+    """Runs several simulation ticks per rendered frame.
+
+    At a numeric level each frame runs that many ticks of the frame's dt. At
+    'max' fixed `max_dt` ticks run until `max_budget_ms` of wall time is used
+    (at least one, at most `max_ticks`). Warp drops back to 1× as soon as the
+    player ship is engaged: it took damage, or a live enemy is within
+    `engage_range`.
+    """
+    def __init__(self, engage_range=400.0, max_dt=1 / 60, max_budget_ms=25.0, max_ticks=256, hud_every=6):
+        self.engage_range = engage_range
+        self.max_dt = max_dt
+        self.max_budget = max_budget_ms / 1000.0
+        self.max_ticks = max_ticks
+        self.hud_every = hud_every      # frames between HUD refreshes while warping
+        self.level = 0
+        self._last_health = None
+        self._frame = 0
+
+    @property
+    def factor(self):
+        return WARP_LEVELS[self.level]
+
+    @property
+    def active(self):
+        return self.level > 0
+
+    def set_level(self, level):
+        self.level = max(0, min(level, len(WARP_LEVELS) - 1))
+
+    def faster(self):
+        self.set_level(self.level + 1)
+
+    def slower(self):
+        self.set_level(self.level - 1)
+
+    def label(self):
+        f = self.factor
+        return 'MAX' if f == 'max' else f'{f}x'
+
+    def run(self, gm, frame_dt):
+        """Advance gm by this frame's ticks. Returns the sim time covered."""
+        self._frame += 1
+        if not self.active:
+            gm.step(frame_dt)
+            self._note_health(gm.player_ship)
+            return frame_dt
+
+        if self.factor == 'max':
+            dt, ticks = self.max_dt, self.max_ticks
+            deadline = time.perf_counter() + self.max_budget
+        else:
+            dt, ticks, deadline = frame_dt, self.factor, None
+
+        covered = 0.0
+        for _ in range(ticks):
+            gm.step(dt)
+            covered += dt
+            if self.engaged(gm):
+                self.level = 0
+                break
+            if deadline is not None and time.perf_counter() > deadline:
+                break
+        return covered
+
+    def refresh_hud(self):
+        """Whether the HUD should be redrawn this frame."""
+        return not self.active or self._frame % self.hud_every == 0
+
+    def engaged(self, gm):
+        ship = gm.player_ship
+        if ship is None or not ship.alive:
+            return False
+        if self._note_health(ship):
+            return True
+        enemies = gm.enemy_ships if ship.faction == 'friendly' else gm.friendly_ships
+        pos = ship.position
+        for e in enemies:
+            if e.alive and (e.position - pos).length() < self.engage_range:
+                return True
+        return False
+
+    def _note_health(self, ship):
+        """Record the player's hp + shield; True if it went down since last time."""
+        health = (ship.ship_id, ship.hp + ship.shield) if ship is not None else None
+        hurt = (
+            health is not None and self._last_health is not None
+            and health[0] == self._last_health[0] and health[1] < self._last_health[1]
+        )
+        self._last_health = health
+        return hurt
@@ -0,0 +1,86 @@
+from panda3d.core import (
+    Geom, GeomLines, GeomNode, GeomVertexArrayFormat, GeomVertexData, GeomVertexFormat,
+    NodePath, OmniBoundingVolume,
+)
+from ursina import Entity
+
+
+def _tracer_format():
+    fmt = GeomVertexFormat()
+    fmt.add_array(GeomVertexFormat.get_v3().arrays[0])
+    fmt.add_array(GeomVertexArrayFormat('color', 4, Geom.NT_float32, Geom.C_color))
+    return GeomVertexFormat.register_format(fmt)
+
+
+class TracerRenderer:
+    """Draws every visible projectile as a line segment in one shared geom.
+
+    The vertex and colour arrays are allocated once for `cap` segments and
+    overwritten in place each rendered frame; only the drawn vertex count
+    changes. The geom is rebuilt only when the cap does (set_cap; the quality
+    governor lowers it under load). Tracers beyond the cap are not drawn and
+    are counted in `dropped`.
+    """
+    def __init__(self, length=1.5, thickness=2, cap=4096):
+        self.length = length            # segment length behind the projectile head
+        self.node = GeomNode('tracers')
+        self.node.set_bounds(OmniBoundingVolume())   # vertices move every frame
+        self.node.set_final(True)
+        model = NodePath(self.node)
+        model.set_render_mode_thickness(thickness)
+        self.entity = Entity(name='tracers', model=model, enabled=False)
+        self._colors = {}               # color_val tuple -> (r, g, b, a) floats
+        self.cap = 0
+        self.drawn = 0
+        self.dropped = 0
+        self.set_cap(cap)
+
+    def set_cap(self, cap):
+        """Reallocate the vertex arrays for `cap` segments."""
+        if cap == self.cap:
+            return
+        vdata = GeomVertexData('tracers', _tracer_format(), Geom.UH_dynamic)
+        vdata.unclean_set_num_rows(cap * 2)
+        lines = GeomLines(Geom.UH_dynamic)
+        lines.set_nonindexed_vertices(0, 0)
+        geom = Geom(vdata)
+        geom.add_primitive(lines)
+        self.node.remove_all_geoms()
+        self.node.add_geom(geom)
+        self.cap = cap
+
+    def update(self, projectiles, now):
+        geom = self.node.modify_geom(0)
+        vdata = geom.modify_vertex_data()
+        verts = memoryview(vdata.modify_array(0)).cast('B').cast('f')
+        cols = memoryview(vdata.modify_array(1)).cast('B').cast('f')
+
+        length = self.length
+        cap = self.cap
+        n = 0
+        wanted = 0
+        for p in projectiles:
+            if not p.alive or not p.visible:
+                continue
+            wanted += 1
+            if n == cap:
+                continue
+            head = p.tracer_position(now)
+            tail = head - p.direction * length
+            c = self._colors.get(p.color)
+            if c is None:
+                v = p.color
+                c = self._colors[p.color] = (v[0] / 255, v[1] / 255, v[2] / 255, 230 / 255)
+            # Element writes: no per-segment buffers to allocate
+            i = n * 6
+            verts[i], verts[i + 1], verts[i + 2] = tail[0], tail[1], tail[2]
+            verts[i + 3], verts[i + 4], verts[i + 5] = head[0], head[1], head[2]
+            j = n * 8
+            cols[j], cols[j + 1], cols[j + 2], cols[j + 3] = c
+            cols[j + 4], cols[j + 5], cols[j + 6], cols[j + 7] = c
+            n += 1
+
+        self.drawn = n
+        self.dropped = wanted - n
+        geom.modify_primitive(0).set_nonindexed_vertices(0, n * 2)
+        self.entity.enabled = n > 0
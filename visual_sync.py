@@ -0,0 +1,71 @@
+from ursina import color
+
+
+class VisualSync:
+    """Dirty-checking layer between per-frame game state and the scene graph.
+
+    Every visual write goes through here; a write is only pushed to the node
+    when its (quantized) value differs from the last one pushed. Text changes
+    force a re-layout and colour/visibility changes touch node state, so most
+    frames should end up fully suppressed.
+    """
+    def __init__(self):
+        self.applied = 0
+        self.suppressed = 0
+
+    def _push(self, node, attr, key, value):
+        cache = node.__dict__.get('_synced')
+        if cache is None:
+            cache = {}
+            node._synced = cache
+        elif attr in cache and cache[attr] == key:
+            self.suppressed += 1
+            return False
+        cache[attr] = key
+        setattr(node, attr, value)
+        self.applied += 1
+        return True
+
+    def set_visible(self, node, visible):
+        visible = bool(visible)
+        return self._push(node, 'visible', visible, visible)
+
+    def set_text(self, text_entity, text):
+        return self._push(text_entity, 'text', text, text)
+
+    def set_color(self, node, value):
+        """Push a prebuilt colour (e.g. color.green)."""
+        return self._push(node, 'color', tuple(value), value)
+
+    def set_rgba(self, node, r, g, b, a=255):
+        """Push a 0-255 colour; the Color object is only built when it changed."""
+        key = (int(r), int(g), int(b), int(a))
+        cache = node.__dict__.get('_synced')
+        if cache is not None and cache.get('color') == key:
+            self.suppressed += 1
+            return False
+        return self._push(node, 'color', key, color.rgba(*key))
+
+    def forget(self, node):
+        """Drop cached state, e.g. after something wrote to the node directly."""
+        node.__dict__.pop('_synced', None)
+
+    def stats(self):
+        total = self.applied + self.suppressed
+        return {
+            'applied': self.applied,
+            'suppressed': self.suppressed,
+            'suppressed_ratio': self.suppressed / total if total else 0.0,
+        }
+
+    def reset_counters(self):
+        self.applied = 0
+        self.suppressed = 0
+
+
+def quantize(value, steps):
+    """Snap a 0-1 value to `steps` levels so tiny changes don't count as changes."""
+    return round(value * steps) / steps
+
+
+visual_sync = VisualSync()
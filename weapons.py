@@ -1,54 +1,122 @@
-from ursina import Entity, Vec3, color, destroy, time
+from ursina import Vec3
+import kernels
+
+# 'stepped' — move and collision-test every frame
+# 'analytic' — predict time-of-impact once at fire time (see impacts.py)
+projectile_mode = 'stepped'
+
+HIT_RADIUS = 3.0
+
+
+def ship_hit_radius(ship):
+    """Collision radius of a projectile against this ship, scaled by ship size."""
+    return HIT_RADIUS + max(ship.scale_x, ship.scale_y, ship.scale_z) * 0.6
 
 
 class Weapon:
     """A weapon mounted on a ship. Handles cooldown and firing."""
-    def __init__(self, owner, damage=10, cooldown=0.2, speed=200, range=300, color_val=(0, 1, 1)):
+    def __init__(self, owner, damage=10, cooldown=0.2, speed=200, range=300, color_val=(0, 1, 1), kind='weapon'):
         self.owner = owner
+        self.kind = kind          # weapon type, shared by the same hardpoint on every ship of a class
         self.damage = damage
         self.cooldown = cooldown
         self.speed = speed
         self.range = range
         self.color_val = color_val
-        self._timer = 0.0
-
-    def can_fire(self):
-        return self._timer <= 0
+        self.ready_at = 0.0       # sim time at which the weapon can fire again
 
-    def update_cooldown(self, dt):
-        if self._timer > 0:
-            self._timer -= dt
+    def can_fire(self, now):
+        return now >= self.ready_at
 
-    def fire(self, projectiles_list):
-        if not self.can_fire():
+    def fire(self, projectiles_list, now):
+        if not self.can_fire(now):
             return None
-        self._timer = self.cooldown
-        p = Projectile(
+        self.ready_at = now + self.cooldown
+        cls = AnalyticProjectile if projectile_mode == 'analytic' else Projectile
+        p = cls(
             owner=self.owner,
             damage=self.damage,
             speed=self.speed,
             max_range=self.range,
             color_val=self.color_val,
+            weapon=self,
         )
         projectiles_list.append(p)
         return p
 
 
-class Projectile(Entity):
-    """A fast-moving projectile with distance-based collision."""
-    def __init__(self, owner, damage, speed, max_range, color_val, **kwargs):
-        c = color_val
-        super().__init__(
-            model='cube',
-            color=color.rgba(c[0], c[1], c[2], 230),
-            scale=Vec3(0.1, 0.1, 0.6),
-            position=owner.position + owner.forward * 2,
-            **kwargs,
-        )
-        # Match owner's rotation so it looks right
-        self.rotation = owner.rotation
+def step_projectiles(projectiles, ships, dt):
+    """Advance stepped projectiles; returns [(projectile, hit_ship)].
+
+    Uses the kernel backend for the move + collision sweep when a compiled
+    or vectorized one is available and there are at least
+    kernels.min_batch_projectiles projectiles; otherwise each projectile
+    steps itself.
+    """
+    kb = kernels.backend
+    if not kernels.use_batch(len(projectiles), kernels.min_batch_projectiles):
+        hits = []
+        for proj in projectiles:
+            hit_ship = proj.update_projectile(dt, ships)
+            if hit_ship is not None:
+                hits.append((proj, hit_ship))
+        return hits
+
+    factions = {}
+    index_of = {s.ship_id: i for i, s in enumerate(ships)}
+    ppos = kb.vec_array(p.position for p in projectiles)
+    traveled = kb.float_array(p.distance_traveled for p in projectiles)
+    out = kb.int_array([0] * len(projectiles))
+    kb.step_projectiles(
+        ppos,
+        kb.vec_array(p.direction for p in projectiles),
+        kb.float_array(p.speed for p in projectiles),
+        traveled,
+        kb.float_array(p.max_range for p in projectiles),
+        kb.int_array(factions.setdefault(p.faction, len(factions)) for p in projectiles),
+        kb.int_array(_owner_index(p, index_of) for p in projectiles),
+        kb.vec_array(s.position for s in ships),
+        kb.float_array(ship_hit_radius(s) for s in ships),
+        kb.int_array(factions.setdefault(s.faction, len(factions)) for s in ships),
+        kb.int_array(1 if s.alive else 0 for s in ships),
+        dt,
+        out,
+    )
+
+    hits = []
+    for i, proj in enumerate(projectiles):
+        result = int(out[i])
+        if result == kernels.EXPIRED:
+            proj.alive = False
+            continue
+        proj.position = Vec3(*ppos[i])
+        proj.distance_traveled = float(traveled[i])
+        if result >= 0:
+            proj.alive = False
+            hits.append((proj, ships[result]))
+    return hits
+
+
+def _owner_index(proj, index_of):
+    owner = proj.live_owner
+    return index_of.get(owner.ship_id, -1) if owner is not None else -1
 
+
+class Projectile:
+    """A fast-moving projectile with distance-based collision.
+
+    Plain data, no scene node: TracerRenderer draws every live projectile
+    as one line segment in a shared mesh.
+    """
+    analytic = False
+
+    def __init__(self, owner, damage, speed, max_range, color_val, weapon=None):
+        self.position = owner.position + owner.forward * 2
+        self.color = color_val
+        self.visible = True
         self.owner = owner
+        self.owner_generation = owner.generation
+        self.weapon = weapon
         self.faction = owner.faction
         self.damage = damage
         self.speed = speed
@@ -57,6 +125,15 @@ class Projectile(Entity):
         self.distance_traveled = 0.0
         self.alive = True
 
+    @property
+    def live_owner(self):
+        """The firing ship, or None once its handle has been recycled by the pool."""
+        owner = self.owner
+        return owner if owner.generation == self.owner_generation else None
+
+    def tracer_position(self, now):
+        return self.position
+
     def update_projectile(self, dt, ships):
         """Move forward and check distance-based collision against ships."""
         if not self.alive:
@@ -72,18 +149,41 @@ class Projectile(Entity):
             return
 
         # Distance-based collision
-        hit_radius = 3.0
         for ship in ships:
             if not ship.alive:
                 continue
             if ship.faction == self.faction:
                 continue
-            if ship is self.owner:
+            if ship is self.live_owner:
                 continue
             dist = (self.position - ship.position).length()
-            # Scale hit radius by ship size
-            ship_radius = max(ship.scale_x, ship.scale_y, ship.scale_z) * 0.6
-            if dist < hit_radius + ship_radius:
+            if dist < ship_hit_radius(ship):
                 self.alive = False
                 return ship  # Return the hit ship
         return None
+
+
+class AnalyticProjectile(Projectile):
+    """Projectile resolved by predicted time-of-impact instead of per-frame stepping.
+
+    (origin, direction, fire_time) fully describe the flight; the position is
+    only evaluated for the tracer. ImpactQueue owns the hit.
+    """
+    analytic = True
+
+    def __init__(self, owner, damage, speed, max_range, color_val, weapon=None):
+        super().__init__(owner, damage, speed, max_range, color_val, weapon)
+        self.origin = Vec3(self.position)
+        self.lifetime = max_range / max(speed, 0.001)
+        self.fire_time = None      # set when the impact queue registers it
+        self.candidates = []       # ships that could possibly be reached
+        self.hit_ship = None       # predicted victim, None = expires
+        self.event_seq = -1        # matches the live heap entry
+
+    def position_at(self, t):
+        return self.origin + self.direction * (self.speed * (t - self.fire_time))
+
+    def tracer_position(self, now):
+        if self.fire_time is None:
+            return self.origin
+        return self.position_at(now)